@@ -10,28 +10,105 @@ import os
 import tempfile
 import traceback
 from pathlib import Path
-import re
 import json
 from datetime import datetime
 import subprocess
 import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from transcript_cache import TranscriptCache, fingerprint_audio
+from preference_extractor import PreferenceExtractor, default_recipe_info
+from audio_probe import AudioLimits, probe_audio, apply_limits
+from recognizer_pool import RecognizerPool
+from keyword_spotter import KeywordSpotter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENGINE_ORDER = ['whisper', 'google', 'sphinx']
+
+class EngineStats:
+    def __init__(self, window=200):
+        """Rolling latency and outcome statistics for one speech engine"""
+        self.latencies = deque(maxlen=window)
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.wins = 0
+        self.abandoned = 0
+        self.lock = threading.Lock()
+    
+    def record(self, latency, success):
+        """Record one finished engine call"""
+        with self.lock:
+            self.attempts += 1
+            self.latencies.append(latency)
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+    
+    def record_win(self):
+        with self.lock:
+            self.wins += 1
+    
+    def record_abandoned(self):
+        with self.lock:
+            self.abandoned += 1
+    
+    def percentile(self, pct):
+        """Latency percentile in seconds, None until enough samples exist"""
+        with self.lock:
+            if len(self.latencies) < 5:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def to_dict(self):
+        p50 = self.percentile(50)
+        p90 = self.percentile(90)
+        with self.lock:
+            return {
+                'attempts': self.attempts,
+                'successes': self.successes,
+                'failures': self.failures,
+                'wins': self.wins,
+                'abandoned': self.abandoned,
+                'win_rate': round(self.wins / self.attempts, 3) if self.attempts else 0.0,
+                'p50_seconds': round(p50, 3) if p50 is not None else None,
+                'p90_seconds': round(p90, 3) if p90 is not None else None
+            }
+
+class EngineSlot:
+    def __init__(self, recognizer):
+        """One pooled set of engine instances - never shared between requests"""
+        self.recognizer = recognizer
+
 class AudioModel:
     def __init__(self):
         """Initialize the audio processing model with comprehensive setup"""
-        self.recognizer = sr.Recognizer()
         self.microphone = None
         
-        # Configure recognizer settings for better accuracy
-        self.recognizer.energy_threshold = 300
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.pause_threshold = 0.8
-        self.recognizer.phrase_threshold = 0.3
-        self.recognizer.non_speaking_duration = 0.8
+        # Recognizers are checked out per transcription so concurrent requests
+        # never race on adjust_for_ambient_noise/energy_threshold
+        self.recognizer_pool = RecognizerPool(
+            self.create_engine_slot,
+            size=int(os.environ.get('AUDIO_POOL_SIZE', os.cpu_count() or 4)),
+            checkout_timeout=float(os.environ.get('AUDIO_POOL_TIMEOUT', 30.0))
+        )
+        
+        # Whisper models are large (hundreds of MB each), so they get their own small pool
+        # instead of one per recognizer slot - by default a single model shared in turn
+        self.whisper_pool = RecognizerPool(
+            self.load_whisper_model,
+            size=int(os.environ.get('AUDIO_WHISPER_POOL_SIZE', 1)),
+            checkout_timeout=float(os.environ.get('AUDIO_POOL_TIMEOUT', 30.0))
+        )
         
         # Test available engines and tools
         self.engines_available = self.test_all_engines()
@@ -39,9 +116,56 @@ class AudioModel:
         # Check for ffmpeg (for audio conversion)
         self.ffmpeg_available = self.check_ffmpeg()
         
+        # Engine execution: 'sequential', 'concurrent' or 'hedged'
+        self.engine_mode = os.environ.get('AUDIO_ENGINE_MODE', 'sequential')
+        self.engine_deadline = float(os.environ.get('AUDIO_ENGINE_DEADLINE', 20.0))
+        self.default_hedge_delay = float(os.environ.get('AUDIO_HEDGE_DELAY', 2.0))
+        self.engine_stats = {name: EngineStats() for name in ENGINE_ORDER}
+        self.engine_executor = ThreadPoolExecutor(max_workers=2 * len(ENGINE_ORDER),
+                                                  thread_name_prefix='speech-engine')
+        
+        # Duration/sample-rate limits enforced from a header-only probe
+        self.audio_limits = AudioLimits()
+        
+        # Keyword tables compiled once for single-pass preference extraction
+        self.preference_extractor = PreferenceExtractor()
+        
+        # Short voice commands skip full ASR via keyword spotting when confident
+        self.keyword_spotter = None
+        if self.engines_available.get('sphinx') and os.environ.get('AUDIO_KWS_ENABLED', 'true').lower() == 'true':
+            self.keyword_spotter = KeywordSpotter(
+                self.preference_extractor.keyword_phrases(),
+                max_duration=float(os.environ.get('AUDIO_KWS_MAX_DURATION', 4.0)),
+                min_confidence=float(os.environ.get('AUDIO_KWS_MIN_CONFIDENCE', 0.6)),
+                decoders=int(os.environ.get('AUDIO_KWS_DECODERS', 1))
+            )
+        
+        # Transcripts keyed by decoded-audio fingerprint (optional SQLite tier)
+        self.transcript_cache = TranscriptCache(
+            max_entries=int(os.environ.get('TRANSCRIPT_CACHE_SIZE', 256)),
+            persistent_path=os.environ.get('TRANSCRIPT_CACHE_DB')
+        )
+        
         logger.info("Audio Model Initialization Complete")
         logger.info(f"Available engines: {list(self.engines_available.keys())}")
         logger.info(f"FFmpeg available: {self.ffmpeg_available}")
+        logger.info(f"Engine execution mode: {self.engine_mode} (deadline {self.engine_deadline}s)")
+    
+    def create_recognizer(self):
+        """Recognizer configured with our accuracy settings"""
+        recognizer = sr.Recognizer()
+        
+        # Configure recognizer settings for better accuracy
+        recognizer.energy_threshold = 300
+        recognizer.dynamic_energy_threshold = True
+        recognizer.pause_threshold = 0.8
+        recognizer.phrase_threshold = 0.3
+        recognizer.non_speaking_duration = 0.8
+        return recognizer
+    
+    def create_engine_slot(self):
+        """Factory for the recognizer pool"""
+        return EngineSlot(self.create_recognizer())
     
     def check_ffmpeg(self):
         """Check if ffmpeg is available for audio conversion"""
@@ -116,7 +240,9 @@ class AudioModel:
                 return input_path
             
             if not output_path:
-                output_path = input_path.replace(Path(input_path).suffix, '_converted.wav')
+                # Unique name so concurrent engines never overwrite each other
+                output_path = str(Path(input_path).with_name(
+                    f"{Path(input_path).stem}_converted_{uuid.uuid4().hex[:8]}.wav"))
             
             # FFmpeg command for conversion
             cmd = [
@@ -167,73 +293,280 @@ class AudioModel:
                     'error': 'Audio file is empty'
                 }
             
-            # Try multiple transcription methods
-            transcript = None
-            method_used = None
-            
-            # Method 1: Try Whisper (if available)
-            if self.engines_available.get('whisper') and not transcript:
-                transcript, method_used = self.transcribe_with_whisper(audio_file_path)
+            # Probe the header and enforce duration/sample-rate limits before decoding
+            probe = probe_audio(audio_file_path)
+            prepared_path, limit_actions, limit_error = apply_limits(
+                audio_file_path, probe, self.audio_limits, self.ffmpeg_available
+            )
+            probe_info = dict(probe, limits=self.audio_limits.to_dict(), actions=limit_actions)
+            logger.info(f"Audio probe: {probe_info}")
             
-            # Method 2: Try Google Speech Recognition
-            if not transcript and self.engines_available.get('google'):
-                transcript, method_used = self.transcribe_with_google(audio_file_path)
-            
-            # Method 3: Try PocketSphinx
-            if not transcript and self.engines_available.get('sphinx'):
-                transcript, method_used = self.transcribe_with_sphinx(audio_file_path)
-            
-            # Method 4: Try simple fallback
-            if not transcript:
-                transcript, method_used = self.fallback_transcription(audio_file_path)
-            
-            if not transcript:
-                logger.warning("All transcription methods failed")
+            if limit_error:
+                logger.error(f"Audio rejected: {limit_error}")
                 return {
                     'success': False,
                     'transcript': '',
-                    'error': 'Could not transcribe audio - no speech detected or all engines failed'
+                    'error': limit_error,
+                    'rejected': True,
+                    'processing_info': {
+                        'file_size_bytes': file_size,
+                        'probe': probe_info
+                    }
                 }
             
-            logger.info(f"Transcription successful using {method_used}: '{transcript}'")
-            
-            # Extract recipe information from transcript
-            recipe_info = self.extract_recipe_information(transcript)
+            try:
+                return self.transcribe_prepared_file(prepared_path, file_size, probe_info)
+            finally:
+                if prepared_path != audio_file_path and os.path.exists(prepared_path):
+                    os.remove(prepared_path)
             
+        except Exception as e:
+            logger.error(f"Error processing audio: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {
+                'success': False,
+                'transcript': '',
+                'error': f'Audio processing failed: {str(e)}'
+            }
+    
+    def transcribe_prepared_file(self, audio_file_path, file_size, probe_info):
+        """Cache lookup, engines and preference extraction for a file within limits"""
+        # Re-sent recordings are answered from the transcript cache
+        fingerprint = None
+        try:
+            fingerprint = fingerprint_audio(audio_file_path, self.ffmpeg_available)
+            cached = self.transcript_cache.get(fingerprint)
+        except Exception as e:
+            logger.warning(f"Transcript cache lookup failed: {e}")
+            cached = None
+        
+        if cached:
+            logger.info(f"Transcript cache hit ({fingerprint[:12]}): '{cached['transcript']}'")
             return {
                 'success': True,
-                'transcript': transcript.strip(),
-                'recipe_info': recipe_info,
+                'transcript': cached['transcript'],
+                'recipe_info': cached['recipe_info'],
                 'confidence': 0.8,
-                'method_used': method_used,
+                'method_used': cached['method_used'],
+                'cached': True,
                 'engines_tested': list(self.engines_available.keys()),
                 'processing_info': {
                     'file_size_bytes': file_size,
+                    'fingerprint': fingerprint,
+                    'probe': probe_info,
                     'engines_available': self.engines_available,
                     'ffmpeg_available': self.ffmpeg_available
                 }
             }
-            
-        except Exception as e:
-            logger.error(f"Error processing audio: {str(e)}")
-            logger.error(traceback.format_exc())
+        
+        engine_start = time.time()
+        
+        # Short clips: keyword spotting fast path, full ASR when spotting is unsure
+        transcript, method_used, spotting = self.try_keyword_spotting(audio_file_path, probe_info)
+        
+        # Try the speech engines (sequential, concurrent or hedged)
+        if not transcript:
+            transcript, method_used = self.run_engines(audio_file_path)
+        engine_seconds = time.time() - engine_start
+        
+        # Method 4: Try simple fallback
+        if not transcript:
+            transcript, method_used = self.fallback_transcription(audio_file_path)
+        
+        if not transcript:
+            logger.warning("All transcription methods failed")
             return {
                 'success': False,
                 'transcript': '',
-                'error': f'Audio processing failed: {str(e)}'
+                'error': 'Could not transcribe audio - no speech detected or all engines failed'
             }
+        
+        logger.info(f"Transcription successful using {method_used}: '{transcript}'")
+        
+        # Extract recipe information from transcript
+        recipe_info = self.extract_recipe_information(transcript)
+        
+        # The generic fallback text is a placeholder, never cache it
+        if fingerprint and method_used != 'fallback_generic':
+            self.transcript_cache.put(fingerprint, transcript.strip(), method_used, recipe_info)
+        
+        return {
+            'success': True,
+            'transcript': transcript.strip(),
+            'recipe_info': recipe_info,
+            'confidence': spotting['confidence'] if method_used == 'keyword_spotting' else 0.8,
+            'method_used': method_used,
+            'cached': False,
+            'engines_tested': list(self.engines_available.keys()),
+            'processing_info': {
+                'file_size_bytes': file_size,
+                'fingerprint': fingerprint,
+                'probe': probe_info,
+                'engines_available': self.engines_available,
+                'ffmpeg_available': self.ffmpeg_available,
+                'engine_mode': self.engine_mode,
+                'engine_seconds': round(engine_seconds, 3),
+                'keyword_spotting': spotting
+            }
+        }
+    
+    def try_keyword_spotting(self, audio_file_path, probe_info):
+        """Returns (transcript, method, spotting_result); transcript is None when ASR is needed"""
+        if not self.keyword_spotter or not self.keyword_spotter.accepts(probe_info.get('duration_seconds')):
+            return None, None, None
+        
+        converted_path = audio_file_path
+        try:
+            if Path(audio_file_path).suffix.lower() != '.wav':
+                converted_path = self.convert_audio_format(audio_file_path)
+            
+            with self.recognizer_pool.checkout() as slot:
+                # No ambient-noise calibration: it would eat half of a short command
+                with sr.AudioFile(converted_path) as source:
+                    audio_data = slot.recognizer.record(source)
+            spotting = self.keyword_spotter.spot(audio_data)
+        except Exception as e:
+            logger.warning(f"Keyword spotting failed: {e}")
+            return None, None, None
+        finally:
+            if converted_path != audio_file_path and os.path.exists(converted_path):
+                os.remove(converted_path)
+        
+        if spotting and spotting['confidence'] >= self.keyword_spotter.min_confidence:
+            logger.info(f"Keyword spotting fast path: '{spotting['transcript']}' ({spotting['confidence']:.2f})")
+            return spotting['transcript'], 'keyword_spotting', spotting
+        
+        logger.info(f"Keyword spotting not confident enough, using full ASR: {spotting}")
+        return None, None, spotting
+    
+    def engine_functions(self):
+        """Available engines in preference order"""
+        functions = {
+            'whisper': self.transcribe_with_whisper,
+            'google': self.transcribe_with_google,
+            'sphinx': self.transcribe_with_sphinx
+        }
+        return [(name, functions[name]) for name in ENGINE_ORDER if self.engines_available.get(name)]
+    
+    def timed_engine_call(self, name, function, audio_file_path):
+        """Run one engine and record its latency and outcome"""
+        start = time.time()
+        transcript, method_used = None, None
+        try:
+            transcript, method_used = function(audio_file_path)
+        finally:
+            self.engine_stats[name].record(time.time() - start, bool(transcript))
+        return transcript, method_used
+    
+    def run_engines(self, audio_file_path):
+        """Dispatch transcription according to the configured execution mode"""
+        engines = self.engine_functions()
+        if not engines:
+            return None, None
+        
+        if self.engine_mode == 'concurrent':
+            return self.run_engines_concurrent(engines, audio_file_path)
+        if self.engine_mode == 'hedged':
+            return self.run_engines_hedged(engines, audio_file_path)
+        return self.run_engines_sequential(engines, audio_file_path)
+    
+    def run_engines_sequential(self, engines, audio_file_path):
+        """Try each engine in order until one produces a transcript"""
+        deadline = time.time() + self.engine_deadline
+        for name, function in engines:
+            if time.time() >= deadline:
+                logger.warning("Engine deadline reached before all engines were tried")
+                break
+            transcript, method_used = self.timed_engine_call(name, function, audio_file_path)
+            if transcript:
+                self.engine_stats[name].record_win()
+                return transcript, method_used
+        return None, None
+    
+    def run_engines_concurrent(self, engines, audio_file_path):
+        """Launch every engine at once and take the first acceptable transcript"""
+        deadline = time.time() + self.engine_deadline
+        pending = {
+            self.engine_executor.submit(self.timed_engine_call, name, function, audio_file_path): name
+            for name, function in engines
+        }
+        return self.collect_first_transcript(pending, [], audio_file_path, deadline, hedge=False)
+    
+    def run_engines_hedged(self, engines, audio_file_path):
+        """Start engines one by one, hedging with the next once the current exceeds its p90"""
+        deadline = time.time() + self.engine_deadline
+        queue = list(engines)
+        name, function = queue.pop(0)
+        pending = {
+            self.engine_executor.submit(self.timed_engine_call, name, function, audio_file_path): name
+        }
+        return self.collect_first_transcript(pending, queue, audio_file_path, deadline, hedge=True)
+    
+    def hedge_delay(self, name):
+        """How long to wait on an engine before starting the next one"""
+        p90 = self.engine_stats[name].percentile(90)
+        return p90 if p90 is not None else self.default_hedge_delay
+    
+    def collect_first_transcript(self, pending, queue, audio_file_path, deadline, hedge):
+        """Wait for the first non-empty transcript, launching queued engines as hedges"""
+        launched_at = {future: time.time() for future in pending}
+        try:
+            while pending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    logger.warning(f"Engine deadline of {self.engine_deadline}s exceeded")
+                    return None, None
+                
+                timeout = remaining
+                if hedge and queue:
+                    # Newest running engine decides when the next hedge starts
+                    newest = max(pending, key=lambda f: launched_at[f])
+                    hedge_at = launched_at[newest] + self.hedge_delay(pending[newest])
+                    timeout = max(0.0, min(remaining, hedge_at - time.time()))
+                
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        transcript, method_used = future.result()
+                    except Exception as e:
+                        logger.warning(f"Engine {name} raised: {e}")
+                        transcript, method_used = None, None
+                    if transcript:
+                        self.engine_stats[name].record_win()
+                        return transcript, method_used
+                
+                # Nothing acceptable yet - the current engine is slow or failed, start the next
+                if hedge and queue:
+                    name, function = queue.pop(0)
+                    logger.info(f"Hedging transcription with {name}")
+                    future = self.engine_executor.submit(self.timed_engine_call, name, function, audio_file_path)
+                    pending[future] = name
+                    launched_at[future] = time.time()
+            return None, None
+        finally:
+            # Running threads cannot be interrupted - their results are simply discarded
+            for future, name in pending.items():
+                if not future.cancel():
+                    self.engine_stats[name].record_abandoned()
+    
+    def get_engine_stats(self):
+        """Per-engine win and latency statistics for tuning the engine order"""
+        return {
+            'mode': self.engine_mode,
+            'deadline_seconds': self.engine_deadline,
+            'order': [name for name, _ in self.engine_functions()],
+            'engines': {name: stats.to_dict() for name, stats in self.engine_stats.items()}
+        }
     
     def transcribe_with_whisper(self, audio_file_path):
         """Transcribe using OpenAI Whisper"""
         try:
             logger.info("Attempting Whisper transcription...")
-            import whisper
-            
-            # Load Whisper model (base is good balance of speed/accuracy)
-            model = whisper.load_model("base")
-            
             # Transcribe
-            result = model.transcribe(audio_file_path)
+            with self.whisper_pool.checkout() as model:
+                result = model.transcribe(audio_file_path)
             transcript = result["text"].strip()
             
             if transcript:
@@ -247,6 +580,59 @@ class AudioModel:
             logger.warning(f"Whisper transcription failed: {e}")
             return None, None
     
+    def load_whisper_model(self):
+        """Factory for the Whisper pool - each model is loaded once and reused across transcriptions"""
+        import whisper
+        
+        # Load Whisper model (base is good balance of speed/accuracy)
+        return whisper.load_model("base")
+    
+    def transcribe_audio_data(self, audio_data):
+        """Transcribe an in-memory sr.AudioData with the available engines"""
+        with self.recognizer_pool.checkout() as slot:
+            return self.transcribe_audio_data_with_slot(audio_data, slot)
+    
+    def transcribe_audio_data_with_slot(self, audio_data, slot):
+        """Engine cascade for in-memory audio using one pooled slot"""
+        # Method 1: Try Whisper (if available)
+        if self.engines_available.get('whisper'):
+            try:
+                import numpy as np
+                
+                raw = audio_data.get_raw_data(convert_rate=16000, convert_width=2)
+                samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+                with self.whisper_pool.checkout() as model:
+                    result = model.transcribe(samples, fp16=False)
+                transcript = result["text"].strip()
+                if transcript:
+                    return transcript, "whisper"
+            except Exception as e:
+                logger.warning(f"Whisper in-memory transcription failed: {e}")
+        
+        # Method 2: Try Google Speech Recognition
+        if self.engines_available.get('google'):
+            try:
+                transcript = slot.recognizer.recognize_google(audio_data)
+                if transcript:
+                    return transcript.strip(), "google_speech"
+            except sr.UnknownValueError:
+                pass
+            except Exception as e:
+                logger.warning(f"Google in-memory transcription failed: {e}")
+        
+        # Method 3: Try PocketSphinx
+        if self.engines_available.get('sphinx'):
+            try:
+                transcript = slot.recognizer.recognize_sphinx(audio_data)
+                if transcript:
+                    return transcript.strip(), "pocketsphinx"
+            except sr.UnknownValueError:
+                pass
+            except Exception as e:
+                logger.warning(f"Sphinx in-memory transcription failed: {e}")
+        
+        return None, None
+    
     def transcribe_with_google(self, audio_file_path):
         """Transcribe using Google Speech Recognition"""
         try:
@@ -255,13 +641,18 @@ class AudioModel:
             # Convert to WAV if needed
             converted_path = self.convert_audio_format(audio_file_path)
             
-            # Load audio file
-            audio_data = self.load_audio_file(converted_path)
-            if audio_data is None:
-                return None, None
-            
-            # Try Google recognition
-            transcript = self.recognizer.recognize_google(audio_data)
+            with self.recognizer_pool.checkout() as slot:
+                # Load audio file
+                try:
+                    audio_data = self.load_audio_file(converted_path, slot.recognizer)
+                finally:
+                    if converted_path != audio_file_path and os.path.exists(converted_path):
+                        os.remove(converted_path)
+                if audio_data is None:
+                    return None, None
+                
+                # Try Google recognition
+                transcript = slot.recognizer.recognize_google(audio_data)
             
             if transcript:
                 logger.info(f"Google transcription successful: '{transcript[:50]}...'")
@@ -287,13 +678,18 @@ class AudioModel:
             # Convert to WAV if needed
             converted_path = self.convert_audio_format(audio_file_path)
             
-            # Load audio file
-            audio_data = self.load_audio_file(converted_path)
-            if audio_data is None:
-                return None, None
-            
-            # Try Sphinx recognition
-            transcript = self.recognizer.recognize_sphinx(audio_data)
+            with self.recognizer_pool.checkout() as slot:
+                # Load audio file
+                try:
+                    audio_data = self.load_audio_file(converted_path, slot.recognizer)
+                finally:
+                    if converted_path != audio_file_path and os.path.exists(converted_path):
+                        os.remove(converted_path)
+                if audio_data is None:
+                    return None, None
+                
+                # Try Sphinx recognition
+                transcript = slot.recognizer.recognize_sphinx(audio_data)
             
             if transcript:
                 logger.info(f"Sphinx transcription successful: '{transcript[:50]}...'")
@@ -329,8 +725,10 @@ class AudioModel:
             logger.error(f"Fallback transcription error: {e}")
             return None, None
     
-    def load_audio_file(self, audio_file_path):
+    def load_audio_file(self, audio_file_path, recognizer=None):
         """Load audio file and convert to AudioData object"""
+        # Ambient-noise adjustment mutates the recognizer - never use a shared one
+        recognizer = recognizer or self.create_recognizer()
         try:
             logger.info(f"Loading audio file: {audio_file_path}")
             
@@ -338,9 +736,9 @@ class AudioModel:
             try:
                 with sr.AudioFile(audio_file_path) as source:
                     # Adjust for ambient noise
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                    recognizer.adjust_for_ambient_noise(source, duration=0.5)
                     # Record the entire audio file
-                    audio_data = self.recognizer.record(source)
+                    audio_data = recognizer.record(source)
                     logger.info("Audio loaded successfully with AudioFile")
                     return audio_data
             except Exception as e:
@@ -364,8 +762,8 @@ class AudioModel:
                 # Load with speech_recognition
                 try:
                     with sr.AudioFile(temp_wav.name) as source:
-                        self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                        audio_data = self.recognizer.record(source)
+                        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        audio_data = recognizer.record(source)
                     
                     logger.info("Audio loaded successfully with pydub conversion")
                     return audio_data
@@ -392,128 +790,18 @@ class AudioModel:
         """Extract recipe-related preferences from transcript"""
         try:
             logger.info(f"Extracting recipe information from: '{transcript}'")
-            
-            recipe_info = {
-                'serving_size': 4,  # default
-                'dietary_restrictions': [],
-                'spice_level': 'Medium',  # default
-                'cooking_time': 'Normal',  # default
-                'cooking_method': [],
-                'preparation_style': []
-            }
-            
-            text = transcript.lower()
-            
-            # Extract serving size
-            serving_patterns = [
-                r'for (\d+) people',
-                r'(\d+) servings?',
-                r'serves? (\d+)',
-                r'make it for (\d+)',
-                r'(\d+) portions?',
-                r'(\d+) person'
-            ]
-            
-            for pattern in serving_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    try:
-                        serving_size = int(match.group(1))
-                        if 1 <= serving_size <= 20:  # reasonable range
-                            recipe_info['serving_size'] = serving_size
-                            logger.info(f"Found serving size: {serving_size}")
-                            break
-                    except (ValueError, IndexError):
-                        continue
-            
-            # Extract dietary restrictions
-            dietary_keywords = {
-                'vegetarian': ['vegetarian', 'veggie', 'no meat', 'veg only'],
-                'vegan': ['vegan', 'no dairy', 'plant based', 'plant-based'],
-                'gluten_free': ['gluten free', 'gluten-free', 'no gluten'],
-                'dairy_free': ['dairy free', 'dairy-free', 'no dairy', 'lactose free'],
-                'low_carb': ['low carb', 'low-carb', 'keto', 'ketogenic'],
-                'low_fat': ['low fat', 'low-fat', 'light'],
-                'halal': ['halal'],
-                'kosher': ['kosher']
-            }
-            
-            for restriction, keywords in dietary_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    recipe_info['dietary_restrictions'].append(restriction)
-                    logger.info(f"Found dietary restriction: {restriction}")
-            
-            # Extract spice level
-            spice_keywords = {
-                'Mild': ['mild', 'not spicy', 'no spice', 'gentle', 'light spice', 'less spicy'],
-                'Medium': ['medium', 'moderate', 'normal spice', 'regular spice'],
-                'Hot': ['hot', 'spicy', 'extra spice', 'very spicy', 'more spicy'],
-                'Extra Hot': ['extra hot', 'very hot', 'extremely spicy', 'super spicy', 'really spicy']
-            }
-            
-            for level, keywords in spice_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    recipe_info['spice_level'] = level
-                    logger.info(f"Found spice level: {level}")
-                    break
-            
-            # Extract cooking time preferences
-            time_keywords = {
-                'Quick': ['quick', 'fast', 'rapid', '15 minutes', '10 minutes', 'short time', 'quickly'],
-                'Normal': ['normal', 'regular', 'standard', 'usual time'],
-                'Slow': ['slow', 'long time', 'take time', 'slow cook', 'hours', 'slowly']
-            }
-            
-            for time_pref, keywords in time_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    recipe_info['cooking_time'] = time_pref
-                    logger.info(f"Found time preference: {time_pref}")
-                    break
-            
-            # Extract cooking methods
-            cooking_methods = {
-                'grilled': ['grill', 'grilled', 'barbecue', 'bbq'],
-                'fried': ['fry', 'fried', 'deep fry', 'pan fry'],
-                'baked': ['bake', 'baked', 'oven', 'roast'],
-                'steamed': ['steam', 'steamed'],
-                'boiled': ['boil', 'boiled'],
-                'sauteed': ['saute', 'sauteed', 'pan cook'],
-                'stir_fried': ['stir fry', 'stir-fry', 'wok']
-            }
-            
-            for method, keywords in cooking_methods.items():
-                if any(keyword in text for keyword in keywords):
-                    recipe_info['cooking_method'].append(method)
-                    logger.info(f"Found cooking method: {method}")
-            
-            # Extract preparation style
-            prep_styles = {
-                'easy': ['easy', 'simple', 'basic', 'simple recipe'],
-                'traditional': ['traditional', 'authentic', 'classic'],
-                'modern': ['modern', 'contemporary', 'new style'],
-                'healthy': ['healthy', 'nutritious', 'good for you'],
-                'comfort': ['comfort food', 'hearty', 'filling']
-            }
-            
-            for style, keywords in prep_styles.items():
-                if any(keyword in text for keyword in keywords):
-                    recipe_info['preparation_style'].append(style)
-                    logger.info(f"Found prep style: {style}")
-            
+            recipe_info = self.preference_extractor.extract(transcript)
             logger.info(f"Recipe information extracted: {recipe_info}")
             return recipe_info
             
         except Exception as e:
             logger.error(f"Error extracting recipe information: {str(e)}")
             # Return default values on error
-            return {
-                'serving_size': 4,
-                'dietary_restrictions': [],
-                'spice_level': 'Medium',
-                'cooking_time': 'Normal',
-                'cooking_method': [],
-                'preparation_style': []
-            }
+            return default_recipe_info()
+    
+    def extract_recipe_information_batch(self, transcripts):
+        """Extract preferences for many transcripts in one call"""
+        return self.preference_extractor.extract_batch(transcripts)
     
     def test_audio_processing(self):
         """Test the audio processing capabilities"""
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Audio Probe
+Reads only the container/WAV header to learn duration, sample rate and channels,
+and enforces duration/sample-rate limits before any decoding or engine work
+"""
+
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import wave
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AudioLimits:
+    def __init__(self, max_duration=None, over_limit=None, max_sample_rate=None):
+        """Configurable limits (defaults come from the environment)"""
+        self.max_duration = float(max_duration if max_duration is not None
+                                  else os.environ.get('AUDIO_MAX_DURATION', 60))
+        # 'reject' refuses long recordings, 'truncate' keeps the first max_duration seconds
+        self.over_limit = over_limit or os.environ.get('AUDIO_OVER_LIMIT', 'truncate')
+        self.max_sample_rate = int(max_sample_rate if max_sample_rate is not None
+                                   else os.environ.get('AUDIO_MAX_SAMPLE_RATE', 16000))
+
+    def to_dict(self):
+        return {
+            'max_duration_seconds': self.max_duration,
+            'over_limit': self.over_limit,
+            'max_sample_rate': self.max_sample_rate
+        }
+
+def probe_wav_header(audio_file_path):
+    """Parse the RIFF header with the wave module (no sample data is read)"""
+    with wave.open(audio_file_path, 'rb') as wav_file:
+        frame_rate = wav_file.getframerate()
+        frames = wav_file.getnframes()
+        return {
+            'probed': True,
+            'container': 'wav',
+            'duration_seconds': round(frames / frame_rate, 3) if frame_rate else None,
+            'sample_rate': frame_rate,
+            'channels': wav_file.getnchannels(),
+            'sample_width': wav_file.getsampwidth(),
+            'probe_method': 'wav_header'
+        }
+
+def probe_with_ffprobe(audio_file_path):
+    """Ask ffprobe for the container header fields"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries',
+         'format=duration,format_name:stream=sample_rate,channels',
+         '-select_streams', 'a:0', '-of', 'json', audio_file_path],
+        capture_output=True, text=True, timeout=10
+    )
+    if result.returncode != 0:
+        return None
+
+    info = json.loads(result.stdout or '{}')
+    stream = (info.get('streams') or [{}])[0]
+    container = info.get('format', {})
+    duration = container.get('duration')
+    return {
+        'probed': True,
+        'container': container.get('format_name'),
+        'duration_seconds': round(float(duration), 3) if duration not in (None, 'N/A') else None,
+        'sample_rate': int(stream['sample_rate']) if stream.get('sample_rate') else None,
+        'channels': stream.get('channels'),
+        'probe_method': 'ffprobe'
+    }
+
+def probe_audio(audio_file_path):
+    """Header-only probe: duration, sample rate and channels (probed=False if unknown)"""
+    with open(audio_file_path, 'rb') as f:
+        header = f.read(12)
+
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        try:
+            return probe_wav_header(audio_file_path)
+        except (wave.Error, EOFError) as e:
+            logger.warning(f"WAV header probe failed: {e}")
+
+    try:
+        probe = probe_with_ffprobe(audio_file_path)
+        if probe:
+            return probe
+    except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError, ValueError) as e:
+        logger.warning(f"ffprobe unavailable or failed: {e}")
+
+    return {'probed': False}
+
+def truncate_wav(audio_file_path, max_duration):
+    """Copy the first max_duration seconds of a WAV file without ffmpeg"""
+    with wave.open(audio_file_path, 'rb') as source:
+        params = source.getparams()
+        frames = source.readframes(int(max_duration * source.getframerate()))
+
+    output = tempfile.NamedTemporaryFile(suffix='_limited.wav', delete=False)
+    output.close()
+    with wave.open(output.name, 'wb') as target:
+        target.setparams(params)
+        target.writeframes(frames)
+    return output.name
+
+def apply_limits(audio_file_path, probe, limits, ffmpeg_available):
+    """
+    Enforce limits on a probed file.
+    Returns (path_to_transcribe, actions, error) - path differs from the input when a
+    truncated/downsampled copy was written; error is set when the file is rejected.
+    """
+    duration = probe.get('duration_seconds')
+    sample_rate = probe.get('sample_rate')
+
+    too_long = duration is not None and duration > limits.max_duration
+    too_fast = sample_rate is not None and sample_rate > limits.max_sample_rate
+
+    if too_long and limits.over_limit == 'reject':
+        return audio_file_path, ['rejected'], (
+            f'Audio is {duration:.1f}s long; the limit is {limits.max_duration:.0f}s'
+        )
+
+    if not too_long and not too_fast:
+        return audio_file_path, [], None
+
+    actions = []
+    if ffmpeg_available:
+        output = tempfile.NamedTemporaryFile(suffix='_limited.wav', delete=False)
+        output.close()
+        cmd = ['ffmpeg', '-v', 'error', '-i', audio_file_path]
+        if too_long:
+            cmd += ['-t', str(limits.max_duration)]
+            actions.append('truncated')
+        if too_fast:
+            cmd += ['-ar', str(limits.max_sample_rate)]
+            actions.append('downsampled')
+        cmd += ['-acodec', 'pcm_s16le', '-y', output.name]
+
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode == 0:
+            return output.name, actions, None
+        logger.error(f"FFmpeg limit enforcement failed: {result.stderr}")
+        os.unlink(output.name)
+        actions = []
+
+    # Without ffmpeg only WAV truncation is possible
+    if too_long and probe.get('container') == 'wav':
+        return truncate_wav(audio_file_path, limits.max_duration), ['truncated'], None
+
+    if too_long:
+        return audio_file_path, ['rejected'], (
+            f'Audio is {duration:.1f}s long and cannot be truncated; the limit is {limits.max_duration:.0f}s'
+        )
+    return audio_file_path, actions, None
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Recipe Catalog Builder
+Generates a canonical recipe for every class in the label map and every common
+preference profile, with bounded concurrency; re-running fills in only what is missing
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import google.generativeai as genai
+
+from llm_client import GeminiClient
+from llm_scheduler import BACKGROUND, LLMScheduler
+from prompt_builder import RecipePromptBuilder
+from recipe_catalog import PREFERENCE_PROFILES, RecipeCatalog, load_label_map, profile_recipe_info
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def generate_entry(client, prompt_builder, dish, profile):
+    """One catalog recipe in the same shape /predict returns from Gemini"""
+    prompt = prompt_builder.build(
+        dish_name=dish,
+        cuisine=None,           # left to the model - it knows the dish
+        recipe_info=profile_recipe_info(profile) if profile != 'default' else None
+    )
+    response = client.generate(prompt, lane=BACKGROUND, generation_config=prompt_builder.generation_config('catalog'))
+    prompt_builder.record_usage('catalog', response)
+    return {
+        'success': True,
+        'recipe': json.loads(response.text),
+        'method': 'gemini_ai',
+        'message': f"Recipe for {dish} generated successfully"
+    }
+
+def build_catalog(catalog, client, prompt_builder, dishes, profiles, concurrency):
+    """Generate every missing (dish, profile) pair and report progress"""
+    completed = catalog.completed()
+    pending = [(dish, profile) for dish in dishes for profile in profiles if (dish, profile) not in completed]
+
+    print(f"📚 {len(dishes)} dishes × {len(profiles)} profiles, "
+          f"{len(completed)} already catalogued, {len(pending)} to generate")
+    if not pending:
+        return
+
+    start = time.time()
+    done = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(generate_entry, client, prompt_builder, dish, profile): (dish, profile)
+            for dish, profile in pending
+        }
+        for future in as_completed(futures):
+            dish, profile = futures[future]
+            try:
+                catalog.put(dish, profile, future.result())
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Could not catalog {dish}/{profile}: {e}")
+            done += 1
+            if done % 25 == 0 or done == len(pending):
+                print(f"   {done}/{len(pending)} recipes, {done / (time.time() - start):.2f}/sec")
+
+    print("=" * 50)
+    print(f"✅ Catalogued {done - failed} recipes ({failed} failed, retried on the next run) "
+          f"in {time.time() - start:.1f}s")
+    print(f"🔢 Tokens: {prompt_builder.stats()['usage'].get('catalog')}")
+    print(f"📄 Catalog: {catalog.stats()}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute recipes for every classifier class')
+    parser.add_argument('-o', '--output', default=os.environ.get('RECIPE_CATALOG_DB', 'recipe_catalog.db'),
+                        help='Catalog SQLite file (resumable)')
+    parser.add_argument('--label-map', help='Path to label_map.pkl')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='Concurrent Gemini calls')
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PREFERENCE_PROFILES),
+                        default=list(PREFERENCE_PROFILES), help='Preference profiles to generate')
+    # The limits are self-imposed: this process cannot see a live server's scheduler, so by default
+    # it takes half of the key's documented quota and leaves the other half to the server
+    parser.add_argument('--rpm', type=int, default=(int(os.environ.get('GEMINI_STRONG_RPM', 15)) + 1) // 2,
+                        help='Requests per minute the build allows itself (0 = unlimited; '
+                             'default half of GEMINI_STRONG_RPM)')
+    parser.add_argument('--tpm', type=int, default=(int(os.environ.get('GEMINI_STRONG_TPM', 1_000_000)) + 1) // 2,
+                        help='Tokens per minute the build allows itself (0 = unlimited; '
+                             'default half of GEMINI_STRONG_TPM)')
+    args = parser.parse_args()
+
+    api_key = os.environ.get('GOOGLE_API_KEY')
+    if not api_key:
+        parser.error('GOOGLE_API_KEY must be set')
+    genai.configure(api_key=api_key)
+
+    client = GeminiClient(
+        genai.GenerativeModel(os.environ.get('GEMINI_STRONG_MODEL', 'gemini-1.5-flash')),
+        timeout=float(os.environ.get('GEMINI_TIMEOUT', 60)),
+        max_retries=int(os.environ.get('GEMINI_MAX_RETRIES', 4)),
+        max_in_flight=args.concurrency,
+        scheduler=LLMScheduler('catalog', rpm=args.rpm, tpm=args.tpm)
+    )
+    catalog = RecipeCatalog(args.output)
+    build_catalog(catalog, client, RecipePromptBuilder(), load_label_map(args.label_map),
+                  args.profiles, args.concurrency)
+
+if __name__ == "__main__":
+    main()
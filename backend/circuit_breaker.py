@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Circuit Breaker
+Stops calling a failing upstream after repeated failures so callers can fall back
+immediately, letting periodic half-open probes decide when to resume
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpen(Exception):
+    """The breaker is open - the upstream is not being called"""
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, window=60.0, open_seconds=30.0, half_open_probes=1):
+        """
+        Opens after failure_threshold failures within window seconds; after open_seconds
+        up to half_open_probes requests are let through to test the upstream.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.failures = deque()
+        self.opened_at = None
+        self.probes_in_flight = 0
+        self.lock = threading.Lock()
+
+        self.transitions = {f'{CLOSED}->{OPEN}': 0, f'{OPEN}->{HALF_OPEN}': 0,
+                            f'{HALF_OPEN}->{CLOSED}': 0, f'{HALF_OPEN}->{OPEN}': 0}
+        self.rejected = 0
+        self.successes = 0
+        self.total_failures = 0
+
+    def transition_locked(self, new_state):
+        key = f'{self.state}->{new_state}'
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        logger.warning(f"Circuit '{self.name}': {self.state} -> {new_state}")
+        self.state = new_state
+        if new_state == OPEN:
+            self.opened_at = time.time()
+            self.probes_in_flight = 0
+        elif new_state == CLOSED:
+            self.failures.clear()
+            self.probes_in_flight = 0
+
+    def allow_request(self):
+        """True if the call may go upstream; False means use the fallback now"""
+        with self.lock:
+            if self.state == OPEN and time.time() - self.opened_at >= self.open_seconds:
+                self.transition_locked(HALF_OPEN)
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self.probes_in_flight < self.half_open_probes:
+                self.probes_in_flight += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def check(self):
+        """Raise CircuitOpen instead of returning False"""
+        if not self.allow_request():
+            raise CircuitOpen(f"Circuit '{self.name}' is {self.state}")
+
+    def record_success(self):
+        with self.lock:
+            self.successes += 1
+            if self.state == HALF_OPEN:
+                self.transition_locked(CLOSED)
+
+    def record_skipped(self):
+        """An allowed call that told us nothing about the upstream (e.g. a local timeout) - frees its probe"""
+        with self.lock:
+            if self.state == HALF_OPEN and self.probes_in_flight > 0:
+                self.probes_in_flight -= 1
+
+    def record_failure(self):
+        """A failure or timeout of an allowed call"""
+        now = time.time()
+        with self.lock:
+            self.total_failures += 1
+            if self.state == HALF_OPEN:
+                self.transition_locked(OPEN)
+                return
+
+            self.failures.append(now)
+            while self.failures and now - self.failures[0] > self.window:
+                self.failures.popleft()
+            if self.state == CLOSED and len(self.failures) >= self.failure_threshold:
+                self.transition_locked(OPEN)
+
+    def stats(self):
+        with self.lock:
+            now = time.time()
+            return {
+                'name': self.name,
+                'state': self.state,
+                'failures_in_window': sum(1 for t in self.failures if now - t <= self.window),
+                'failure_threshold': self.failure_threshold,
+                'window_seconds': self.window,
+                'open_seconds': self.open_seconds,
+                'seconds_until_probe': round(max(0.0, self.open_seconds - (now - self.opened_at)), 1)
+                                       if self.state == OPEN else None,
+                'transitions': dict(self.transitions),
+                'rejected': self.rejected,
+                'successes': self.successes,
+                'failures': self.total_failures
+            }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Incremental Recipe Parser
+Parses a streamed JSON recipe object chunk by chunk, reporting each top-level field
+as soon as it is complete and each array element (ingredient, step) as it arrives
+"""
+
+import json
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WHITESPACE = ' \t\r\n'
+
+class IncrementalRecipeParser:
+    def __init__(self):
+        """Character-level scanner over the growing response text"""
+        self.buffer = ''
+        self.pos = 0
+        self.stack = []              # open containers: '{' or '['
+        self.in_string = False
+        self.escape = False
+        self.done = False
+
+        # Top-level (depth 1) state: key -> colon -> value -> comma
+        self.expect = 'key'
+        self.current_key = None
+        self.key_start = None
+        self.value_start = None
+        self.element_start = None    # element of a top-level array
+
+    def in_top_level_array(self):
+        return len(self.stack) == 2 and self.stack[-1] == '[' and self.expect == 'value_container'
+
+    def decode(self, text):
+        try:
+            return True, json.loads(text)
+        except ValueError:
+            logger.debug(f"Skipping unparseable fragment: {text[:50]}")
+            return False, None
+
+    def emit_field(self, events, end):
+        ok, value = self.decode(self.buffer[self.value_start:end])
+        if ok:
+            events.append(('field', self.current_key, value))
+        self.value_start = None
+
+    def emit_element(self, events, end):
+        text = self.buffer[self.element_start:end].strip()
+        self.element_start = None
+        if text:
+            ok, value = self.decode(text)
+            if ok:
+                events.append(('item', self.current_key, value))
+
+    def feed(self, chunk):
+        """Add text; returns [('field', key, value) | ('item', key, value), ...]"""
+        self.buffer += chunk
+        events = []
+
+        while self.pos < len(self.buffer) and not self.done:
+            i = self.pos
+            ch = self.buffer[i]
+            self.pos += 1
+            depth = len(self.stack)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if depth == 1 and self.expect == 'key_string':
+                        ok, key = self.decode(self.buffer[self.key_start:i + 1])
+                        self.current_key = key if ok else None
+                        self.expect = 'colon'
+                    elif depth == 1 and self.expect == 'value_string':
+                        self.emit_field(events, i + 1)
+                        self.expect = 'comma'
+                continue
+
+            if depth == 0:
+                # Skip code fences or chatter before the root object
+                if ch == '{':
+                    self.stack.append('{')
+                    self.expect = 'key'
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                if depth == 1 and self.expect == 'key':
+                    self.key_start = i
+                    self.expect = 'key_string'
+                elif depth == 1 and self.expect == 'value':
+                    self.value_start = i
+                    self.expect = 'value_string'
+                elif self.in_top_level_array() and self.element_start is None:
+                    self.element_start = i
+            elif ch in '{[':
+                if depth == 1 and self.expect == 'value':
+                    self.value_start = i
+                    self.expect = 'value_container'
+                elif self.in_top_level_array() and self.element_start is None:
+                    self.element_start = i
+                self.stack.append(ch)
+            elif ch in '}]':
+                if self.in_top_level_array() and ch == ']' and self.element_start is not None:
+                    self.emit_element(events, i)
+                if depth == 1 and self.expect == 'value_scalar':
+                    self.emit_field(events, i)
+                self.stack.pop()
+                if len(self.stack) == 1 and self.expect == 'value_container':
+                    self.emit_field(events, i + 1)
+                    self.expect = 'comma'
+                elif not self.stack:
+                    self.done = True
+            elif ch == ',':
+                if depth == 1:
+                    if self.expect == 'value_scalar':
+                        self.emit_field(events, i)
+                    self.expect = 'key'
+                elif self.in_top_level_array():
+                    self.emit_element(events, i)
+            elif ch == ':':
+                if depth == 1 and self.expect == 'colon':
+                    self.expect = 'value'
+            elif ch not in WHITESPACE:
+                if depth == 1 and self.expect == 'value':
+                    self.value_start = i
+                    self.expect = 'value_scalar'
+                elif self.in_top_level_array() and self.element_start is None:
+                    self.element_start = i
+
+        return events
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Keyword Spotter
+Fast path for short voice commands: PocketSphinx keyword search over the preference
+vocabulary instead of full speech recognition
+"""
+
+import logging
+import math
+import os
+import tempfile
+from array import array
+
+import speech_recognition as sr
+
+from recognizer_pool import RecognizerPool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'twelve': 12
+}
+
+SPHINX_FRAMES_PER_SECOND = 100
+
+# The en-US model bundled with SpeechRecognition (what recognize_sphinx loads)
+SPHINX_DATA = os.path.join(os.path.dirname(os.path.realpath(sr.__file__)), 'pocketsphinx-data', 'en-US')
+
+def load_dictionary_words(path):
+    """Words of a CMU pronunciation dictionary; alternate pronunciations ('word(2)') are folded in"""
+    words = set()
+    with open(path, encoding='utf-8', errors='replace') as dictionary:
+        for line in dictionary:
+            word = line.split(' ', 1)[0]
+            words.add(word.split('(', 1)[0].lower())
+    return words
+
+def speech_seconds(raw, sample_rate, sample_width, threshold=300, frame_ms=10):
+    """Seconds of audio whose 10ms frame energy is above the speech threshold"""
+    if sample_width != 2:
+        return len(raw) / float(sample_rate * sample_width)
+    samples = array('h', raw[:len(raw) - len(raw) % 2])
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    voiced = 0
+    for start in range(0, len(samples), frame):
+        chunk = samples[start:start + frame]
+        if chunk and math.sqrt(sum(s * s for s in chunk) / len(chunk)) >= threshold:
+            voiced += 1
+    return voiced * frame_ms / 1000.0
+
+class KeywordSpotter:
+    def __init__(self, phrases, sensitivity=0.8, max_duration=4.0, min_confidence=0.6,
+                 language_directory=SPHINX_DATA, decoders=1):
+        """
+        phrases: the preference vocabulary (see PreferenceExtractor.keyword_phrases)
+        decoders: persistent Sphinx decoders, loaded once and reused by every spot()
+        """
+        self.max_duration = max_duration
+        self.min_confidence = min_confidence
+        self.acoustic_model = os.path.join(language_directory, 'acoustic-model')
+        self.language_model = os.path.join(language_directory, 'language-model.lm.bin')
+        self.dictionary = os.path.join(language_directory, 'pronounciation-dictionary.dict')
+
+        # Spoken serving sizes ("for two") are rewritten to the digit form the extractor reads
+        candidates = {phrase: phrase for phrase in phrases}
+        for word, number in NUMBER_WORDS.items():
+            candidates[f'for {word}'] = f'for {number} people'
+            candidates[f'serves {word}'] = f'serves {number}'
+
+        # Sphinx rejects the whole keyword list if one word is missing from its dictionary
+        # (digits, hyphenated forms, 'halal', 'ketogenic', ...) - those are left to full ASR
+        words = load_dictionary_words(self.dictionary)
+        self.spoken_forms = {}
+        skipped = []
+        for phrase, target in candidates.items():
+            if all(word.isalpha() and word in words for word in phrase.split()):
+                self.spoken_forms[phrase] = target
+            else:
+                skipped.append(phrase)
+        if skipped:
+            logger.info(f"Keyword spotting skips {len(skipped)} phrases not in the Sphinx dictionary: {skipped}")
+
+        self.keyword_entries = [(phrase, sensitivity) for phrase in self.spoken_forms]
+        self.decoder_pool = RecognizerPool(self.create_decoder, size=decoders)
+
+    def create_decoder(self):
+        """A Sphinx decoder with the keyword search active, configured as recognize_sphinx does"""
+        from pocketsphinx import pocketsphinx
+
+        config = pocketsphinx.Config()
+        config.set_string('-hmm', self.acoustic_model)
+        config.set_string('-lm', self.language_model)
+        config.set_string('-dict', self.dictionary)
+        config.set_string('-logfn', os.devnull)
+        decoder = pocketsphinx.Decoder(config)
+
+        # Sensitivities map to thresholds between 1e-50 and 1e-5, as in recognize_sphinx
+        with tempfile.NamedTemporaryFile('w', suffix='.kws', delete=False) as keywords:
+            keywords.writelines(f"{phrase} /1e{100 * sensitivity - 110}/\n"
+                                for phrase, sensitivity in self.keyword_entries)
+        try:
+            decoder.add_kws('keywords', keywords.name)
+        finally:
+            os.remove(keywords.name)
+        decoder.activate_search('keywords')
+        logger.info(f"Keyword spotting decoder loaded ({len(self.keyword_entries)} phrases)")
+        return decoder
+
+    def accepts(self, duration):
+        """Only clips known to be short take the fast path"""
+        return duration is not None and 0 < duration <= self.max_duration
+
+    def segment_probability(self, decoder, segment):
+        """Posterior of a segment when the pocketsphinx API exposes it"""
+        logmath = getattr(decoder, 'logmath', None)
+        if logmath is None and hasattr(decoder, 'get_logmath'):
+            logmath = decoder.get_logmath()
+        if logmath is None or getattr(segment, 'prob', None) is None:
+            return None
+        return logmath.exp(segment.prob)
+
+    def spot(self, audio_data):
+        """
+        Keyword search on an sr.AudioData.
+        Returns {'transcript', 'confidence', 'keywords', 'coverage'}; the confidence is the
+        share of voiced audio explained by keywords, scaled by their mean posterior.
+        """
+        raw = audio_data.get_raw_data(convert_rate=16000, convert_width=2)
+
+        spotted = []
+        probabilities = []
+        covered_frames = 0
+        with self.decoder_pool.checkout() as decoder:
+            decoder.start_utt()
+            decoder.process_raw(raw, False, True)
+            decoder.end_utt()
+            for segment in decoder.seg():
+                phrase = segment.word.strip().lower()
+                if phrase not in self.spoken_forms:
+                    continue
+                spotted.append((segment.start_frame, self.spoken_forms[phrase]))
+                covered_frames += segment.end_frame - segment.start_frame + 1
+                probability = self.segment_probability(decoder, segment)
+                if probability is not None:
+                    probabilities.append(probability)
+
+        if not spotted:
+            return None
+
+        voiced = speech_seconds(raw, 16000, 2)
+        coverage = min(1.0, covered_frames / SPHINX_FRAMES_PER_SECOND / voiced) if voiced else 0.0
+        posterior = sum(probabilities) / len(probabilities) if probabilities else 1.0
+
+        keywords = [phrase for _, phrase in sorted(spotted)]
+        return {
+            'transcript': ', '.join(keywords),
+            'keywords': keywords,
+            'coverage': round(coverage, 3),
+            'confidence': round(coverage * posterior, 3)
+        }
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft LLM Client
+Wraps the Gemini model with per-call deadlines, jittered retries on transient errors,
+a bounded in-flight limit, an optional circuit breaker, an optional quota scheduler,
+budgeted tail-latency hedging and an asyncio interface
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    TRANSIENT_ERRORS = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.TooManyRequests,
+    )
+    QUOTA_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+    OUTAGE_ERRORS = (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+    )
+except ImportError:
+    TRANSIENT_ERRORS = ()
+    QUOTA_ERRORS = ()
+    OUTAGE_ERRORS = ()
+
+from llm_scheduler import INTERACTIVE
+
+# Recent first-token times the hedge delay (their p95) is taken from
+HEDGE_WINDOW = 200
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class LLMTimeout(Exception):
+    """The call's deadline passed before a response was available"""
+
+    def __init__(self, message, upstream=True):
+        """upstream: False when the time ran out locally (no in-flight slot) rather than waiting on Gemini"""
+        super().__init__(message)
+        self.upstream = upstream
+
+def is_transient(error):
+    """Errors worth retrying: rate limits, overload, upstream 5xx and timeouts"""
+    return isinstance(error, TRANSIENT_ERRORS + (ConnectionError, TimeoutError))
+
+def is_outage(error):
+    """Errors that say Gemini itself is unhealthy: upstream timeouts and 5xx/unavailable"""
+    if isinstance(error, LLMTimeout):
+        return error.upstream
+    return isinstance(error, OUTAGE_ERRORS + (ConnectionError, TimeoutError))
+
+def estimate_tokens(prompt, generation_config=None):
+    """Quota estimate before the call: ~4 characters per prompt token plus the output budget"""
+    output_budget = (generation_config or {}).get('max_output_tokens', 1024)
+    return len(str(prompt)) // 4 + output_budget
+
+def total_tokens(response):
+    """Tokens Gemini charged for a response (or final stream chunk), None if not reported"""
+    metadata = getattr(response, 'usage_metadata', None)
+    return getattr(metadata, 'total_token_count', None) if metadata is not None else None
+
+class GeminiClient:
+    def __init__(self, model, timeout=30.0, max_retries=2, backoff_base=0.5,
+                 backoff_max=8.0, max_in_flight=8, breaker=None, scheduler=None,
+                 hedge_budget=0.0, hedge_min_samples=20, hedge_burst=3, in_flight_limit=None):
+        """
+        model: a genai.GenerativeModel, created once so its transport/channel is reused
+        timeout: overall deadline per call, shared by all of its attempts
+        breaker: CircuitBreaker that fails calls fast (CircuitOpen) while Gemini is down
+        scheduler: LLMScheduler for this model's RPM/TPM quota (QuotaExceeded when shed)
+        hedge_budget: hedges allowed per call (0 disables); a hedged call that has no response
+        by the observed p95 first-token time gets a duplicate, and the first response wins
+        in_flight_limit: BoundedSemaphore(max_in_flight) shared with other clients, so several
+        models stay under one cap (default: this client's own)
+        """
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_in_flight = max_in_flight
+        self.breaker = breaker
+        self.scheduler = scheduler
+        self.hedge_budget = hedge_budget
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_burst = hedge_burst
+        self.hedge_tokens = float(hedge_burst)
+        self.first_token_times = deque(maxlen=HEDGE_WINDOW)
+        self.in_flight_limit = in_flight_limit or threading.BoundedSemaphore(max_in_flight)
+        self.async_executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='gemini-async')
+        self.hedge_executor = ThreadPoolExecutor(max_workers=2 * max_in_flight, thread_name_prefix='gemini-hedge')
+
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+
+    def count(self, counter, amount=1):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def backoff(self, attempt, deadline):
+        """Full-jitter exponential backoff that never sleeps past the deadline"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        remaining = deadline - time.time()
+        if delay >= remaining:
+            return False
+        time.sleep(delay)
+        return True
+
+    def acquire(self, deadline):
+        """Take an in-flight slot or give up at the deadline"""
+        if not self.in_flight_limit.acquire(timeout=max(0.0, deadline - time.time())):
+            self.count('timeouts')
+            raise LLMTimeout(f"No Gemini slot free within {self.timeout}s ({self.max_in_flight} in flight)",
+                             upstream=False)
+        with self.lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+        self.in_flight_limit.release()
+
+    def call_with_retries(self, attempt_call, timeout=None, call_info=None):
+        """
+        Run attempt_call(remaining_seconds) under the deadline, retrying transient errors.
+        call_info (optional dict) receives 'retries' for this call.
+        """
+        deadline = time.time() + (timeout or self.timeout)
+        self.count('calls')
+        attempt = 0
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.count('timeouts')
+                # Before the first attempt the time went on waiting locally, not on Gemini
+                raise LLMTimeout(f"Gemini call exceeded its {timeout or self.timeout}s deadline",
+                                 upstream=attempt > 0)
+            try:
+                return attempt_call(remaining)
+            except Exception as e:
+                # With a scheduler, a 429 is not retried: each retry would spend quota it never charged
+                quota_error = self.scheduler is not None and isinstance(e, QUOTA_ERRORS)
+                if not is_transient(e) or quota_error or attempt >= self.max_retries:
+                    self.count('failures')
+                    raise
+                if not self.backoff(attempt, deadline):
+                    self.count('timeouts')
+                    raise LLMTimeout(f"No time left to retry after: {e}", upstream=is_outage(e)) from e
+                attempt += 1
+                self.count('retries')
+                if call_info is not None:
+                    call_info['retries'] = attempt
+                logger.warning(f"Transient Gemini error, retry {attempt}/{self.max_retries}: {e}")
+
+    def admit(self, prompt, lane, deadline, kwargs):
+        """Wait for quota in the lane (None without a scheduler), then check the breaker"""
+        admission = None
+        if self.scheduler:
+            admission = self.scheduler.acquire(lane, estimate_tokens(prompt, kwargs.get('generation_config')), deadline)
+        try:
+            self.breaker_check()
+        except Exception:
+            self.settle(admission, None)
+            raise
+        return admission
+
+    def settle(self, admission, response=None, error=None):
+        """Charge the scheduler what the call really cost; calls never sent are refunded"""
+        if not self.scheduler or admission is None:
+            return
+        if error is not None:
+            if isinstance(error, QUOTA_ERRORS):
+                self.scheduler.record_quota_rejection()
+            # A failed call still counted against the quota - keep the estimate charged
+            return
+        if response is None:
+            self.scheduler.settle(admission, None)
+        elif total_tokens(response) is not None:
+            self.scheduler.settle(admission, total_tokens(response))
+
+    def hedge_delay(self):
+        """p95 of recent first-token times, None until there are enough samples to trust it"""
+        with self.lock:
+            if len(self.first_token_times) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self.first_token_times)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def take_hedge_token(self):
+        with self.lock:
+            if self.hedge_tokens < 1.0:
+                self.hedges_skipped += 1
+                return False
+            self.hedge_tokens -= 1.0
+            return True
+
+    def timed_call(self, prompt, remaining, kwargs):
+        """One generate_content, recording its first-token time (the whole response for unary calls)"""
+        started = time.time()
+        response = self.model.generate_content(prompt, request_options={'timeout': remaining}, **kwargs)
+        with self.lock:
+            self.first_token_times.append(time.time() - started)
+        return response
+
+    def hedged_call(self, prompt, remaining, lane, kwargs, call_info):
+        """
+        Issue the call; if it has not answered by the hedge delay and the budget, a free slot and the
+        quota allow, issue a duplicate. The first successful response wins; the other is cancelled if
+        it has not started, otherwise left to finish in the background and ignored.
+        """
+        deadline = time.time() + remaining
+        with self.lock:
+            self.hedge_tokens = min(float(self.hedge_burst), self.hedge_tokens + self.hedge_budget)
+        delay = self.hedge_delay()
+        if delay is None or delay >= remaining:
+            return self.timed_call(prompt, remaining, kwargs)
+        primary = self.hedge_executor.submit(self.timed_call, prompt, remaining, kwargs)
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.take_hedge_token():
+            return primary.result()
+
+        # The duplicate needs its own slot and quota, right now - otherwise keep waiting on the primary
+        if not self.in_flight_limit.acquire(blocking=False):
+            self.count('hedges_skipped')
+            return primary.result()
+        admission = None
+        if self.scheduler:
+            admission = self.scheduler.try_acquire(lane, estimate_tokens(prompt, kwargs.get('generation_config')))
+            if admission is None:
+                self.in_flight_limit.release()
+                self.count('hedges_skipped')
+                return primary.result()
+
+        self.count('hedges')
+        if call_info is not None:
+            call_info['hedged'] = True
+        logger.info(f"🪁 No Gemini response after {delay:.2f}s (p95) - hedging")
+        hedge = self.hedge_executor.submit(self.timed_call, prompt, max(0.001, deadline - time.time()), kwargs)
+        pending = {primary, hedge}
+        winner = []
+        error = None
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+                if not done:
+                    self.count('timeouts')
+                    raise LLMTimeout(f"Hedged Gemini call exceeded its {remaining:.1f}s deadline")
+                for future in done:
+                    if future.exception() is None:
+                        winner.append(future)
+                        if future is hedge:
+                            self.count('hedge_wins')
+                            if call_info is not None:
+                                call_info['hedge_won'] = True
+                        for loser in pending:
+                            loser.cancel()
+                        return future.result()
+                    error = error or future.exception()
+            raise error
+        finally:
+            # One leg may still be running: the extra slot and quota are held until both legs are done.
+            # The caller settles its admission with the returned response, so the hedge's admission
+            # is charged for the other leg - the loser when the hedge won, otherwise the hedge itself.
+            released = []
+
+            def release_once(_):
+                with self.lock:
+                    if released or not (primary.done() and hedge.done()):
+                        return
+                    released.append(True)
+                self.in_flight_limit.release()
+                leg = primary if winner and winner[0] is hedge else hedge
+                if leg.cancelled():
+                    self.settle(admission, None)
+                elif leg.exception() is not None:
+                    self.settle(admission, error=leg.exception())
+                else:
+                    self.settle(admission, leg.result())
+
+            primary.add_done_callback(release_once)
+            hedge.add_done_callback(release_once)
+
+    def breaker_check(self):
+        if self.breaker:
+            self.breaker.check()
+
+    def breaker_record(self, error=None):
+        """
+        Only outages trip the breaker; a rejected request still means Gemini answered.
+        Local slot timeouts and quota errors say nothing about Gemini's health either way.
+        """
+        if not self.breaker:
+            return
+        if error is None:
+            self.breaker.record_success()
+        elif is_outage(error):
+            self.breaker.record_failure()
+        elif isinstance(error, QUOTA_ERRORS + (LLMTimeout,)):
+            self.breaker.record_skipped()
+        else:
+            self.breaker.record_success()
+
+    def generate(self, prompt, timeout=None, call_info=None, lane=INTERACTIVE, hedge=False, **kwargs):
+        """
+        Blocking generate_content with deadline, quota lane, retries and the in-flight limit.
+        call_info (optional dict) receives 'retries', 'first_token_seconds' (the whole response)
+        and, for hedge=True calls, 'hedged' / 'hedge_won'.
+        """
+        started = time.time()
+        deadline = started + (timeout or self.timeout)
+        admission = self.admit(prompt, lane, deadline, kwargs)
+        if call_info is not None:
+            call_info.setdefault('retries', 0)
+        try:
+            try:
+                self.acquire(deadline)
+            except LLMTimeout:
+                self.settle(admission)
+                raise
+            try:
+                if hedge and self.hedge_budget > 0:
+                    attempt_call = lambda remaining: self.hedged_call(prompt, remaining, lane, kwargs, call_info)
+                else:
+                    attempt_call = lambda remaining: self.timed_call(prompt, remaining, kwargs)
+                response = self.call_with_retries(
+                    attempt_call,
+                    timeout=max(0.001, deadline - time.time()),
+                    call_info=call_info
+                )
+                if call_info is not None:
+                    call_info['first_token_seconds'] = time.time() - started
+            except Exception as e:
+                self.settle(admission, error=e)
+                raise
+            finally:
+                self.release()
+        except Exception as e:
+            self.breaker_record(e)
+            raise
+        self.breaker_record()
+        self.settle(admission, response)
+        return response
+
+    def stream(self, prompt, timeout=None, call_info=None, lane=INTERACTIVE, **kwargs):
+        """
+        Streaming generate_content; retries only happen before the first chunk arrives.
+        call_info (optional dict) receives 'retries' and 'first_token_seconds'.
+        """
+        started = time.time()
+        deadline = started + (timeout or self.timeout)
+        admission = self.admit(prompt, lane, deadline, kwargs)
+        if call_info is not None:
+            call_info.setdefault('retries', 0)
+        try:
+            self.acquire(deadline)
+        except Exception as e:
+            self.settle(admission)
+            self.breaker_record(e)
+            raise
+        try:
+            def first_chunk(remaining):
+                response = iter(self.model.generate_content(
+                    prompt, stream=True, request_options={'timeout': remaining}, **kwargs
+                ))
+                return response, next(response, None)
+
+            response, chunk = self.call_with_retries(first_chunk, timeout=max(0.001, deadline - time.time()),
+                                                     call_info=call_info)
+            if call_info is not None:
+                call_info['first_token_seconds'] = time.time() - started
+            last_chunk = chunk
+            while chunk is not None:
+                yield chunk
+                if time.time() > deadline:
+                    self.count('timeouts')
+                    raise LLMTimeout(f"Gemini stream exceeded its {timeout or self.timeout}s deadline")
+                last_chunk = chunk
+                chunk = next(response, None)
+        except GeneratorExit:
+            # Caller stopped reading after chunks arrived - Gemini was answering
+            self.breaker_record()
+            raise
+        except Exception as e:
+            self.settle(admission, error=e)
+            self.breaker_record(e)
+            raise
+        else:
+            self.breaker_record()
+            # The final chunk carries the usage for the whole stream
+            self.settle(admission, last_chunk)
+        finally:
+            self.release()
+
+    async def generate_async(self, prompt, timeout=None, **kwargs):
+        """Awaitable generate - many generations can be awaited concurrently from one thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.async_executor, lambda: self.generate(prompt, timeout=timeout, **kwargs)
+        )
+
+    def stats(self):
+        with self.lock:
+            return {
+                'timeout_seconds': self.timeout,
+                'max_retries': self.max_retries,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'calls': self.calls,
+                'retries': self.retries,
+                'timeouts': self.timeouts,
+                'failures': self.failures,
+                'hedge_budget': self.hedge_budget,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedges_skipped': self.hedges_skipped,
+                'hedge_rate': round(self.hedges / self.calls, 3) if self.calls else 0.0
+            }
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft LLM Metrics
+Per-call accounting of Gemini tokens, time to first token, latency and retries,
+aggregated into rolling histograms and per-route / per-tier totals
+"""
+
+import logging
+import threading
+from collections import deque
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (the last bucket is open-ended)
+SECONDS_BUCKETS = [0.25, 0.5, 1, 2, 4, 8, 16, 32]
+TOKEN_BUCKETS = [128, 256, 512, 1024, 2048, 4096]
+
+class RollingHistogram:
+    def __init__(self, bounds, window=1000):
+        """Bucket counts and percentiles over the last `window` observations"""
+        self.bounds = bounds
+        self.values = deque(maxlen=window)
+
+    def observe(self, value):
+        self.values.append(value)
+
+    def to_dict(self):
+        ordered = sorted(self.values)
+        if not ordered:
+            return {'count': 0}
+
+        def percentile(fraction):
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+        buckets = {f"le_{bound}": 0 for bound in self.bounds}
+        buckets['inf'] = 0
+        for value in ordered:
+            bound = next((b for b in self.bounds if value <= b), None)
+            buckets[f"le_{bound}" if bound is not None else 'inf'] += 1
+
+        return {
+            'count': len(ordered),
+            'avg': round(sum(ordered) / len(ordered), 3),
+            'p50': percentile(0.50),
+            'p90': percentile(0.90),
+            'p99': percentile(0.99),
+            'max': round(ordered[-1], 3),
+            'buckets': buckets
+        }
+
+def new_totals():
+    return {'calls': 0, 'failures': 0, 'retries': 0, 'hedges': 0, 'prompt_tokens': 0, 'output_tokens': 0,
+            'llm_seconds': 0.0}
+
+class LLMMetrics:
+    def __init__(self, window=1000):
+        self.window = window
+        self.lock = threading.Lock()
+        self.histograms = {
+            'latency_seconds': RollingHistogram(SECONDS_BUCKETS, window),
+            'ttft_seconds': RollingHistogram(SECONDS_BUCKETS, window),
+            'prompt_tokens': RollingHistogram(TOKEN_BUCKETS, window),
+            'output_tokens': RollingHistogram(TOKEN_BUCKETS, window)
+        }
+        self.routes = {}     # route -> totals, plus request count / seconds from record_request
+        self.tiers = {}      # model tier -> totals
+
+    def record(self, route, tier, latency, call_info=None, usage=None, succeeded=True):
+        """
+        Account one Gemini call.
+        call_info: filled by GeminiClient ('retries', 'first_token_seconds', 'hedged', 'hedge_won')
+        usage: PromptBuilder.record_usage output ({'prompt_tokens', 'output_tokens'}), None if unreported
+        Returns the call's record, for the response's generation_info.
+        """
+        call_info = call_info or {}
+        usage = usage or {}
+        call = {
+            'route': route,
+            'model_tier': tier,
+            'succeeded': succeeded,
+            'prompt_tokens': usage.get('prompt_tokens', 0),
+            'output_tokens': usage.get('output_tokens', 0),
+            'ttft_seconds': round(call_info['first_token_seconds'], 3) if 'first_token_seconds' in call_info else None,
+            'latency_seconds': round(latency, 3),
+            'retries': call_info.get('retries', 0),
+            'hedged': call_info.get('hedged', False),
+            'hedge_won': call_info.get('hedge_won', False)
+        }
+
+        with self.lock:
+            self.histograms['latency_seconds'].observe(latency)
+            if call['ttft_seconds'] is not None:
+                self.histograms['ttft_seconds'].observe(call_info['first_token_seconds'])
+            if usage:
+                self.histograms['prompt_tokens'].observe(call['prompt_tokens'])
+                self.histograms['output_tokens'].observe(call['output_tokens'])
+
+            for totals in (self.route_totals_locked(route), self.tiers.setdefault(tier, new_totals())):
+                totals['calls'] += 1
+                totals['failures'] += 0 if succeeded else 1
+                totals['retries'] += call['retries']
+                totals['hedges'] += 1 if call['hedged'] else 0
+                totals['prompt_tokens'] += call['prompt_tokens']
+                totals['output_tokens'] += call['output_tokens']
+                totals['llm_seconds'] += latency
+
+        logger.info(f"📊 {route} [{tier}]: {call['prompt_tokens']} in / {call['output_tokens']} out tokens, "
+                    f"ttft {call['ttft_seconds']}s, total {call['latency_seconds']}s, {call['retries']} retries")
+        return call
+
+    def record_request(self, route, seconds):
+        """End-to-end time of a request on route, so the Gemini share of it can be reported"""
+        with self.lock:
+            totals = self.route_totals_locked(route)
+            totals['requests'] += 1
+            totals['request_seconds'] += seconds
+
+    def route_totals_locked(self, route):
+        return self.routes.setdefault(route, dict(new_totals(), requests=0, request_seconds=0.0))
+
+    def stats(self):
+        with self.lock:
+            routes = {}
+            for route, totals in self.routes.items():
+                routes[route] = dict(
+                    totals,
+                    llm_seconds=round(totals['llm_seconds'], 3),
+                    request_seconds=round(totals['request_seconds'], 3),
+                    llm_share=round(totals['llm_seconds'] / totals['request_seconds'], 3)
+                    if totals['request_seconds'] else None
+                )
+            return {
+                'window': self.window,
+                'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+                'routes': routes,
+                'tiers': {tier: dict(totals, llm_seconds=round(totals['llm_seconds'], 3))
+                          for tier, totals in self.tiers.items()}
+            }
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft LLM Scheduler
+Tracks a Gemini model's requests-per-minute and tokens-per-minute quotas with token
+buckets, admits calls in priority lanes (interactive before background) and sheds
+work it could not start in time instead of letting it hit the quota
+"""
+
+import logging
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+LANES = (INTERACTIVE, BACKGROUND)   # highest priority first
+
+class QuotaExceeded(Exception):
+    """The call could not be admitted under the quota before its deadline (or its lane is full)"""
+
+class TokenBucket:
+    def __init__(self, per_minute, headroom=0.9):
+        """
+        per_minute: the quota; 0 means unlimited
+        headroom: fraction of the quota the scheduler may use, so bursts stop short of it
+        """
+        self.per_minute = per_minute
+        self.capacity = per_minute * headroom
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def unlimited(self):
+        return self.per_minute <= 0
+
+    def refill(self, now):
+        if not self.unlimited():
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount, floor=0.0):
+        """Time until `amount` can be taken while leaving `floor` in the bucket"""
+        if self.unlimited():
+            return 0.0
+        missing = amount + floor - self.level
+        if missing <= 0:
+            return 0.0
+        if amount + floor > self.capacity:
+            return float('inf')
+        return missing / self.rate
+
+    def take(self, amount):
+        if not self.unlimited():
+            self.level -= amount
+
+    def give_back(self, amount):
+        if not self.unlimited():
+            self.level = min(self.capacity, self.level + amount)
+
+    def fraction(self):
+        return 1.0 if self.unlimited() else max(0.0, self.level) / self.capacity
+
+class Admission:
+    def __init__(self, lane, tokens, waited):
+        self.lane = lane
+        self.tokens = tokens     # estimate charged to the TPM bucket until settled
+        self.waited = waited
+        self.settled = False
+
+class LLMScheduler:
+    def __init__(self, name, rpm=15, tpm=1_000_000, headroom=0.9, background_reserve=0.3,
+                 downgrade_below=0.2, max_queue=32, expected_seconds=None):
+        """
+        background_reserve: share of both buckets background work must leave for interactive calls
+        downgrade_below: bucket share under which callers should move to a cheaper tier
+        max_queue: waiting calls per lane beyond which new calls are shed immediately
+        expected_seconds: callable giving the model's typical call latency - a call is only admitted
+        if it can also finish before its deadline, so no quota is spent on a call bound to time out
+        """
+        self.name = name
+        self.requests = TokenBucket(rpm, headroom)
+        self.tokens = TokenBucket(tpm, headroom)
+        self.background_reserve = background_reserve
+        self.downgrade_below = downgrade_below
+        self.max_queue = max_queue
+        self.expected_seconds = expected_seconds or (lambda: 0.0)
+        self.condition = threading.Condition()
+        self.queues = {lane: [] for lane in LANES}   # waiting tickets, oldest first
+
+        self.admitted = {lane: 0 for lane in LANES}
+        self.shed = {lane: 0 for lane in LANES}
+        self.wait_seconds = {lane: 0.0 for lane in LANES}
+        self.downgrades = 0
+        self.quota_rejections = 0
+
+    def floors(self, lane):
+        """Bucket levels a lane must leave untouched"""
+        if lane == INTERACTIVE:
+            return 0.0, 0.0
+        return (self.background_reserve * self.requests.capacity,
+                self.background_reserve * self.tokens.capacity)
+
+    def wait_estimate_locked(self, lane, tokens, ahead=0):
+        """Seconds until a call fits, counting one request for each call queued ahead of it"""
+        request_floor, token_floor = self.floors(lane)
+        return max(self.requests.seconds_until(1 + ahead, request_floor),
+                   self.tokens.seconds_until(tokens, token_floor))
+
+    def ahead_locked(self, lane, ticket):
+        """Calls that will be admitted before this ticket"""
+        ahead = 0
+        for other in LANES:
+            if other == lane:
+                return ahead + self.queues[lane].index(ticket)
+            ahead += len(self.queues[other])
+        return ahead
+
+    def acquire(self, lane=INTERACTIVE, tokens=0, deadline=None):
+        """
+        Block until the call fits both quotas, or raise QuotaExceeded as soon as it is clear
+        it cannot start before the deadline (absolute time.time()).
+        """
+        started = time.time()
+        deadline = deadline or started + 60.0
+        expected = self.expected_seconds()
+        ticket = object()
+        with self.condition:
+            if len(self.queues[lane]) >= self.max_queue:
+                self.shed[lane] += 1
+                raise QuotaExceeded(f"{self.name}: {lane} queue full ({self.max_queue} waiting)")
+            self.queues[lane].append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.requests.refill(now)
+                    self.tokens.refill(now)
+                    ahead = self.ahead_locked(lane, ticket)
+                    wait = self.wait_estimate_locked(lane, tokens, ahead)
+                    remaining = deadline - time.time()
+                    if wait + expected >= remaining:
+                        self.shed[lane] += 1
+                        logger.warning(f"🚦 {self.name}: shedding {lane} call - quota frees up in "
+                                       f"{wait:.1f}s and calls take ~{expected:.1f}s, {max(0.0, remaining):.1f}s left")
+                        raise QuotaExceeded(f"{self.name}: the call could not finish within its deadline")
+                    if wait == 0.0 and ahead == 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        waited = time.time() - started
+                        self.admitted[lane] += 1
+                        self.wait_seconds[lane] += waited
+                        return Admission(lane, tokens, waited)
+
+                    # Refill is time-based; settle() and releases notify earlier
+                    self.condition.wait(timeout=min(remaining, max(wait, 0.05)))
+            finally:
+                self.queues[lane].remove(ticket)
+                self.condition.notify_all()
+
+    def try_acquire(self, lane=INTERACTIVE, tokens=0):
+        """Admit the call only if it fits right now with nobody queued ahead - never waits, never sheds"""
+        with self.condition:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            queued = sum(len(self.queues[other]) for other in LANES[:LANES.index(lane) + 1])
+            if queued or self.wait_estimate_locked(lane, tokens) > 0:
+                return None
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.admitted[lane] += 1
+            return Admission(lane, tokens, 0.0)
+
+    def settle(self, admission, actual_tokens=None):
+        """Replace the token estimate with the count Gemini reported (None: no call was made)"""
+        if admission is None or admission.settled:
+            return
+        with self.condition:
+            admission.settled = True
+            if actual_tokens is None:
+                self.requests.give_back(1)
+                self.tokens.give_back(admission.tokens)
+            else:
+                self.tokens.give_back(admission.tokens - actual_tokens)
+            self.condition.notify_all()
+
+    def record_quota_rejection(self):
+        """Gemini answered 429 anyway - our view of the quota is too optimistic, so drain it"""
+        with self.condition:
+            self.quota_rejections += 1
+            self.requests.level = min(self.requests.level, 0.0)
+            self.tokens.level = min(self.tokens.level, 0.0)
+
+    def should_downgrade(self, tokens=0, deadline=None):
+        """
+        True when a call belongs on a cheaper tier: this model's quota is running low, or the calls
+        queued ahead mean it could not start and finish before the deadline (absolute time.time()).
+        Only a prediction - the caller records the downgrade if it acts on it.
+        """
+        deadline = deadline or time.time() + 60.0
+        expected = self.expected_seconds()
+        with self.condition:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            low = min(self.requests.fraction(), self.tokens.fraction()) < self.downgrade_below
+            wait = self.wait_estimate_locked(INTERACTIVE, tokens, ahead=len(self.queues[INTERACTIVE]))
+            blocked = wait + expected >= deadline - time.time()
+            return low or blocked
+
+    def record_downgrade(self):
+        """A call that was routed here went to a cheaper tier instead"""
+        with self.condition:
+            self.downgrades += 1
+
+    def stats(self):
+        with self.condition:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                'rpm': self.requests.per_minute or None,
+                'tpm': self.tokens.per_minute or None,
+                'requests_available': None if self.requests.unlimited() else round(self.requests.level, 1),
+                'tokens_available': None if self.tokens.unlimited() else int(self.tokens.level),
+                'queued': {lane: len(queue) for lane, queue in self.queues.items()},
+                'admitted': dict(self.admitted),
+                'shed': dict(self.shed),
+                'avg_wait_seconds': {
+                    lane: round(self.wait_seconds[lane] / self.admitted[lane], 3) if self.admitted[lane] else None
+                    for lane in LANES
+                },
+                'expected_call_seconds': self.expected_seconds(),
+                'downgrades': self.downgrades,
+                'quota_rejections': self.quota_rejections
+            }
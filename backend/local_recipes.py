@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Local Recipe Engine
+Rule-based recipe synthesis from a curated template library per dish family and
+cuisine, filled with the user's ingredients and voice preferences - no LLM needed
+"""
+
+import logging
+import re
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVINGS = 4
+
+# Cuisine profiles: aromatics, seasoning, cooking liquid, garnish and how heat is added
+CUISINE_PROFILES = {
+    'Indian': {
+        'fat': '2 tablespoons ghee or vegetable oil',
+        'aromatics': ['1 large onion, finely chopped', '3 cloves garlic, minced', '1 inch ginger, grated'],
+        'seasoning': ['1 teaspoon cumin seeds', '1 teaspoon ground turmeric', '2 teaspoons garam masala',
+                      '1 teaspoon ground coriander'],
+        'liquid': '1 cup crushed tomatoes',
+        'garnish': 'Fresh cilantro, chopped',
+        'heat': '1 green chili, slit',
+        'starch': 'Steamed basmati rice or naan, to serve',
+        'tags': ['indian', 'aromatic']
+    },
+    'Italian': {
+        'fat': '3 tablespoons extra-virgin olive oil',
+        'aromatics': ['1 small onion, finely chopped', '3 cloves garlic, thinly sliced'],
+        'seasoning': ['1 teaspoon dried oregano', 'Salt and black pepper to taste'],
+        'liquid': '1 can (400 g) crushed tomatoes',
+        'garnish': 'Fresh basil and grated parmesan',
+        'heat': '1/2 teaspoon red pepper flakes',
+        'starch': 'Crusty bread, to serve',
+        'tags': ['italian', 'classic']
+    },
+    'Chinese': {
+        'fat': '2 tablespoons vegetable oil',
+        'aromatics': ['3 cloves garlic, minced', '1 inch ginger, minced', '3 scallions, sliced'],
+        'seasoning': ['2 tablespoons soy sauce', '1 tablespoon oyster sauce', '1 teaspoon sesame oil'],
+        'liquid': '1/2 cup chicken or vegetable stock mixed with 1 teaspoon cornstarch',
+        'garnish': 'Sliced scallion greens and sesame seeds',
+        'heat': '1 teaspoon chili oil',
+        'starch': 'Steamed jasmine rice, to serve',
+        'tags': ['chinese', 'savory']
+    },
+    'Japanese': {
+        'fat': '1 tablespoon neutral oil',
+        'aromatics': ['2 cloves garlic, grated', '1 inch ginger, grated', '2 scallions, sliced'],
+        'seasoning': ['2 tablespoons soy sauce', '1 tablespoon mirin', '1 teaspoon rice vinegar'],
+        'liquid': '1 cup dashi or vegetable stock',
+        'garnish': 'Toasted sesame seeds and nori strips',
+        'heat': '1/2 teaspoon shichimi togarashi',
+        'starch': 'Steamed short-grain rice, to serve',
+        'tags': ['japanese', 'umami']
+    },
+    'Mexican': {
+        'fat': '2 tablespoons vegetable oil',
+        'aromatics': ['1 onion, diced', '3 cloves garlic, minced'],
+        'seasoning': ['1 teaspoon ground cumin', '1 teaspoon smoked paprika', '1 teaspoon dried oregano'],
+        'liquid': '1 cup tomato salsa',
+        'garnish': 'Fresh cilantro, lime wedges and sliced avocado',
+        'heat': '1 jalapeño, finely chopped',
+        'starch': 'Warm corn tortillas, to serve',
+        'tags': ['mexican', 'zesty']
+    },
+    'Thai': {
+        'fat': '2 tablespoons coconut or vegetable oil',
+        'aromatics': ['3 cloves garlic, minced', '1 stalk lemongrass, finely sliced', '2 shallots, sliced'],
+        'seasoning': ['2 tablespoons fish sauce', '1 tablespoon palm or brown sugar', 'Juice of 1 lime'],
+        'liquid': '1 can (400 ml) coconut milk',
+        'garnish': 'Thai basil and crushed peanuts',
+        'heat': '2 bird\'s eye chilies, sliced',
+        'starch': 'Jasmine rice, to serve',
+        'tags': ['thai', 'fragrant']
+    },
+    'American': {
+        'fat': '2 tablespoons butter or vegetable oil',
+        'aromatics': ['1 onion, diced', '2 cloves garlic, minced'],
+        'seasoning': ['1 teaspoon smoked paprika', '1 teaspoon garlic powder', 'Salt and black pepper to taste'],
+        'liquid': '1 cup chicken or vegetable stock',
+        'garnish': 'Chopped parsley',
+        'heat': '1/2 teaspoon cayenne pepper',
+        'starch': 'Mashed potatoes or a soft roll, to serve',
+        'tags': ['american', 'comfort']
+    },
+    'French': {
+        'fat': '2 tablespoons butter',
+        'aromatics': ['2 shallots, finely chopped', '2 cloves garlic, minced'],
+        'seasoning': ['1 teaspoon fresh thyme leaves', '1 bay leaf', 'Salt and white pepper to taste'],
+        'liquid': '1/2 cup dry white wine or stock',
+        'garnish': 'Chopped chives',
+        'heat': 'A pinch of espelette or cayenne pepper',
+        'starch': 'Fresh baguette, to serve',
+        'tags': ['french', 'elegant']
+    },
+    'International': {
+        'fat': '2 tablespoons olive oil',
+        'aromatics': ['1 onion, chopped', '2 cloves garlic, minced'],
+        'seasoning': ['1 teaspoon dried mixed herbs', 'Salt and black pepper to taste'],
+        'liquid': '1 cup vegetable stock',
+        'garnish': 'Fresh herbs, chopped',
+        'heat': '1/2 teaspoon chili flakes',
+        'starch': 'Rice or bread, to serve',
+        'tags': ['homemade']
+    }
+}
+
+# Dish families: matched on dish name / ingredients, each with its own method template.
+# Checked in order, so sweet dishes ("apple pie") win over savory ones ("pie").
+# Steps use {fat}, {aromatics}, {seasoning}, {liquid}, {protein}, {vegetables}, {garnish}, {base}.
+DISH_FAMILIES = {
+    'dessert': {
+        'keywords': ['cake', 'cookie', 'brownie', 'pudding', 'ice cream', 'tart', 'mousse', 'cheesecake',
+                     'tiramisu', 'donut', 'waffle', 'pancake', 'churro', 'baklava', 'macaron', 'creme brulee',
+                     'panna cotta', 'beignet', 'cupcake', 'apple pie', 'strawberry shortcake', 'crepe'],
+        'base': None,
+        'prep': 20, 'cook': 30, 'difficulty': 'Medium',
+        'methods': ['bake', 'whisk'],
+        'sweet': True,
+        'steps': [
+            "Preheat the oven to 180°C (350°F) and line or grease your tin",
+            "Cream the butter and sugar until pale and fluffy",
+            "Beat in the eggs one at a time, then the vanilla",
+            "Fold in the flour, baking powder and a pinch of salt until just combined",
+            "Fold in {vegetables}",
+            "Bake for 25-30 minutes until a skewer comes out clean",
+            "Cool before serving with {garnish}"
+        ]
+    },
+    'curry': {
+        'keywords': ['curry', 'masala', 'korma', 'tikka', 'vindaloo', 'dal', 'stew', 'chili'],
+        'base': None,
+        'prep': 15, 'cook': 30, 'difficulty': 'Medium',
+        'methods': ['sauté', 'simmer'],
+        'steps': [
+            "Heat {fat} in a heavy pot over medium heat",
+            "Add {aromatics} and cook until golden, about 6-8 minutes",
+            "Stir in {seasoning} and cook for 1 minute until fragrant",
+            "Add {protein} and brown lightly on all sides",
+            "Pour in {liquid}, bring to a simmer, cover and cook for 15-20 minutes",
+            "Add {vegetables} and simmer until tender and the sauce has thickened",
+            "Taste, adjust the seasoning and finish with {garnish}"
+        ]
+    },
+    'stir_fry': {
+        'keywords': ['stir fry', 'stir_fry', 'chow mein', 'lo mein', 'pad thai', 'fried noodles', 'kung pao', 'teriyaki'],
+        'base': '300 g dried noodles',
+        'prep': 15, 'cook': 12, 'difficulty': 'Easy',
+        'methods': ['stir-fry'],
+        'steps': [
+            "Cut {protein} and {vegetables} into bite-sized pieces so everything cooks evenly",
+            "Cook {base} according to the package directions and drain",
+            "Heat {fat} in a wok or large skillet over high heat until shimmering",
+            "Stir-fry {protein} for 3-4 minutes until just cooked, then set aside",
+            "Stir-fry {aromatics} for 30 seconds, then add {vegetables} for 2-3 minutes",
+            "Return everything to the pan with {seasoning} and {liquid}; toss until glossy",
+            "Serve immediately topped with {garnish}"
+        ]
+    },
+    'pasta': {
+        'keywords': ['pasta', 'spaghetti', 'penne', 'linguine', 'fettuccine', 'lasagna', 'ravioli', 'gnocchi',
+                     'carbonara', 'macaroni', 'bolognese'],
+        'base': '400 g dried pasta',
+        'prep': 10, 'cook': 20, 'difficulty': 'Easy',
+        'methods': ['boil', 'sauté'],
+        'steps': [
+            "Bring a large pot of well-salted water to a boil",
+            "Heat {fat} in a wide pan and gently cook {aromatics} until soft",
+            "Add {protein} and cook until browned, then add {vegetables}",
+            "Stir in {liquid} and {seasoning}; simmer for 10 minutes",
+            "Meanwhile cook {base} until al dente, reserving 1/2 cup of the cooking water",
+            "Toss the pasta with the sauce, loosening with the reserved water as needed",
+            "Serve with {garnish}"
+        ]
+    },
+    'soup': {
+        'keywords': ['soup', 'ramen', 'pho', 'broth', 'chowder', 'bisque', 'miso', 'hot and sour', 'gazpacho'],
+        'base': None,
+        'prep': 15, 'cook': 35, 'difficulty': 'Easy',
+        'methods': ['simmer'],
+        'steps': [
+            "Heat {fat} in a large pot over medium heat",
+            "Cook {aromatics} until softened, about 5 minutes",
+            "Add {protein} and {vegetables} and stir for 2-3 minutes",
+            "Add {liquid} plus 4 cups of water or stock and {seasoning}",
+            "Bring to a boil, then simmer for 20-25 minutes until everything is tender",
+            "Adjust the seasoning and serve hot with {garnish}"
+        ]
+    },
+    'salad': {
+        'keywords': ['salad', 'slaw', 'ceviche', 'caprese', 'tartare', 'carpaccio'],
+        'base': None,
+        'prep': 15, 'cook': 5, 'difficulty': 'Easy',
+        'methods': ['toss'],
+        'steps': [
+            "Wash and dry {vegetables}, then slice or tear into bite-sized pieces",
+            "Prepare {protein}: slice thinly, or sear quickly if it needs cooking",
+            "Whisk {fat} with {seasoning} and a squeeze of lemon to make a dressing",
+            "Toss everything together just before serving",
+            "Finish with {garnish}"
+        ]
+    },
+    'rice': {
+        'keywords': ['rice', 'biryani', 'risotto', 'paella', 'pilaf', 'bibimbap', 'jambalaya', 'pulao'],
+        'base': '1 1/2 cups long-grain or risotto rice',
+        'prep': 15, 'cook': 30, 'difficulty': 'Medium',
+        'methods': ['sauté', 'simmer'],
+        'steps': [
+            "Rinse {base} until the water runs mostly clear (skip for risotto)",
+            "Heat {fat} in a wide pan and cook {aromatics} until soft",
+            "Add {protein} and cook until lightly browned",
+            "Stir in the rice and {seasoning} and toast for 2 minutes",
+            "Add {liquid} plus enough water or stock to cover by 1 cm; simmer covered for 15-18 minutes",
+            "Fold in {vegetables} for the last 5 minutes, then rest off the heat for 5 minutes",
+            "Fluff and serve with {garnish}"
+        ]
+    },
+    'wrap': {
+        'keywords': ['taco', 'burrito', 'quesadilla', 'enchilada', 'fajita', 'wrap', 'sandwich', 'burger',
+                     'hot dog', 'gyro', 'kebab', 'shawarma', 'sub', 'panini'],
+        'base': '8 tortillas, wraps or buns',
+        'prep': 15, 'cook': 15, 'difficulty': 'Easy',
+        'methods': ['pan-fry', 'grill'],
+        'steps': [
+            "Season {protein} with {seasoning}",
+            "Heat {fat} in a skillet and cook {protein} until done, about 6-8 minutes",
+            "Add {aromatics} and {vegetables} and cook until just tender",
+            "Warm {base} in a dry pan or on the grill",
+            "Fill with the mixture and top with {liquid}",
+            "Serve with {garnish}"
+        ]
+    },
+    'grill': {
+        'keywords': ['steak', 'grilled', 'bbq', 'barbecue', 'ribs', 'wings', 'kebab', 'satay', 'yakitori',
+                     'tandoori', 'chop', 'skewer'],
+        'base': None,
+        'prep': 20, 'cook': 20, 'difficulty': 'Medium',
+        'methods': ['marinate', 'grill'],
+        'steps': [
+            "Mix {fat}, {aromatics} and {seasoning} into a marinade",
+            "Coat {protein} in the marinade and rest for at least 15 minutes",
+            "Heat a grill or grill pan to medium-high",
+            "Grill {protein} until nicely charred and cooked through, turning once",
+            "Grill {vegetables} alongside until tender and marked",
+            "Rest for 5 minutes, then serve with {liquid} and {garnish}"
+        ]
+    },
+    'bake': {
+        'keywords': ['casserole', 'gratin', 'bake', 'baked', 'roast', 'pie', 'quiche', 'pizza', 'moussaka',
+                     'shepherd', 'pot pie', 'lasagne'],
+        'base': None,
+        'prep': 20, 'cook': 40, 'difficulty': 'Medium',
+        'methods': ['bake'],
+        'steps': [
+            "Preheat the oven to 200°C (400°F)",
+            "Heat {fat} in a pan and soften {aromatics}",
+            "Add {protein} and {vegetables} with {seasoning} and cook for 5 minutes",
+            "Stir in {liquid} and transfer to a baking dish",
+            "Bake for 30-35 minutes until bubbling and golden on top",
+            "Rest for 5 minutes and serve with {garnish}"
+        ]
+    },
+    'skillet': {
+        'keywords': [],
+        'base': None,
+        'prep': 10, 'cook': 25, 'difficulty': 'Easy',
+        'methods': ['sauté', 'simmer'],
+        'steps': [
+            "Heat {fat} in a large skillet over medium heat",
+            "Add {aromatics} and cook until soft, about 5 minutes",
+            "Add {protein} and cook until browned",
+            "Add {vegetables} and {seasoning} and cook for 5-7 minutes",
+            "Pour in {liquid} and simmer until everything is cooked through",
+            "Taste, adjust the seasoning and serve with {garnish}"
+        ]
+    }
+}
+
+DESSERT_BASE = ['200 g all-purpose flour', '150 g sugar', '115 g butter, softened', '2 eggs',
+                '1 teaspoon vanilla extract', '1 1/2 teaspoons baking powder', 'A pinch of salt']
+
+# Preference-driven choices
+MEAT_WORDS = ['chicken', 'beef', 'pork', 'lamb', 'fish', 'salmon', 'tuna', 'shrimp', 'prawns', 'crab',
+              'lobster', 'turkey', 'duck', 'bacon', 'sausage', 'ham', 'steak', 'ribs', 'wings']
+ANIMAL_WORDS = MEAT_WORDS + ['egg', 'eggs', 'milk', 'cream', 'cheese', 'butter', 'yogurt', 'ghee', 'honey',
+                             'parmesan', 'mozzarella', 'fish sauce', 'oyster sauce']
+PLANT_PROTEIN_WORDS = ['tofu', 'tempeh', 'seitan', 'paneer', 'chickpeas', 'lentils', 'beans', 'edamame']
+DEFAULT_PROTEIN = '500 g boneless chicken thighs, cut into pieces'
+VEGETARIAN_PROTEIN = '400 g paneer, tofu or chickpeas'
+VEGAN_PROTEIN = '400 g firm tofu or cooked chickpeas'
+DEFAULT_VEGETABLES = ['1 red bell pepper, sliced', '2 cups seasonal vegetables, chopped']
+QUICK_SCALE = 0.6
+SLOW_SCALE = 1.8
+
+class LocalRecipeEngine:
+    def __init__(self, ingredient_database=None, variants=None):
+        """
+        ingredient_database: TextModel.ingredient_database (category -> names) used to sort the
+        user's ingredients into proteins / vegetables; without it everything counts as a vegetable
+        variants: RecipeVariantTransformer whose dietary substitutions are applied to every recipe
+        """
+        if variants is None:
+            # recipe_variants imports this module for the cuisine profiles
+            from recipe_variants import RecipeVariantTransformer
+            variants = RecipeVariantTransformer()
+        self.ingredient_database = ingredient_database or {}
+        self.variants = variants
+        self.family_patterns = {
+            family: re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in spec['keywords']) + r')\b')
+            for family, spec in DISH_FAMILIES.items() if spec['keywords']
+        }
+
+    def dish_family(self, dish_name, ingredients_text, cooking_methods):
+        """First family whose keywords appear in the dish name, then the text, then the voice methods"""
+        dish = (dish_name or '').replace('_', ' ').lower()
+        for source in (dish, (ingredients_text or '').lower()):
+            if not source:
+                continue
+            for family, pattern in self.family_patterns.items():
+                if pattern.search(source):
+                    return family
+        method_families = {'grilled': 'grill', 'baked': 'bake', 'stir_fried': 'stir_fry', 'boiled': 'soup'}
+        for method in cooking_methods or []:
+            if method in method_families:
+                return method_families[method]
+        return 'skillet'
+
+    def categorize(self, ingredients):
+        """Split ingredient phrases into (proteins, others)"""
+        proteins_db = self.ingredient_database.get('proteins', [])
+        proteins, others = [], []
+        for item in ingredients:
+            lowered = item.lower()
+            if any(re.search(rf'\b{re.escape(p)}\b', lowered) for p in proteins_db + MEAT_WORDS + PLANT_PROTEIN_WORDS):
+                proteins.append(item)
+            else:
+                others.append(item)
+        return proteins, others
+
+    def allowed(self, item, dietary):
+        lowered = item.lower()
+        if 'vegan' in dietary:
+            return not any(re.search(rf'\b{re.escape(w)}\b', lowered) for w in ANIMAL_WORDS)
+        if 'vegetarian' in dietary:
+            return not any(re.search(rf'\b{re.escape(w)}\b', lowered) for w in MEAT_WORDS)
+        return True
+
+    def generate(self, dish_name="", cuisine="International", ingredients_text="", text_analysis=None,
+                 recipe_info=None):
+        """
+        text_analysis: TextModel.analyze_ingredients_text output (optional)
+        recipe_info: AudioModel voice preferences (optional)
+        Returns a recipe dict with the same fields the frontend reads from Gemini recipes.
+        """
+        recipe_info = recipe_info or {}
+        requested = set(recipe_info.get('dietary_restrictions') or [])
+        # Only diets the substitutions can guarantee are applied and labelled (not low carb / low fat)
+        dietary = requested & set(self.variants.diet_patterns)
+        if requested - dietary:
+            logger.info(f"Local recipes cannot guarantee {sorted(requested - dietary)} - not labelled")
+        profile = CUISINE_PROFILES.get(cuisine) or CUISINE_PROFILES['International']
+
+        if text_analysis and text_analysis.get('success') and text_analysis.get('ingredients'):
+            user_items = list(text_analysis['ingredients'])
+        else:
+            user_items = [item.strip() for item in re.split(r'[,\n;]', ingredients_text or '') if item.strip()]
+
+        family_name = self.dish_family(dish_name, ingredients_text, recipe_info.get('cooking_method'))
+        family = DISH_FAMILIES[family_name]
+        sweet = family.get('sweet', False)
+
+        proteins, others = self.categorize(user_items)
+        proteins = [p for p in proteins if self.allowed(p, dietary)]
+        others = [o for o in others if self.allowed(o, dietary)]
+        user_proteins = list(proteins)
+        if not proteins and not sweet:
+            proteins = [VEGAN_PROTEIN if 'vegan' in dietary or dietary >= {'vegetarian', 'dairy_free'}
+                        else VEGETARIAN_PROTEIN if 'vegetarian' in dietary else DEFAULT_PROTEIN]
+        vegetables = others or ([] if sweet else DEFAULT_VEGETABLES)
+
+        seasoning = list(profile['seasoning'])
+        spice = recipe_info.get('spice_level', 'Medium')
+        if spice in ('Hot', 'Extra Hot'):
+            seasoning.append(profile['heat'] if spice == 'Hot' else f"{profile['heat']} (double it for extra heat)")
+
+        fat = profile['fat']
+        liquid = profile['liquid']
+
+        if sweet:
+            ingredients = DESSERT_BASE + vegetables
+            if 'vegan' in dietary:
+                ingredients = ['200 g all-purpose flour', '150 g sugar', '100 ml vegetable oil',
+                               '180 ml plant milk', '1 teaspoon vanilla extract',
+                               '1 1/2 teaspoons baking powder', 'A pinch of salt'] + vegetables
+        else:
+            ingredients = ([family['base']] if family['base'] else []) + proteins + vegetables + \
+                          [fat] + profile['aromatics'] + seasoning + [liquid]
+            if not family['base'] and family_name in ('curry', 'grill', 'skillet'):
+                ingredients.append(profile['starch'])
+        garnish = 'a dusting of powdered sugar or fresh berries' if sweet else profile['garnish'].lower()
+        ingredients.append(garnish[0].upper() + garnish[1:])
+
+        fill = {
+            'fat': self.short(fat),
+            'aromatics': self.join_short(profile['aromatics']),
+            'seasoning': self.join_short(seasoning),
+            'liquid': self.short(liquid),
+            'protein': self.join_short(proteins) or 'the main ingredients',
+            'vegetables': self.join_short(vegetables) or 'any fruit or chocolate you like',
+            'garnish': garnish,
+            'base': self.short(family['base'] or '')
+        }
+        instructions = [step.format(**fill) for step in family['steps']]
+
+        prep, cook = family['prep'], family['cook']
+        speed = recipe_info.get('cooking_time', 'Normal')
+        if speed == 'Quick':
+            prep, cook = max(5, round(prep * QUICK_SCALE)), max(5, round(cook * QUICK_SCALE))
+        elif speed == 'Slow':
+            cook = round(cook * SLOW_SCALE)
+
+        servings = recipe_info.get('serving_size') or DEFAULT_SERVINGS
+        name = self.recipe_name(dish_name, cuisine, family_name, user_proteins, dietary)
+        tags = profile['tags'] + [family_name.replace('_', '-')] + sorted(d.replace('_', '-') for d in dietary)
+        if speed == 'Quick':
+            tags.append('quick')
+
+        recipe = {
+            'name': name,
+            'cuisine': cuisine,
+            'difficulty': 'Easy' if speed == 'Quick' else family['difficulty'],
+            'totalTime': f"{prep + cook} minutes",
+            'prepTime': f"{prep} minutes",
+            'cookTime': f"{cook} minutes",
+            'servings': servings,
+            'description': f"{name}, built from your ingredients with {cuisine} flavors"
+                           + (f" ({', '.join(sorted(dietary)).replace('_', ' ')})" if dietary else '') + '.',
+            'ingredients': ingredients,
+            'instructions': instructions,
+            'tips': self.tips(family_name, spice, servings),
+            'tags': tags,
+            'cooking_methods': list(family['methods']),
+            'nutritional_highlights': self.highlights(proteins, vegetables, dietary, sweet),
+            'variations': [
+                f"Swap the protein for {'tofu' if 'vegetarian' not in dietary else 'chickpeas'}",
+                f"Make it {'milder' if spice in ('Hot', 'Extra Hot') else 'spicier'} by adjusting {self.short(profile['heat'])}",
+                "Use whatever seasonal vegetables you have"
+            ]
+        }
+        # Every ingredient group (base, seasoning, liquid, garnish, dessert base) and the steps
+        # that mention them are swapped for each diet
+        for diet in self.variants.diet_patterns:
+            if diet in dietary:
+                self.variants.substitute(recipe, diet)
+        return recipe
+
+    def short(self, item):
+        """Ingredient line without its quantity, for use inside a step"""
+        text = re.sub(r'^[\d/\s\.]+(?:\([^)]*\)\s*)?(?:g|kg|ml|l|cups?|tablespoons?|teaspoons?|inch|cans?|stalks?|cloves?)?\s+',
+                      '', item.strip(), flags=re.IGNORECASE)
+        return text.split(',')[0].strip()
+
+    def join_short(self, items):
+        names = [self.short(item) for item in items if item]
+        if len(names) <= 1:
+            return ''.join(names)
+        return ', '.join(names[:-1]) + ' and ' + names[-1]
+
+    def recipe_name(self, dish_name, cuisine, family_name, user_proteins, dietary):
+        dish = (dish_name or '').replace('_', ' ').strip()
+        if dish and dish.lower() not in ('custom dish', 'unknown'):
+            return dish.title()
+        if user_proteins:
+            main = self.short(user_proteins[0]).title()
+        else:
+            main = 'Vegetable' if dietary & {'vegan', 'vegetarian'} else 'Chicken'
+        family_label = {'stir_fry': 'Stir-Fry', 'rice': 'Rice', 'wrap': 'Wraps', 'bake': 'Bake',
+                        'grill': 'Grill', 'skillet': 'Skillet'}.get(family_name, family_name.title())
+        prefix = f"{cuisine} " if cuisine != 'International' else ''
+        return f"{prefix}{main} {family_label}"
+
+    def tips(self, family_name, spice, servings):
+        tips = {
+            'curry': "Let the onions brown properly - they are the backbone of the sauce",
+            'stir_fry': "Have everything chopped before you start - stir-frying moves fast",
+            'pasta': "Save some pasta water; its starch makes the sauce cling",
+            'soup': "Soups taste even better the next day",
+            'salad': "Dress the salad right before serving so it stays crisp",
+            'rice': "Resist stirring while the rice steams",
+            'wrap': "Warm the wraps so they fold without cracking",
+            'grill': "Let the meat rest before cutting to keep it juicy",
+            'bake': "Cover with foil if the top browns too quickly",
+            'dessert': "Bring butter and eggs to room temperature first",
+            'skillet': "Don't overcrowd the pan, or things will steam instead of brown"
+        }
+        result = [tips[family_name], "Taste and adjust the seasoning at the end"]
+        if spice in ('Hot', 'Extra Hot'):
+            result.append("Add the chili gradually and taste as you go")
+        if servings > 6:
+            result.append("Use your largest pan, or cook in batches")
+        return result
+
+    def highlights(self, proteins, vegetables, dietary, sweet):
+        if sweet:
+            return ['Homemade treat', 'No artificial additives']
+        highlights = []
+        if proteins:
+            highlights.append('Good source of protein')
+        if len(vegetables) >= 2:
+            highlights.append('Packed with vegetables')
+        highlights.extend(d.replace('_', ' ').title() for d in sorted(dietary))
+        return highlights or ['Balanced home cooking']
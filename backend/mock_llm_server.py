@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Mock LLM Server
+Local stand-in for the Gemini REST API that returns schema-valid recipe JSON with a
+configurable latency distribution, streaming chunk cadence and error rate
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# HTTP status -> Google API status name (what the SDK maps to its exception types)
+ERROR_STATUSES = {
+    429: 'RESOURCE_EXHAUSTED',
+    500: 'INTERNAL',
+    503: 'UNAVAILABLE'
+}
+
+class MockSettings:
+    def __init__(self, latency_dist='lognormal', latency_ms=800.0, latency_sigma=0.4,
+                 first_chunk_ms=250.0, chunk_interval_ms=40.0, chunk_chars=48,
+                 error_rate=0.0, error_status=503, seed=None):
+        """
+        latency_dist: 'fixed', 'uniform' (0.5x-1.5x) or 'lognormal' (median latency_ms, shape latency_sigma)
+        first_chunk_ms / chunk_interval_ms / chunk_chars: streaming cadence
+        """
+        self.latency_dist = latency_dist
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.first_chunk_ms = first_chunk_ms
+        self.chunk_interval_ms = chunk_interval_ms
+        self.chunk_chars = chunk_chars
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample_latency(self):
+        """Seconds for a unary response"""
+        with self.lock:
+            if self.latency_dist == 'fixed':
+                millis = self.latency_ms
+            elif self.latency_dist == 'uniform':
+                millis = self.random.uniform(0.5 * self.latency_ms, 1.5 * self.latency_ms)
+            else:
+                millis = self.latency_ms * math.exp(self.random.gauss(0.0, self.latency_sigma))
+        return millis / 1000.0
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def to_dict(self):
+        return {
+            'latency_dist': self.latency_dist,
+            'latency_ms': self.latency_ms,
+            'latency_sigma': self.latency_sigma,
+            'first_chunk_ms': self.first_chunk_ms,
+            'chunk_interval_ms': self.chunk_interval_ms,
+            'chunk_chars': self.chunk_chars,
+            'error_rate': self.error_rate,
+            'error_status': self.error_status
+        }
+
+settings = MockSettings()
+app = Flask(__name__)
+
+def prompt_text(body):
+    """All text parts of the request's contents"""
+    parts = []
+    for content in body.get('contents', []):
+        for part in content.get('parts', []):
+            if 'text' in part:
+                parts.append(part['text'])
+    return '\n'.join(parts)
+
+def mock_recipe(prompt):
+    """A recipe with every field of the response schema, named after the prompt's dish"""
+    match = re.search(r'recipe for "([^"]+)"', prompt)
+    dish = match.group(1).title() if match else 'Chef Special'
+    # The latest mention wins, so chat refinements ("for 8 servings") show up
+    servings = re.findall(r'(\d+) (?:servings|people)', prompt)
+    return {
+        'name': dish,
+        'cuisine': 'International',
+        'difficulty': 'Easy',
+        'totalTime': '35 minutes',
+        'prepTime': '10 minutes',
+        'cookTime': '25 minutes',
+        'servings': int(servings[-1]) if servings else 4,
+        'description': f'A simple home-style {dish.lower()}.',
+        'ingredients': [
+            '2 tablespoons olive oil',
+            '1 medium onion, chopped',
+            '2 cloves garlic, minced',
+            f'400 g main ingredients for {dish.lower()}',
+            'Salt and pepper to taste'
+        ],
+        'instructions': [
+            'Heat the oil in a large pan over medium heat',
+            'Cook the onion until soft, about 5 minutes',
+            'Add the garlic and cook for 1 minute',
+            'Add the main ingredients and cook through, about 15 minutes',
+            'Season to taste and serve hot'
+        ],
+        'tips': ['Prep everything before you start', 'Taste and adjust seasoning at the end'],
+        'tags': ['homemade', 'easy'],
+        'cooking_methods': ['sauté', 'simmer'],
+        'nutritional_highlights': ['Balanced meal', 'Fresh ingredients'],
+        'variations': ['Add seasonal vegetables', 'Swap in your favourite protein']
+    }
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+def response_chunk(text, prompt, finished=False, output_text=''):
+    """One GenerateContentResponse (the last one carries finishReason and usage)"""
+    chunk = {
+        'candidates': [{
+            'content': {'role': 'model', 'parts': [{'text': text}]},
+            'index': 0
+        }]
+    }
+    if finished:
+        chunk['candidates'][0]['finishReason'] = 'STOP'
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(output_text)
+        chunk['usageMetadata'] = {
+            'promptTokenCount': prompt_tokens,
+            'candidatesTokenCount': output_tokens,
+            'totalTokenCount': prompt_tokens + output_tokens
+        }
+    return chunk
+
+def error_response():
+    status = settings.error_status
+    return jsonify({'error': {
+        'code': status,
+        'message': 'Injected failure from the mock LLM server',
+        'status': ERROR_STATUSES.get(status, 'UNAVAILABLE')
+    }}), status
+
+def stream_chunks(prompt, text, sse):
+    """Stream text in chunk_chars pieces at the configured cadence"""
+    time.sleep(settings.first_chunk_ms / 1000.0)
+    pieces = [text[i:i + settings.chunk_chars] for i in range(0, len(text), settings.chunk_chars)]
+    if not sse:
+        yield '['
+    for index, piece in enumerate(pieces):
+        if index:
+            time.sleep(settings.chunk_interval_ms / 1000.0)
+        chunk = json.dumps(response_chunk(piece, prompt, finished=index == len(pieces) - 1, output_text=text))
+        if sse:
+            yield f"data: {chunk}\r\n\r\n"
+        else:
+            yield ('' if index == 0 else ',\r\n') + chunk
+    if not sse:
+        yield ']'
+
+@app.route('/v1beta/models/<path:target>', methods=['POST'])
+def models_endpoint(target):
+    """models/{model}:generateContent and models/{model}:streamGenerateContent"""
+    model, _, method = target.partition(':')
+    body = request.get_json(force=True, silent=True) or {}
+    prompt = prompt_text(body)
+
+    if settings.should_fail():
+        time.sleep(settings.sample_latency() / 4)
+        return error_response()
+
+    text = json.dumps(mock_recipe(prompt))
+
+    if method == 'generateContent':
+        time.sleep(settings.sample_latency())
+        return jsonify(response_chunk(text, prompt, finished=True, output_text=text))
+
+    if method == 'streamGenerateContent':
+        sse = request.args.get('alt') == 'sse'
+        return Response(stream_chunks(prompt, text, sse),
+                        mimetype='text/event-stream' if sse else 'application/json')
+
+    return jsonify({'error': {'code': 404, 'message': f'Unknown method {method} for {model}',
+                              'status': 'NOT_FOUND'}}), 404
+
+@app.route('/', methods=['GET'])
+def health_check():
+    return jsonify({'status': 'healthy', 'service': 'mock-llm', 'settings': settings.to_dict()})
+
+def main():
+    global settings
+    parser = argparse.ArgumentParser(description='Mock Gemini REST server for offline load tests')
+    parser.add_argument('--port', type=int, default=8085)
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-ms', type=float, default=800.0, help='Median unary latency')
+    parser.add_argument('--latency-sigma', type=float, default=0.4, help='Lognormal shape (tail heaviness)')
+    parser.add_argument('--first-chunk-ms', type=float, default=250.0, help='Time to first streamed chunk')
+    parser.add_argument('--chunk-interval-ms', type=float, default=40.0, help='Gap between streamed chunks')
+    parser.add_argument('--chunk-chars', type=int, default=48, help='Characters per streamed chunk')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls that fail')
+    parser.add_argument('--error-status', type=int, choices=sorted(ERROR_STATUSES), default=503)
+    parser.add_argument('--seed', type=int, help='Seed for reproducible latency and error sequences')
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        first_chunk_ms=args.first_chunk_ms,
+        chunk_interval_ms=args.chunk_interval_ms,
+        chunk_chars=args.chunk_chars,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    print(f"🧪 Mock LLM server on http://localhost:{args.port} - {settings.to_dict()}")
+    app.run(host='0.0.0.0', port=args.port, threaded=True)
+
+if __name__ == "__main__":
+    main()
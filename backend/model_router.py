@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Model Router
+Scores how demanding a recipe request is and routes simple ones to a small, fast
+Gemini tier and complex ones to the strong tier, tracking latency per tier
+"""
+
+import logging
+import threading
+from collections import deque
+
+from preference_extractor import default_recipe_info
+from recipe_cache import normalize_ingredients
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FAST = 'fast'
+STRONG = 'strong'
+
+LATENCY_WINDOW = 500
+
+class TierStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def percentile(self, fraction):
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'avg_seconds': round(sum(self.latencies) / len(self.latencies), 3) if self.latencies else None,
+            'p50_seconds': self.percentile(0.50),
+            'p95_seconds': self.percentile(0.95)
+        }
+
+class ModelRouter:
+    def __init__(self, strong_threshold=2.5, ingredient_weight=0.3, constraint_weight=1.0,
+                 uncertainty_weight=2.0, long_transcript_words=15):
+        """
+        Requests scoring at or above strong_threshold go to the strong tier.
+        Score = ingredient_weight per ingredient + constraint_weight per voice constraint
+              + uncertainty_weight * (1 - image confidence) + 1 for long free-form speech
+        """
+        self.strong_threshold = strong_threshold
+        self.ingredient_weight = ingredient_weight
+        self.constraint_weight = constraint_weight
+        self.uncertainty_weight = uncertainty_weight
+        self.long_transcript_words = long_transcript_words
+        self.lock = threading.Lock()
+        self.tiers = {FAST: TierStats(), STRONG: TierStats()}
+
+    def constraint_count(self, recipe_info):
+        """Voice preferences that differ from the defaults"""
+        if not recipe_info:
+            return 0
+        defaults = default_recipe_info()
+        count = 0
+        for field, value in recipe_info.items():
+            if field not in defaults or value == defaults[field]:
+                continue
+            count += len(value) if isinstance(value, list) else 1
+        return count
+
+    def score(self, ingredients_text="", recipe_info=None, confidence=None, transcript=""):
+        score = self.ingredient_weight * len(normalize_ingredients(ingredients_text))
+        score += self.constraint_weight * self.constraint_count(recipe_info)
+        if confidence is not None:
+            score += self.uncertainty_weight * (1.0 - confidence)
+        if len((transcript or '').split()) >= self.long_transcript_words:
+            score += 1.0
+        return round(score, 2)
+
+    def route(self, ingredients_text="", recipe_info=None, confidence=None, transcript=""):
+        """(tier, score) for a request; confidence is None when there is no image"""
+        score = self.score(ingredients_text, recipe_info, confidence, transcript)
+        tier = STRONG if score >= self.strong_threshold else FAST
+        logger.info(f"🧭 Routing to {tier} tier (complexity {score})")
+        return tier, score
+
+    def record(self, tier, seconds, succeeded=True):
+        with self.lock:
+            stats = self.tiers[tier]
+            stats.requests += 1
+            if succeeded:
+                stats.latencies.append(seconds)
+            else:
+                stats.failures += 1
+
+    def expected_seconds(self, tier):
+        """Median recent call latency of a tier, 0.0 before any call has succeeded"""
+        with self.lock:
+            return self.tiers[tier].percentile(0.50) or 0.0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'strong_threshold': self.strong_threshold,
+                'tiers': {tier: stats.to_dict() for tier, stats in self.tiers.items()}
+            }
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Preference Extractor
+Keyword tables for voice preferences compiled once into a single word-bounded
+pattern, so one pass over a transcript yields every category
+"""
+
+import re
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVING_SIZE = 4
+
+# Multi-valued categories: every matching value is reported (in table order)
+DIETARY_KEYWORDS = {
+    'vegetarian': ['vegetarian', 'veggie', 'no meat', 'veg only'],
+    'vegan': ['vegan', 'no dairy', 'plant based', 'plant-based'],
+    'gluten_free': ['gluten free', 'gluten-free', 'no gluten'],
+    'dairy_free': ['dairy free', 'dairy-free', 'no dairy', 'lactose free'],
+    'low_carb': ['low carb', 'low-carb', 'keto', 'ketogenic'],
+    'low_fat': ['low fat', 'low-fat', 'light'],
+    'halal': ['halal'],
+    'kosher': ['kosher']
+}
+
+COOKING_METHODS = {
+    'grilled': ['grill', 'grilled', 'barbecue', 'bbq'],
+    'fried': ['fry', 'fried', 'deep fry', 'pan fry'],
+    'baked': ['bake', 'baked', 'oven', 'roast'],
+    'steamed': ['steam', 'steamed'],
+    'boiled': ['boil', 'boiled'],
+    'sauteed': ['saute', 'sauteed', 'pan cook'],
+    'stir_fried': ['stir fry', 'stir-fry', 'wok']
+}
+
+PREP_STYLES = {
+    'easy': ['easy', 'simple', 'basic', 'simple recipe'],
+    'traditional': ['traditional', 'authentic', 'classic'],
+    'modern': ['modern', 'contemporary', 'new style'],
+    'healthy': ['healthy', 'nutritious', 'good for you'],
+    'comfort': ['comfort food', 'hearty', 'filling']
+}
+
+# Single-valued categories: the first matching value in table order wins
+SPICE_KEYWORDS = {
+    'Mild': ['mild', 'not spicy', 'no spice', 'gentle', 'light spice', 'less spicy'],
+    'Medium': ['medium', 'moderate', 'normal spice', 'regular spice'],
+    'Hot': ['hot', 'spicy', 'extra spice', 'very spicy', 'more spicy'],
+    'Extra Hot': ['extra hot', 'very hot', 'extremely spicy', 'super spicy', 'really spicy']
+}
+
+TIME_KEYWORDS = {
+    'Quick': ['quick', 'fast', 'rapid', '15 minutes', '10 minutes', 'short time', 'quickly'],
+    'Normal': ['normal', 'regular', 'standard', 'usual time'],
+    'Slow': ['slow', 'long time', 'take time', 'slow cook', 'hours', 'slowly']
+}
+
+# (result field, keyword table, multi-valued)
+CATEGORY_TABLES = [
+    ('dietary_restrictions', DIETARY_KEYWORDS, True),
+    ('spice_level', SPICE_KEYWORDS, False),
+    ('cooking_time', TIME_KEYWORDS, False),
+    ('cooking_method', COOKING_METHODS, True),
+    ('preparation_style', PREP_STYLES, True)
+]
+
+# "for 2 people", "2 servings", "serves 2", "make it for 2", "2 portions", "2 person"
+SERVING_PATTERN = (
+    r'\b(?:make it for (?P<serving_a>\d+)(?: people)?'
+    r'|for (?P<serving_b>\d+) people'
+    r'|serves? (?P<serving_c>\d+)'
+    r'|(?P<serving_d>\d+) (?:servings?|portions?|person))'
+)
+
+def default_recipe_info():
+    return {
+        'serving_size': DEFAULT_SERVING_SIZE,
+        'dietary_restrictions': [],
+        'spice_level': 'Medium',
+        'cooking_time': 'Normal',
+        'cooking_method': [],
+        'preparation_style': []
+    }
+
+class PreferenceExtractor:
+    def __init__(self):
+        """Compile every keyword table into one alternation (longest phrase first)"""
+        self.phrase_targets = {}   # phrase -> [(field, value, priority)]
+        for field, table, _ in CATEGORY_TABLES:
+            for priority, (value, keywords) in enumerate(table.items()):
+                for keyword in keywords:
+                    self.phrase_targets.setdefault(keyword, []).append((field, value, priority))
+
+        phrases = sorted(self.phrase_targets, key=len, reverse=True)
+        keyword_pattern = r'\b(?P<keyword>' + '|'.join(re.escape(p) for p in phrases) + r')\b'
+        self.pattern = re.compile(SERVING_PATTERN + '|' + keyword_pattern, re.IGNORECASE)
+
+        self.multi_valued = {field: multi for field, _, multi in CATEGORY_TABLES}
+        self.value_order = {field: list(table) for field, table, _ in CATEGORY_TABLES}
+
+    def keyword_phrases(self):
+        """Every phrase the extractor understands"""
+        return list(self.phrase_targets)
+
+    def extract(self, transcript):
+        """Single pass over the transcript -> recipe_info dict"""
+        recipe_info = default_recipe_info()
+        serving_found = False
+        matched = {field: {} for field in self.multi_valued}
+
+        for match in self.pattern.finditer(transcript or ''):
+            keyword = match.group('keyword')
+            if keyword is None:
+                if serving_found:
+                    continue
+                serving_size = int(next(g for g in match.group('serving_a', 'serving_b',
+                                                                  'serving_c', 'serving_d') if g))
+                if 1 <= serving_size <= 20:  # reasonable range
+                    recipe_info['serving_size'] = serving_size
+                    serving_found = True
+                continue
+
+            for field, value, priority in self.phrase_targets[keyword.lower()]:
+                matched[field][value] = priority
+
+        for field, values in matched.items():
+            if not values:
+                continue
+            if self.multi_valued[field]:
+                recipe_info[field] = sorted(values, key=values.get)
+            else:
+                recipe_info[field] = min(values, key=values.get)
+
+        return recipe_info
+
+    def extract_batch(self, transcripts):
+        """Extract preferences for many transcripts (e.g. backfilling stored voice notes)"""
+        return [self.extract(transcript) for transcript in transcripts]
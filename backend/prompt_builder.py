@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Prompt Builder
+Compact recipe prompts with a declared response schema (Gemini JSON mode),
+per-request-type output token budgets and token usage accounting
+"""
+
+import logging
+import threading
+
+from preference_extractor import DEFAULT_SERVING_SIZE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+
+# The exact field names the frontend reads
+RECIPE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string'},
+        'cuisine': {'type': 'string'},
+        'difficulty': {'type': 'string', 'enum': ['Easy', 'Medium', 'Hard']},
+        'totalTime': {'type': 'string'},
+        'prepTime': {'type': 'string'},
+        'cookTime': {'type': 'string'},
+        'servings': {'type': 'integer'},
+        'description': {'type': 'string'},
+        'ingredients': STRING_LIST,
+        'instructions': STRING_LIST,
+        'tips': STRING_LIST,
+        'tags': STRING_LIST,
+        'cooking_methods': STRING_LIST,
+        'nutritional_highlights': STRING_LIST,
+        'variations': STRING_LIST
+    },
+    'required': [
+        'name', 'cuisine', 'difficulty', 'totalTime', 'prepTime', 'cookTime', 'servings',
+        'description', 'ingredients', 'instructions', 'tips', 'tags', 'cooking_methods',
+        'nutritional_highlights', 'variations'
+    ]
+}
+
+# max_output_tokens per request type - a full recipe is typically 500-800 tokens
+DEFAULT_OUTPUT_BUDGETS = {
+    'recipe': 1200,
+    'recipe_stream': 1200,
+    'catalog': 1200,
+    'refine': 1200
+}
+
+LOW_CONFIDENCE = 0.5
+
+class RecipePromptBuilder:
+    def __init__(self, output_budgets=None):
+        """output_budgets: request type -> max_output_tokens (merged over the defaults)"""
+        self.output_budgets = dict(DEFAULT_OUTPUT_BUDGETS, **(output_budgets or {}))
+        self.lock = threading.Lock()
+        self.usage = {}   # request type -> token totals
+
+    def build(self, ingredients_text="", dish_name="", cuisine="International",
+              confidence=0.0, transcript="", recipe_info=None):
+        """Short instruction prompt - the schema carries the output format"""
+        dish = (dish_name or 'Custom Dish').replace('_', ' ')
+        lines = [f'Create a {cuisine} recipe for "{dish}" as JSON.' if cuisine
+                 else f'Create a recipe for "{dish}" as JSON.']
+
+        if confidence:
+            line = f"Dish identified from a photo ({confidence:.0%} confidence)"
+            if confidence < LOW_CONFIDENCE:
+                line += " - may be wrong, favour the ingredients"
+            lines.append(line + '.')
+        if ingredients_text:
+            lines.append(f"Available ingredients: {ingredients_text.strip()}")
+        if transcript:
+            lines.append(f'User said: "{transcript.strip()}"')
+
+        preferences = self.preference_line(recipe_info)
+        if preferences:
+            lines.append(f"Preferences: {preferences}")
+
+        lines.append(
+            "Ingredients with quantities; 5-10 concise steps; 2-4 items each for tips, tags, "
+            "cooking_methods, nutritional_highlights and variations. Times like \"30 minutes\"."
+        )
+        return '\n'.join(lines)
+
+    def preference_line(self, recipe_info):
+        """Only the preferences that differ from the defaults"""
+        if not recipe_info:
+            return ''
+        parts = []
+        if recipe_info.get('serving_size') and recipe_info['serving_size'] != DEFAULT_SERVING_SIZE:
+            parts.append(f"{recipe_info['serving_size']} servings")
+        parts.extend(recipe_info.get('dietary_restrictions') or [])
+        if recipe_info.get('spice_level') and recipe_info['spice_level'] != 'Medium':
+            parts.append(f"{recipe_info['spice_level'].lower()} spice")
+        if recipe_info.get('cooking_time') and recipe_info['cooking_time'] != 'Normal':
+            parts.append(f"{recipe_info['cooking_time'].lower()} cooking time")
+        parts.extend(recipe_info.get('cooking_method') or [])
+        parts.extend(recipe_info.get('preparation_style') or [])
+        return ', '.join(str(part) for part in parts)
+
+    def generation_config(self, request_type='recipe'):
+        """JSON mode with the recipe schema and this request type's output budget"""
+        return {
+            'response_mime_type': 'application/json',
+            'response_schema': RECIPE_SCHEMA,
+            'max_output_tokens': self.output_budgets.get(request_type, DEFAULT_OUTPUT_BUDGETS['recipe']),
+            'temperature': 0.7
+        }
+
+    def record_usage(self, request_type, response):
+        """Log and total the token counts Gemini reports on a response (or final stream chunk)"""
+        metadata = getattr(response, 'usage_metadata', None)
+        if metadata is None:
+            return None
+        usage = {
+            'prompt_tokens': getattr(metadata, 'prompt_token_count', 0) or 0,
+            'output_tokens': getattr(metadata, 'candidates_token_count', 0) or 0
+        }
+        with self.lock:
+            totals = self.usage.setdefault(request_type, {'requests': 0, 'prompt_tokens': 0, 'output_tokens': 0})
+            totals['requests'] += 1
+            totals['prompt_tokens'] += usage['prompt_tokens']
+            totals['output_tokens'] += usage['output_tokens']
+        logger.info(f"🔢 {request_type} tokens: {usage['prompt_tokens']} in, {usage['output_tokens']} out")
+        return usage
+
+    def stats(self):
+        with self.lock:
+            return {
+                'output_budgets': dict(self.output_budgets),
+                'usage': {
+                    request_type: dict(
+                        totals,
+                        avg_prompt_tokens=round(totals['prompt_tokens'] / totals['requests'], 1),
+                        avg_output_tokens=round(totals['output_tokens'] / totals['requests'], 1)
+                    )
+                    for request_type, totals in self.usage.items()
+                }
+            }
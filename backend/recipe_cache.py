@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Recipe Cache
+Generated recipes keyed on canonicalized inputs, held in an in-memory LRU with a
+SQLite tier; entries past their soft TTL are served while a background refresh runs
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_ingredients(ingredients_text):
+    """Sorted, de-duplicated ingredient set from free text"""
+    items = re.split(r'[,\n;]|\band\b', (ingredients_text or '').lower())
+    normalized = set()
+    for item in items:
+        item = re.sub(r'^[-•*\d\.\s]+', '', item)     # list bullets and numbering
+        item = re.sub(r'[^\w\s]', ' ', item)
+        item = ' '.join(item.split())
+        if item:
+            normalized.add(item)
+    return sorted(normalized)
+
+def normalize_transcript(transcript):
+    """Lowercased words of a transcript, without punctuation"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', (transcript or '').lower()).split())
+
+def canonical_recipe_key(ingredients_text="", dish_name="", cuisine="", recipe_info=None, transcript=""):
+    """
+    Stable key for a recipe request: dish, cuisine, ingredient set, voice preferences and the
+    transcript itself, since the prompt quotes it and it can say more than the preferences capture
+    """
+    canonical = {
+        'dish': ' '.join((dish_name or '').replace('_', ' ').lower().split()),
+        'cuisine': (cuisine or 'International').lower(),
+        'ingredients': normalize_ingredients(ingredients_text),
+        'preferences': recipe_info or {},
+        'transcript': normalize_transcript(transcript)
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class RecipeCache:
+    def __init__(self, max_entries=512, soft_ttl=3600, hard_ttl=86400, db_path=None):
+        """
+        soft_ttl: age after which an entry is served stale and refreshed in the background
+        hard_ttl: age after which an entry is no longer served at all
+        """
+        self.max_entries = max_entries
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.entries = OrderedDict()        # key -> (result, created_at)
+        self.refreshing = set()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+        self.db_path = db_path
+        self.db = None
+        if db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS recipes ("
+                    "key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self.db.commit()
+                logger.info(f"Recipe cache SQLite tier: {db_path}")
+            except sqlite3.Error as e:
+                logger.warning(f"Recipe cache SQLite tier disabled: {e}")
+                self.db = None
+
+    def lookup(self, key):
+        """(result, age_seconds) from memory or SQLite, None if absent or past the hard TTL"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and self.db is not None:
+                row = self.db.execute(
+                    "SELECT result, created_at FROM recipes WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (json.loads(row[0]), row[1])
+                    self.store_locked(key, entry)
+            if entry is None:
+                return None
+
+            age = time.time() - entry[1]
+            if age > self.hard_ttl:
+                self.entries.pop(key, None)
+                self.delete_row_locked(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry[0], age
+
+    def put(self, key, result):
+        entry = (result, time.time())
+        with self.lock:
+            self.store_locked(key, entry)
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO recipes (key, result, created_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(result), entry[1])
+                    )
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist recipe: {e}")
+
+    def delete_row_locked(self, key):
+        if self.db is None:
+            return
+        try:
+            self.db.execute("DELETE FROM recipes WHERE key = ?", (key,))
+            self.db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not delete expired recipe: {e}")
+
+    def store_locked(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_or_generate(self, key, generate, cacheable=lambda result: True, refresh=None):
+        """
+        Returns (result, status) with status 'hit', 'stale' or 'miss'.
+        generate() produces a fresh result; cacheable(result) decides whether to store it.
+        refresh() regenerates stale entries in the background (defaults to generate).
+        """
+        cached = self.lookup(key)
+        if cached is not None:
+            result, age = cached
+            if age <= self.soft_ttl:
+                with self.lock:
+                    self.hits += 1
+                return result, 'hit'
+
+            with self.lock:
+                self.stale_hits += 1
+            self.refresh_in_background(key, refresh or generate, cacheable)
+            return result, 'stale'
+
+        with self.lock:
+            self.misses += 1
+        result = generate()
+        if cacheable(result):
+            self.put(key, result)
+        return result, 'miss'
+
+    def refresh_in_background(self, key, generate, cacheable):
+        """Regenerate a stale entry once, without blocking the caller"""
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def refresh():
+            try:
+                result = generate()
+                if cacheable(result):
+                    self.put(key, result)
+                    with self.lock:
+                        self.refreshes += 1
+                else:
+                    with self.lock:
+                        self.refresh_failures += 1
+            except Exception as e:
+                logger.warning(f"Background recipe refresh failed: {e}")
+                with self.lock:
+                    self.refresh_failures += 1
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=refresh, name='recipe-refresh', daemon=True).start()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'soft_ttl_seconds': self.soft_ttl,
+                'hard_ttl_seconds': self.hard_ttl,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+                'background_refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'refreshing_now': len(self.refreshing),
+                'sqlite_tier': self.db_path if self.db is not None else None
+            }
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Recipe Catalog
+Precomputed canonical recipes for every classifier class and common preference
+profile, stored as compressed JSON in a local SQLite file
+"""
+
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from preference_extractor import default_recipe_info
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LABEL_MAP_PATHS = [
+    'models/label_map.pkl',        # From root directory
+    '../models/label_map.pkl',     # From backend directory
+    './models/label_map.pkl'       # Current directory
+]
+
+# Profile name -> recipe_info fields that differ from default_recipe_info()
+PREFERENCE_PROFILES = {
+    'default': {},
+    'vegetarian': {'dietary_restrictions': ['vegetarian']},
+    'vegan': {'dietary_restrictions': ['vegan']},
+    'gluten_free': {'dietary_restrictions': ['gluten_free']},
+    'mild': {'spice_level': 'Mild'},
+    'hot': {'spice_level': 'Hot'},
+    'quick': {'cooking_time': 'Quick'},
+    'for_two': {'serving_size': 2}
+}
+
+def load_label_map(path=None):
+    """Classifier class names from label_map.pkl, in class-index order"""
+    for candidate in [path] if path else LABEL_MAP_PATHS:
+        if Path(candidate).exists():
+            with open(candidate, 'rb') as f:
+                label_map = pickle.load(f)
+            return [name for name, _ in sorted(label_map.items(), key=lambda item: item[1])]
+    raise FileNotFoundError(f"label_map.pkl not found in {[path] if path else LABEL_MAP_PATHS}")
+
+def profile_recipe_info(profile):
+    """Full recipe_info for a preference profile"""
+    recipe_info = default_recipe_info()
+    recipe_info.update(PREFERENCE_PROFILES[profile])
+    return recipe_info
+
+def profile_for(recipe_info):
+    """Name of the profile matching recipe_info exactly, None for anything uncatalogued"""
+    if not recipe_info:
+        return 'default'
+    defaults = default_recipe_info()
+    differences = {
+        field: value for field, value in recipe_info.items()
+        if field in defaults and value != defaults[field]
+    }
+    for name, fields in PREFERENCE_PROFILES.items():
+        if differences == fields:
+            return name
+    return None
+
+def catalog_dish(dish_name):
+    return (dish_name or '').strip().lower().replace(' ', '_')
+
+class RecipeCatalog:
+    def __init__(self, db_path):
+        """Opens (or creates) the catalog file; a missing or unreadable file leaves it empty"""
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        try:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                "dish TEXT NOT NULL, profile TEXT NOT NULL, recipe BLOB NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (dish, profile))"
+            )
+            self.db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Recipe catalog unavailable ({db_path}): {e}")
+            self.db = None
+
+    def get(self, dish_name, profile):
+        """Catalogued recipe dict or None"""
+        if self.db is None:
+            return None
+        with self.lock:
+            row = self.db.execute(
+                "SELECT recipe FROM catalog WHERE dish = ? AND profile = ?",
+                (catalog_dish(dish_name), profile)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, dish_name, profile, recipe):
+        encoded = zlib.compress(json.dumps(recipe, separators=(',', ':')).encode('utf-8'), 9)
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO catalog (dish, profile, recipe, created_at) VALUES (?, ?, ?, ?)",
+                (catalog_dish(dish_name), profile, encoded, time.time())
+            )
+            self.db.commit()
+
+    def completed(self):
+        """Set of (dish, profile) pairs already in the catalog"""
+        if self.db is None:
+            return set()
+        with self.lock:
+            return set(self.db.execute("SELECT dish, profile FROM catalog").fetchall())
+
+    def stats(self):
+        if self.db is None:
+            return {'available': False, 'path': self.db_path}
+        with self.lock:
+            entries, size = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(recipe)), 0) FROM catalog"
+            ).fetchone()
+            return {
+                'available': True,
+                'path': self.db_path,
+                'entries': entries,
+                'compressed_bytes': size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
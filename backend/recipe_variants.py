@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Recipe Variants
+Parses ingredient quantities into structured form and derives serving-size, spice
+and diet variants of an existing recipe locally, without another Gemini call
+"""
+
+import copy
+import logging
+import re
+import threading
+import time
+from fractions import Fraction
+
+from local_recipes import CUISINE_PROFILES
+from preference_extractor import DEFAULT_SERVING_SIZE, PreferenceExtractor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Unit spellings -> canonical unit
+UNIT_ALIASES = {
+    'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tsp': 'tsp',
+    'tablespoon': 'tbsp', 'tablespoons': 'tbsp', 'tbsp': 'tbsp', 'tbs': 'tbsp',
+    'cup': 'cup', 'cups': 'cup',
+    'ml': 'ml', 'milliliter': 'ml', 'milliliters': 'ml', 'millilitre': 'ml', 'millilitres': 'ml',
+    'l': 'l', 'liter': 'l', 'liters': 'l', 'litre': 'l', 'litres': 'l',
+    'g': 'g', 'gram': 'g', 'grams': 'g',
+    'kg': 'kg', 'kilogram': 'kg', 'kilograms': 'kg',
+    'oz': 'oz', 'ounce': 'oz', 'ounces': 'oz',
+    'lb': 'lb', 'lbs': 'lb', 'pound': 'lb', 'pounds': 'lb',
+    'can': 'can', 'cans': 'can', 'clove': 'clove', 'cloves': 'clove',
+    'inch': 'inch', 'inches': 'inch', 'stalk': 'stalk', 'stalks': 'stalk',
+    'pinch': 'pinch', 'pinches': 'pinch', 'bunch': 'bunch', 'bunches': 'bunch',
+    'sprig': 'sprig', 'sprigs': 'sprig', 'slice': 'slice', 'slices': 'slice',
+    'piece': 'piece', 'pieces': 'piece', 'handful': 'handful', 'handfuls': 'handful'
+}
+
+# Convertible units: canonical unit -> (dimension, size in the dimension's base unit)
+UNIT_SIZES = {
+    'tsp': ('us_volume', 1), 'tbsp': ('us_volume', 3), 'cup': ('us_volume', 48),
+    'ml': ('metric_volume', 1), 'l': ('metric_volume', 1000),
+    'g': ('metric_weight', 1), 'kg': ('metric_weight', 1000),
+    'oz': ('us_weight', 1), 'lb': ('us_weight', 16)
+}
+
+# Smallest sensible amount for each unit, largest unit first within a dimension
+UNIT_LADDERS = {
+    'us_volume': [('cup', Fraction(1, 4)), ('tbsp', Fraction(1)), ('tsp', Fraction(0))],
+    'metric_volume': [('l', Fraction(1)), ('ml', Fraction(0))],
+    'metric_weight': [('kg', Fraction(1)), ('g', Fraction(0))],
+    'us_weight': [('lb', Fraction(1)), ('oz', Fraction(0))]
+}
+
+UNIT_NAMES = {
+    'tsp': ('teaspoon', 'teaspoons'), 'tbsp': ('tablespoon', 'tablespoons'), 'cup': ('cup', 'cups'),
+    'can': ('can', 'cans'), 'clove': ('clove', 'cloves'), 'inch': ('inch', 'inch'),
+    'stalk': ('stalk', 'stalks'), 'pinch': ('pinch', 'pinches'), 'bunch': ('bunch', 'bunches'),
+    'sprig': ('sprig', 'sprigs'), 'slice': ('slice', 'slices'), 'piece': ('piece', 'pieces'),
+    'handful': ('handful', 'handfuls')
+}
+
+UNICODE_FRACTIONS = {'½': '1/2', '¼': '1/4', '¾': '3/4', '⅓': '1/3', '⅔': '2/3', '⅛': '1/8'}
+UNICODE_FRACTION_PATTERN = re.compile(r'(\d?)\s*([' + ''.join(UNICODE_FRACTIONS) + r'])')
+
+NUMBER = r'\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?'
+QUANTITY_PATTERN = re.compile(
+    rf'^(?P<amount>{NUMBER})(?:\s*(?:-|to)\s*(?P<high>{NUMBER}))?\s*'
+    rf'(?:(?P<unit>{"|".join(sorted(UNIT_ALIASES, key=len, reverse=True))})\b\.?\s*)?(?P<item>.*)$',
+    re.IGNORECASE
+)
+
+# Kitchen-friendly fractions for measured (cup/spoon) and counted amounts
+MEASURE_STEPS = sorted([Fraction(n, 8) for n in range(9)] + [Fraction(1, 3), Fraction(2, 3)])
+COUNT_STEPS = [Fraction(0), Fraction(1, 2), Fraction(1)]
+
+SPICE_LEVELS = ['Mild', 'Medium', 'Hot', 'Extra Hot']
+# Heat relative to a Medium recipe
+SPICE_MULTIPLIERS = {'Mild': 0, 'Medium': 1, 'Hot': 2, 'Extra Hot': 3}
+HEAT_PATTERN = re.compile(
+    r"\b(?:chil(?:i|li|e)(?:e?s)?|cayenne|red pepper flakes|jalape[nñ]os?|sriracha|gochujang|gochugaru"
+    r"|chipotles?|hot sauce|harissa|sambal|habaneros?|serranos?|scotch bonnets?|bird's eye)\b",
+    re.IGNORECASE
+)
+MILD_NOTE = ' (optional - leave out for a mild dish)'
+
+# Dietary substitutions: (pattern, replacement) - '{}' in a replacement is the matched text
+MEAT_SUBSTITUTIONS = [
+    (r'\b(?:chicken|beef|vegetable)(?: or (?:chicken|beef|vegetable))? (?:stock|broth)\b', 'vegetable stock'),
+    (r'\bfish sauce\b', 'soy sauce'),
+    (r'\boyster sauce\b', 'mushroom stir-fry sauce'),
+    (r'\b(?:boneless\s+)?(?:skinless\s+)?(?:chicken|turkey|duck)(?:\s+(?:thighs?|breasts?|drumsticks?|wings?))?\b',
+     'firm tofu'),
+    (r'\b(?:ground\s+|minced\s+)?(?:beef|pork|lamb|steak|mutton)(?:\s+mince)?\b', 'cremini mushrooms'),
+    (r'\b(?:fish fillets?|fish|salmon|tuna|cod|shrimp|prawns)\b', 'firm tofu'),
+    (r'\b(?:bacon|ham|sausages?)\b', 'smoked tofu'),
+    (r'\bdashi or vegetable stock\b', 'vegetable stock'),
+    (r'(?<!kombu )\bdashi\b', 'kombu dashi'),
+    (r'\blard\b', 'vegetable oil'),
+    (r'\bgelatin\b', 'agar agar')
+]
+DAIRY_SUBSTITUTIONS = [
+    (r'\bghee or vegetable oil\b', 'vegetable oil'),
+    (r'\bghee\b', 'vegetable oil'),
+    (r'\bbuttermilk\b', 'soured oat milk'),
+    (r'(?<!vegan )\bcream cheese\b', 'vegan cream cheese'),
+    (r'(?<!vegan )(?<!peanut )\bbutter\b', 'vegan butter'),
+    (r'(?<!coconut )\b(?:heavy |double |whipping )?cream\b(?! cheese)', 'coconut cream'),
+    (r'\b(?:grated )?parmesan(?: cheese)?\b', 'nutritional yeast'),
+    (r'(?<!vegan )(?<!cream )\b(?:(?:mozzarella|cheddar)(?: cheese)?|cheese)\b', 'vegan cheese'),
+    (r'(?<!plant )\byog(?:h)?urt\b', 'plant yogurt'),
+    (r'(?<!coconut )(?<!oat )(?<!almond )(?<!plant )(?<!soy )\bmilk\b', 'oat milk'),
+    (r'\bpaneer\b', 'firm tofu')
+]
+VEGAN_EXTRAS = [
+    (r'(?<!flax )\beggs?\b', 'flax {}'),
+    (r'\bhoney\b', 'maple syrup')
+]
+GLUTEN_SUBSTITUTIONS = [
+    (r'\b(?:all-purpose |plain |wheat )?flour\b', 'gluten-free flour blend'),
+    (r'\bsoy sauce\b', 'tamari'),
+    (r'(?<!gluten-free )\b(?:oyster|mushroom stir-fry) sauce\b', 'gluten-free {}'),
+    (r'(?<!rice )(?<!corn )(?<!gluten-free )\b(?:pasta|spaghetti|penne|fettuccine|linguine|noodles|breadcrumbs'
+     r'|bread|baguette|naan|tortillas?|wraps?|buns?|rolls?|couscous|pastry)\b', 'gluten-free {}')
+]
+RED_MEAT = r'(?:chicken|beef|lamb|mutton|goat|veal|turkey|duck)'
+ALCOHOL_SUBSTITUTIONS = [
+    (r'\b(?:dry )?(?:white |red )?wine or stock\b', 'stock'),
+    (r'\b(?:dry )?(?:white |red )?wine\b(?! vinegar)', 'stock'),
+    (r'\b(?:mirin|sake)\b', 'rice vinegar with a pinch of sugar'),
+    (r'\bbeer\b', 'stock')
+]
+HALAL_SUBSTITUTIONS = ALCOHOL_SUBSTITUTIONS + [
+    (r'(?<!beef )\b(?:bacon|pancetta)\b', 'halal beef bacon'),
+    (r'\b(?:pork|ham|prosciutto)\b', 'halal lamb'),
+    (r'\blard\b', 'vegetable oil'),
+    (r'(?<!beef )\b(?:chorizo|pepperoni|salami|sausages?)\b', 'halal beef {}'),
+    (rf'(?<!halal )\b{RED_MEAT}\b', 'halal {}'),
+    (r'\bgelatin\b', 'agar agar')
+]
+KOSHER_SUBSTITUTIONS = [
+    (r'\boyster sauce\b', 'mushroom stir-fry sauce'),
+    (r'\b(?:shrimp|prawns|crab|lobster|clams?|mussels|scallops|squid)\b', 'white fish'),
+    (r'(?<!beef )\b(?:bacon|pancetta)\b', 'kosher beef bacon'),
+    (r'\b(?:pork|ham|prosciutto)\b', 'kosher beef'),
+    (r'\blard\b', 'vegetable oil'),
+    (r'(?<!beef )\b(?:chorizo|pepperoni|salami|sausages?)\b', 'kosher beef {}'),
+    (rf'(?<!kosher )\b{RED_MEAT}\b', 'kosher {}'),
+    (r'(?<!kosher )\b(?:dry )?(?:white |red )?wine\b(?! vinegar)', 'kosher {}'),
+    (r'\bgelatin\b', 'agar agar')
+]
+# Kosher recipes never mix meat and dairy: dairy is swapped out whenever meat remains
+KOSHER_MEAT_PATTERN = re.compile(rf'\b{RED_MEAT}\b', re.IGNORECASE)
+DIET_SUBSTITUTIONS = {
+    'vegetarian': MEAT_SUBSTITUTIONS,
+    'vegan': MEAT_SUBSTITUTIONS + DAIRY_SUBSTITUTIONS + VEGAN_EXTRAS,
+    'dairy_free': DAIRY_SUBSTITUTIONS,
+    'gluten_free': GLUTEN_SUBSTITUTIONS,
+    'halal': HALAL_SUBSTITUTIONS,
+    'kosher': KOSHER_SUBSTITUTIONS
+}
+
+# Instructions phrased only in these words (besides recognised preferences) are handled locally
+FILLER_WORDS = {
+    'a', 'adjust', 'also', 'an', 'and', 'bit', 'can', 'change', 'could', 'dish', 'down', 'for', 'i', 'instead',
+    'it', 'just', 'less', 'let', 'level', 'little', 'make', 'me', 'more', 'now', 'of', 'people', 'please',
+    'portions', 'recipe', 'scale', 'serve', 'servings', 'so', 'spice', 'spiciness', 'that', 'the', 'this', 'to',
+    'too', 'up', 'us', 'version', 'want', 'we', 'with', 'would', 'you'
+}
+SCALE_WORDS = {'double': Fraction(2), 'triple': Fraction(3), 'halve': Fraction(1, 2), 'half': Fraction(1, 2)}
+EXTRA_PATTERN = re.compile(
+    r"\b(?:(?P<scale>double|triple|halve|half)(?: (?:it|the recipe|the quantities))?"
+    r"|(?P<hotter>spicier|hotter|more heat)|(?P<milder>milder|less heat)"
+    r"|for (?P<servings>\d+))\b",
+    re.IGNORECASE
+)
+
+def parse_amount(text):
+    """'1 1/2' / '1.5' / '3/4' -> Fraction"""
+    return sum((Fraction(part) for part in text.split()), Fraction(0))
+
+def parse_ingredient(line):
+    """Ingredient line -> {'amount', 'high', 'unit', 'item', 'text'}; amount is None for unquantified lines"""
+    text = line.strip()
+    normalized = UNICODE_FRACTION_PATTERN.sub(
+        lambda m: (m.group(1) + ' ' if m.group(1) else '') + UNICODE_FRACTIONS[m.group(2)], text)
+    match = QUANTITY_PATTERN.match(normalized)
+    if not match or not match.group('item'):
+        return {'amount': None, 'high': None, 'unit': None, 'item': text, 'text': text}
+    unit = match.group('unit')
+    return {
+        'amount': parse_amount(match.group('amount')),
+        'high': parse_amount(match.group('high')) if match.group('high') else None,
+        'unit': UNIT_ALIASES[unit.lower()] if unit else None,
+        'item': match.group('item').strip(),
+        'text': text
+    }
+
+def nearest(value, steps):
+    """Round a positive Fraction to the closest whole-plus-step value (never to zero)"""
+    whole = int(value)
+    rest = value - whole
+    best = whole + min(steps, key=lambda step: abs(step - rest))
+    return best if best > 0 else steps[1]
+
+def format_amount(value):
+    """Fraction -> '1 1/2', '3/4', '2'"""
+    whole, rest = divmod(value.numerator, value.denominator)
+    if not rest:
+        return str(whole)
+    fraction = f"{rest}/{value.denominator}"
+    return f"{whole} {fraction}" if whole else fraction
+
+def round_metric(value):
+    """Grams / millilitres: whole numbers, to the nearest 5 above 50"""
+    if value >= 50:
+        return Fraction(int(5 * round(value / 5)))
+    return Fraction(max(1, round(value)))
+
+def normalize_unit(amount, unit):
+    """Re-express a scaled amount in the most natural unit of the same measuring system"""
+    dimension, size = UNIT_SIZES[unit]
+    base = amount * size
+    for candidate, minimum in UNIT_LADDERS[dimension]:
+        candidate_size = UNIT_SIZES[candidate][1]
+        if base / candidate_size >= minimum:
+            return base / candidate_size, candidate
+    return amount, unit
+
+def round_amount(amount, unit):
+    if unit in ('g', 'ml'):
+        return round_metric(amount)
+    if unit in ('kg', 'l'):
+        return Fraction(round(float(amount) * 4) / 4).limit_denominator(4)
+    if unit in UNIT_SIZES:
+        return nearest(amount, MEASURE_STEPS)
+    return nearest(amount, COUNT_STEPS)
+
+def pluralize(word):
+    lowered = word.lower()
+    if lowered.endswith(('s', 'x', 'ch', 'sh', 'o')):
+        return word + 'es' if not lowered.endswith('s') else word
+    if lowered.endswith('y') and lowered[-2:-1] not in 'aeiou':
+        return word[:-1] + 'ies'
+    return word + 's'
+
+def singularize(word):
+    lowered = word.lower()
+    if lowered in ('chilies', 'chillies'):
+        return word[:-2]
+    if lowered.endswith('ies'):
+        return word[:-3] + 'y'
+    if lowered.endswith(('oes', 'ches', 'shes', 'xes')):
+        return word[:-2]
+    if lowered.endswith('s') and not lowered.endswith('ss'):
+        return word[:-1]
+    return word
+
+def counted_item(item, amount):
+    """Agree a counted noun with its amount: '1 large onion, chopped' <-> '2 large onions, chopped'"""
+    split = re.search(r',| or | to ', item)
+    head = item[:split.start()] if split else item
+    words = head.split(' ')
+    if not words[-1].isalpha():
+        return item
+    words[-1] = pluralize(words[-1]) if amount > 1 else singularize(words[-1])
+    return ' '.join(words) + item[len(head):]
+
+def format_ingredient(parsed, amount, high=None):
+    """Structured ingredient back to a line with the given amount(s)"""
+    unit = parsed['unit']
+    quantity = format_amount(amount) + (f"-{format_amount(high)}" if high is not None else '')
+    largest = high if high is not None else amount
+    if unit is None:
+        item = counted_item(parsed['item'], largest) if parsed['item'][:1].isalpha() else parsed['item']
+        return f"{quantity} {item}"
+    if unit in UNIT_NAMES:
+        singular, plural = UNIT_NAMES[unit]
+        return f"{quantity} {plural if largest > 1 else singular} {parsed['item']}"
+    return f"{quantity} {unit} {parsed['item']}"
+
+def scale_ingredient(line, factor):
+    """One ingredient line scaled by factor; unquantified lines ('Salt to taste') are unchanged"""
+    parsed = parse_ingredient(line)
+    if parsed['amount'] is None or factor == 1:
+        return line
+    unit = parsed['unit']
+    amount = parsed['amount'] * factor
+    high = parsed['high'] * factor if parsed['high'] is not None else None
+    if unit in UNIT_SIZES:
+        amount, new_unit = normalize_unit(amount, unit)
+        if high is not None:
+            high = high * UNIT_SIZES[unit][1] / UNIT_SIZES[new_unit][1]
+        parsed = dict(parsed, unit=new_unit)
+    amount = round_amount(amount, parsed['unit'])
+    high = round_amount(high, parsed['unit']) if high is not None else None
+    return format_ingredient(parsed, amount, high if high != amount else None)
+
+def recipe_servings(recipe):
+    """Servings as an int, whatever form the model returned it in ('4', '4 servings', 4)"""
+    match = re.search(r'\d+', str(recipe.get('servings', '')))
+    return int(match.group()) if match else DEFAULT_SERVING_SIZE
+
+def compile_substitutions(substitutions):
+    """One alternation per diet, so a replacement is never substituted again"""
+    pattern = '|'.join(f'(?P<s{index}>{regex})' for index, (regex, _) in enumerate(substitutions))
+    return re.compile(pattern, re.IGNORECASE), [replacement for _, replacement in substitutions]
+
+class RecipeVariantTransformer:
+    def __init__(self):
+        self.extractor = PreferenceExtractor()
+        self.diet_patterns = {diet: compile_substitutions(subs) for diet, subs in DIET_SUBSTITUTIONS.items()}
+        self.lock = threading.Lock()
+        self.variants = 0
+        self.declined = 0
+        self.kinds = {'servings': 0, 'spice': 0, 'dietary': 0}
+        self.total_seconds = 0.0
+
+    def plan(self, instruction, current_spice='Medium'):
+        """
+        Changes requested by a follow-up instruction, or None when it asks for anything the
+        transformer cannot do deterministically (those go to Gemini).
+        Returns {'servings': int|None, 'scale': Fraction|None, 'spice_level': str|None, 'dietary': [...]}
+        """
+        text = (instruction or '').lower()
+        changes = {'servings': None, 'scale': None, 'spice_level': None, 'dietary': []}
+        spans = []
+        spice_levels = {}   # explicit level -> extractor priority ("medium spicy" is Medium)
+
+        for match in EXTRA_PATTERN.finditer(text):
+            spans.append(match.span())
+            if match.group('scale'):
+                changes['scale'] = SCALE_WORDS[match.group('scale')]
+            elif match.group('servings'):
+                changes['servings'] = int(match.group('servings'))
+            else:
+                step = 1 if match.group('hotter') else -1
+                index = SPICE_LEVELS.index(current_spice if current_spice in SPICE_LEVELS else 'Medium')
+                changes['spice_level'] = SPICE_LEVELS[max(0, min(len(SPICE_LEVELS) - 1, index + step))]
+
+        for match in self.extractor.pattern.finditer(text):
+            if any(start <= match.start() < end for start, end in spans):
+                continue
+            spans.append(match.span())
+            keyword = match.group('keyword')
+            if keyword is None:
+                changes['servings'] = int(next(g for g in match.group('serving_a', 'serving_b',
+                                                                      'serving_c', 'serving_d') if g))
+                continue
+            for field, value, priority in self.extractor.phrase_targets[keyword]:
+                if field == 'spice_level':
+                    spice_levels[value] = priority
+                elif field == 'dietary_restrictions' and value in DIET_SUBSTITUTIONS:
+                    if value not in changes['dietary']:
+                        changes['dietary'].append(value)
+                else:
+                    return self.decline(instruction)
+
+        if spice_levels:
+            changes['spice_level'] = min(spice_levels, key=spice_levels.get)
+
+        leftover = text
+        for start, end in sorted(spans, reverse=True):
+            leftover = leftover[:start] + ' ' + leftover[end:]
+        words = re.findall(r"[a-z']+|\d+", leftover)
+        if any(word not in FILLER_WORDS for word in words):
+            return self.decline(instruction)
+        if changes['servings'] is not None and not 1 <= changes['servings'] <= 50:
+            return self.decline(instruction)
+        if not any((changes['servings'], changes['scale'], changes['spice_level'], changes['dietary'])):
+            return self.decline(instruction)
+        return changes
+
+    def base_transcript(self, transcript):
+        """
+        The transcript without the serving-size and spice phrases a variant rewrites - requests
+        that differ only in those share it, and so can be derived from one another
+        """
+        text = (transcript or '').lower()
+        kept = []
+        position = 0
+        for match in self.extractor.pattern.finditer(text):
+            keyword = match.group('keyword')
+            if keyword is None:
+                serving_size = int(next(g for g in match.group('serving_a', 'serving_b',
+                                                                  'serving_c', 'serving_d') if g))
+                adjustable = 1 <= serving_size <= 20    # the extractor ignores other sizes
+            else:
+                adjustable = all(field == 'spice_level' for field, _, _ in self.extractor.phrase_targets[keyword])
+            if adjustable:
+                kept.append(text[position:match.start()])
+                position = match.end()
+        kept.append(text[position:])
+        return ' '.join(re.sub(r'[^\w\s]', ' ', ' '.join(kept)).split())
+
+    def decline(self, instruction):
+        with self.lock:
+            self.declined += 1
+        return None
+
+    def apply(self, recipe, changes, current_spice='Medium'):
+        """A new recipe with the planned changes applied - the original (often a cached entry) is untouched"""
+        started = time.perf_counter()
+        variant = copy.deepcopy(recipe)
+        kinds = []
+
+        servings = recipe_servings(variant)
+        target = changes.get('servings')
+        if target is None and changes.get('scale'):
+            target = max(1, round(servings * changes['scale']))
+        if target and target != servings:
+            factor = Fraction(target, servings)
+            variant['ingredients'] = [scale_ingredient(line, factor) for line in variant.get('ingredients', [])]
+            variant['servings'] = target
+            kinds.append('servings')
+
+        level = changes.get('spice_level')
+        if level and level != current_spice:
+            self.adjust_spice(variant, current_spice, level)
+            kinds.append('spice')
+
+        for diet in changes.get('dietary') or []:
+            self.substitute(variant, diet)
+            kinds.append('dietary')
+
+        with self.lock:
+            self.variants += 1
+            self.total_seconds += time.perf_counter() - started
+            for kind in kinds:
+                self.kinds[kind] += 1
+        return variant
+
+    def adjust_spice(self, recipe, current, target):
+        """Scale heat ingredients between spice levels; a mild recipe keeps them as optional"""
+        current = current if current in SPICE_MULTIPLIERS else 'Medium'
+        ingredients = recipe.get('ingredients', [])
+        heat_lines = [index for index, line in enumerate(ingredients) if HEAT_PATTERN.search(line)]
+
+        if target == 'Mild':
+            for index in heat_lines:
+                if not ingredients[index].endswith(MILD_NOTE):
+                    ingredients[index] += MILD_NOTE
+            return
+
+        # Mild recipes only mark their heat optional, so they are scaled as Medium ones
+        factor = Fraction(SPICE_MULTIPLIERS[target], max(1, SPICE_MULTIPLIERS[current]))
+        for index in heat_lines:
+            line = ingredients[index]
+            if line.endswith(MILD_NOTE):
+                line = line[:-len(MILD_NOTE)]
+            ingredients[index] = scale_ingredient(line, factor)
+
+        if not heat_lines and SPICE_MULTIPLIERS[target] > SPICE_MULTIPLIERS[current]:
+            profile = CUISINE_PROFILES.get(recipe.get('cuisine')) or CUISINE_PROFILES['International']
+            heat = scale_ingredient(profile['heat'], Fraction(SPICE_MULTIPLIERS[target], 2))
+            ingredients.append(heat)
+            name = parse_ingredient(heat)['item'].split(',')[0]
+            steps = recipe.setdefault('instructions', [])
+            steps.insert(max(0, len(steps) - 1), f"Stir in the {name} for heat and cook for 1 minute")
+
+    def substitute(self, recipe, diet):
+        """Swap ingredients that break a dietary restriction, everywhere they are mentioned"""
+        self.swap(recipe, diet)
+        if diet == 'kosher' and any(isinstance(item, str) and KOSHER_MEAT_PATTERN.search(item)
+                                    for item in recipe.get('ingredients', [])):
+            self.swap(recipe, 'dairy_free')
+        tag = diet.replace('_', '-')
+        tags = recipe.setdefault('tags', [])
+        if tag not in tags:
+            tags.append(tag)
+
+    def swap(self, recipe, diet):
+        pattern, replacements = self.diet_patterns[diet]
+
+        def replace(match, title=False):
+            replacement = replacements[int(match.lastgroup[1:])]
+            replaced = replacement.format(match.group()) if '{}' in replacement else replacement
+            if title:
+                return replaced.title()
+            return replaced[0].upper() + replaced[1:] if match.group()[0].isupper() else replaced
+
+        if isinstance(recipe.get('name'), str):
+            recipe['name'] = pattern.sub(lambda match: replace(match, title=True), recipe['name'])
+        if isinstance(recipe.get('description'), str):
+            recipe['description'] = pattern.sub(replace, recipe['description'])
+        for field in ('ingredients', 'instructions', 'tips', 'variations'):
+            if field in recipe:
+                recipe[field] = [pattern.sub(replace, item) if isinstance(item, str) else item
+                                 for item in recipe[field]]
+
+    def stats(self):
+        with self.lock:
+            return {
+                'variants': self.variants,
+                'declined': self.declined,
+                'by_kind': dict(self.kinds),
+                'avg_microseconds': round(1e6 * self.total_seconds / self.variants, 1) if self.variants else None
+            }
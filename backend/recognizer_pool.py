@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Recognizer Pool
+Bounded pool of speech engine instances checked out per transcription, so concurrent
+requests never share mutable recognizer state
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PoolTimeout(Exception):
+    """No engine instance became free within the checkout timeout"""
+
+class RecognizerPool:
+    def __init__(self, factory, size=4, checkout_timeout=30.0):
+        """Instances are created lazily by factory() up to size"""
+        self.factory = factory
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        self.idle = queue.LifoQueue()   # LIFO keeps the warmest instance busy
+        self.created = 0
+        self.lock = threading.Lock()
+
+        # Queueing metrics
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.waited_checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self):
+        """Take an idle instance, create one if below size, else queue for one"""
+        start = time.time()
+        instance = None
+        with self.lock:
+            if self.idle.empty() and self.created < self.size:
+                self.created += 1
+                create = True
+            else:
+                create = False
+                self.waiting += 1
+
+        if create:
+            try:
+                instance = self.factory()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+        else:
+            try:
+                instance = self.idle.get(timeout=self.checkout_timeout)
+            except queue.Empty:
+                with self.lock:
+                    self.waiting -= 1
+                    self.timeouts += 1
+                raise PoolTimeout(f"No recognizer free after {self.checkout_timeout}s")
+            finally:
+                if instance is not None:
+                    with self.lock:
+                        self.waiting -= 1
+
+        waited = time.time() - start
+        with self.lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            if not create and waited > 0.001:
+                self.waited_checkouts += 1
+        return instance
+
+    def release(self, instance):
+        with self.lock:
+            self.in_use -= 1
+        self.idle.put(instance)
+
+    @contextmanager
+    def checkout(self):
+        """with pool.checkout() as instance: ..."""
+        instance = self.acquire()
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': self.size,
+                'created': self.created,
+                'in_use': self.in_use,
+                'waiting': self.waiting,
+                'checkouts': self.checkouts,
+                'waited_checkouts': self.waited_checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_seconds': round(self.total_wait / self.checkouts, 4) if self.checkouts else 0.0,
+                'max_wait_seconds': round(self.max_wait, 4)
+            }
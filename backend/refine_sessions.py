@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Refinement Sessions
+Keeps each generated recipe and the prompt that produced it server-side, so a
+follow-up like "make it vegetarian" is sent to Gemini as one short chat turn
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RefinementSession:
+    def __init__(self, base_prompt, recipe, context):
+        """
+        base_prompt: the original recipe prompt (first user turn)
+        recipe: the current recipe (model turn) - replaced on every refinement
+        context: dish/analysis summary returned alongside refinements
+        """
+        self.base_prompt = base_prompt
+        self.recipe = recipe
+        self.context = context
+        self.instructions = []
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.lock = threading.Lock()   # one refinement at a time per session
+
+    def size(self):
+        """Approximate memory held by the session, in characters"""
+        return len(self.base_prompt) + len(json.dumps(self.recipe)) + sum(len(i) for i in self.instructions)
+
+    def chat_contents(self, instruction):
+        """Chat history for the next turn: original prompt, current recipe, then only the new instruction"""
+        return [
+            {'role': 'user', 'parts': [self.base_prompt]},
+            {'role': 'model', 'parts': [json.dumps(self.recipe, separators=(',', ':'))]},
+            {'role': 'user', 'parts': [
+                f"Update this recipe: {instruction.strip()}. Keep everything else the same and "
+                f"return the complete updated recipe."
+            ]}
+        ]
+
+    def apply(self, instruction, recipe):
+        self.instructions.append(instruction)
+        self.recipe = recipe
+        self.last_used = time.time()
+
+class RefinementSessionStore:
+    def __init__(self, ttl=1800, max_sessions=1000, max_chars=20_000_000, max_turns=10):
+        """
+        ttl: idle seconds before a session expires
+        max_sessions / max_chars: least recently used sessions are evicted beyond either limit
+        max_turns: refinements allowed per session
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_chars = max_chars
+        self.max_turns = max_turns
+        self.sessions = OrderedDict()   # id -> RefinementSession, least recently used first
+        self.total_chars = 0
+        self.lock = threading.Lock()
+
+        self.created = 0
+        self.refinements = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self, base_prompt, recipe, context):
+        """Store a new session and return its id"""
+        session = RefinementSession(base_prompt, recipe, context)
+        session_id = uuid.uuid4().hex
+        with self.lock:
+            self.expire_idle_locked()
+            self.sessions[session_id] = session
+            self.total_chars += session.size()
+            self.created += 1
+            self.evict_locked()
+        return session_id
+
+    def get(self, session_id):
+        """Look up a live session and mark it recently used"""
+        with self.lock:
+            self.expire_idle_locked()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def update(self, session_id, session, instruction, recipe):
+        """Record a refinement, keeping the memory accounting current"""
+        with self.lock:
+            before = session.size()
+            session.apply(instruction, recipe)
+            if session_id in self.sessions:
+                self.total_chars += session.size() - before
+            self.refinements += 1
+            self.evict_locked()
+
+    def remove_locked(self, session_id):
+        session = self.sessions.pop(session_id)
+        self.total_chars -= session.size()
+
+    def expire_idle_locked(self):
+        now = time.time()
+        expired = [sid for sid, session in self.sessions.items() if now - session.last_used > self.ttl]
+        for sid in expired:
+            self.remove_locked(sid)
+        if expired:
+            self.expired += len(expired)
+            logger.info(f"Expired {len(expired)} idle refinement session(s)")
+
+    def evict_locked(self):
+        while self.sessions and (len(self.sessions) > self.max_sessions or self.total_chars > self.max_chars):
+            self.remove_locked(next(iter(self.sessions)))
+            self.evicted += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                'sessions': len(self.sessions),
+                'max_sessions': self.max_sessions,
+                'memory_chars': self.total_chars,
+                'max_chars': self.max_chars,
+                'ttl_seconds': self.ttl,
+                'max_turns': self.max_turns,
+                'created': self.created,
+                'refinements': self.refinements,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Single-Flight
+Coalesces concurrent identical calls: the first caller for a key runs the work,
+everyone arriving while it is in flight waits and shares its result
+"""
+
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self, name):
+        self.name = name
+        self.calls = {}              # key -> InFlightCall
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.peak_waiters = 0
+
+    def do(self, key, fn):
+        """Returns (result, shared); shared is True when another caller's execution was reused"""
+        with self.lock:
+            self.requests += 1
+            call = self.calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                self.peak_waiters = max(self.peak_waiters, call.waiters)
+                leader = False
+            else:
+                call = InFlightCall()
+                self.calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            logger.info(f"🔗 {self.name}: joined in-flight call ({key[:12]})")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'executions': self.executions,
+                'calls_saved': self.coalesced,
+                'in_flight': len(self.calls),
+                'peak_waiters': self.peak_waiters
+            }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Stage Executor
+Runs a request's stage graph on a shared bounded pool: independent stages run
+concurrently, every stage gets the request deadline, and a stage that misses its
+budget is replaced by its fallback so the request continues without it
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class Stage:
+    def __init__(self, name, fn, deps=(), budget=None, fallback=None):
+        """
+        fn(results, deadline): results holds the outputs of deps; deadline is absolute (time.time())
+        budget: seconds this stage may take, capped by the request deadline
+        fallback(results): value used when the stage times out or fails (default None)
+        """
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.budget = budget
+        self.fallback = fallback
+
+class StageExecutor:
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage')
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.stage_counts = {}   # name -> {'ok': n, 'timeout': n, 'error': n}
+
+    def degrade(self, stage, results, timings, status, started):
+        timings[stage.name] = {'status': status, 'seconds': round(time.time() - started, 3)}
+        results[stage.name] = stage.fallback(results) if stage.fallback else None
+
+    def run(self, stages, deadline_seconds):
+        """Returns (results by stage name, timings by stage name)"""
+        deadline = time.time() + deadline_seconds
+        by_name = {stage.name: stage for stage in stages}
+        results = {}
+        timings = {}
+        running = {}   # future -> (stage, started, stage_deadline)
+        waiting = list(stages)
+
+        while waiting or running:
+            # Launch every stage whose dependencies have settled (missing deps are treated as settled)
+            for stage in list(waiting):
+                if all(dep in results or dep not in by_name for dep in stage.deps):
+                    waiting.remove(stage)
+                    started = time.time()
+                    stage_deadline = min(deadline, started + stage.budget) if stage.budget else deadline
+                    inputs = dict(results)
+                    future = self.pool.submit(stage.fn, inputs, stage_deadline)
+                    running[future] = (stage, started, stage_deadline)
+
+            if not running:
+                break
+
+            next_deadline = min(stage_deadline for _, _, stage_deadline in running.values())
+            done, _ = wait(list(running), timeout=max(0.0, next_deadline - time.time()),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, started, _ = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                    timings[stage.name] = {'status': 'ok', 'seconds': round(time.time() - started, 3)}
+                except Exception as e:
+                    logger.error(f"❌ Stage '{stage.name}' failed: {e}")
+                    self.degrade(stage, results, timings, 'error', started)
+
+            # Stages past their budget are abandoned - their threads finish in the background
+            now = time.time()
+            for future, (stage, started, stage_deadline) in list(running.items()):
+                if now >= stage_deadline:
+                    running.pop(future)
+                    future.cancel()
+                    logger.warning(f"⏰ Stage '{stage.name}' missed its budget - continuing without it")
+                    self.degrade(stage, results, timings, 'timeout', started)
+
+        self.record(timings)
+        return results, timings
+
+    def record(self, timings):
+        with self.lock:
+            self.runs += 1
+            for name, timing in timings.items():
+                counts = self.stage_counts.setdefault(name, {'ok': 0, 'timeout': 0, 'error': 0})
+                counts[timing['status']] += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                'max_workers': self.max_workers,
+                'runs': self.runs,
+                'stages': {name: dict(counts) for name, counts in self.stage_counts.items()}
+            }
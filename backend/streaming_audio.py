@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Streaming Transcription
+Incremental speech recognition over a rolling PCM buffer with partial transcripts
+"""
+
+import speech_recognition as sr
+import logging
+import threading
+import uuid
+import time
+import math
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def merge_overlap(committed, segment, max_words=6):
+    """Join segment onto committed text, dropping words the overlapping audio recognized twice"""
+    committed_words = committed.split()
+    segment_words = segment.split()
+    normalize = lambda word: word.lower().strip('.,!?;:')
+    for size in range(min(max_words, len(committed_words), len(segment_words)), 0, -1):
+        if [normalize(w) for w in committed_words[-size:]] == [normalize(w) for w in segment_words[:size]]:
+            segment_words = segment_words[size:]
+            break
+    return ' '.join(committed_words + segment_words)
+
+class StreamingTranscriptionSession:
+    def __init__(self, audio_model, sample_rate=16000, sample_width=2,
+                 window_seconds=8.0, partial_interval=0.5, endpoint_silence=0.4,
+                 silence_threshold=300, frame_seconds=0.02, speech_ratio=3.0, overlap_seconds=0.75,
+                 executor=None):
+        """
+        Rolling-buffer recognizer fed with raw mono PCM frames.
+        Speech is detected per frame_seconds frame: voiced when its RMS is at least
+        silence_threshold and speech_ratio times the running noise floor.
+        Each recognition covers only the audio not yet recognized, plus overlap_seconds
+        carried over from the previous chunk so a word spoken across the cut is still
+        heard whole. Recognition runs on executor when given, never on the caller's thread.
+        """
+        self.audio_model = audio_model
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.bytes_per_second = sample_rate * sample_width
+        self.executor = executor
+
+        self.window_seconds = window_seconds
+        self.partial_interval = partial_interval
+        self.endpoint_silence = endpoint_silence
+        self.silence_threshold = silence_threshold
+        self.frame_bytes = max(sample_width, int(frame_seconds * sample_rate) * sample_width)
+        self.speech_ratio = speech_ratio
+        self.overlap_bytes = int(overlap_seconds * sample_rate) * sample_width
+        self.noise_floor = None          # running RMS of non-speech frames
+        self.pending_frame = bytearray() # tail shorter than one analysis frame
+        self.overlap_pending = False     # the buffer starts with audio already recognized
+        self.ignored_seconds = 0.0       # audio received after the transcript was final
+
+        self.buffer = bytearray()        # audio not yet recognized (plus the overlap)
+        self.committed_text = ''         # text of every recognized chunk
+        self.method_used = None
+
+        self.heard_speech = False
+        self.trailing_silence = 0.0
+        self.unrecognized_seconds = 0.0  # voiced audio added since the last recognition started
+        self.total_seconds = 0.0
+        self.recognizing = False         # a recognition job is running
+        self.finalizing = False          # end of speech seen, final once the tail is recognized
+        self.is_final = False
+        self.finalized_at = None
+        self.recipe_info = None
+
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+        self.lock = threading.Lock()
+        self.final_ready = threading.Condition(self.lock)
+
+    def frame_rms(self, frame):
+        """Root-mean-square energy of a PCM16 frame"""
+        if self.sample_width != 2 or len(frame) < 2:
+            return 0
+        samples = array('h', frame[:len(frame) - len(frame) % 2])
+        if not samples:
+            return 0
+        return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+    def is_speech(self, rms):
+        """Voiced frame test against the fixed minimum and the adaptive noise floor"""
+        if self.noise_floor is None:
+            # Seed from the first frame, capped so a session that opens mid-word still starts low
+            self.noise_floor = min(rms, self.silence_threshold)
+        threshold = max(self.silence_threshold, self.noise_floor * self.speech_ratio)
+        if rms >= threshold:
+            return True
+        # Only quiet frames move the floor, so speech never raises it
+        self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return False
+
+    def add_frames(self, pcm_bytes):
+        """Append PCM frames, schedule recognition of the new audio and detect end of speech"""
+        with self.lock:
+            if self.is_final or self.finalizing:
+                self.ignored_seconds += len(pcm_bytes) / self.bytes_per_second
+                return self.snapshot()
+
+            self.last_activity = time.time()
+            self.total_seconds += len(pcm_bytes) / self.bytes_per_second
+            self.buffer.extend(pcm_bytes)
+
+            # Judge speech frame by frame - one loud word must not make a whole chunk voiced
+            self.pending_frame.extend(pcm_bytes)
+            frame_seconds = self.frame_bytes / self.bytes_per_second
+            endpoint = False
+            while len(self.pending_frame) >= self.frame_bytes:
+                frame = bytes(self.pending_frame[:self.frame_bytes])
+                del self.pending_frame[:self.frame_bytes]
+                if self.is_speech(self.frame_rms(frame)):
+                    self.heard_speech = True
+                    self.trailing_silence = 0.0
+                    self.unrecognized_seconds += frame_seconds
+                else:
+                    self.trailing_silence += frame_seconds
+                    endpoint = endpoint or (self.heard_speech and self.trailing_silence >= self.endpoint_silence)
+
+            if endpoint:
+                # The user stopped talking - only the tail since the last recognition is left
+                self.request_final_locked()
+            elif self.unrecognized_seconds >= self.partial_interval:
+                self.schedule_locked()
+            elif self.unrecognized_seconds == 0 and not self.recognizing and \
+                    len(self.buffer) >= self.window_seconds * self.bytes_per_second:
+                # Silence only since the last chunk - keep just the overlap
+                self.trim_locked(len(self.buffer))
+
+            return self.snapshot()
+
+    def finish(self, timeout=None):
+        """Finalize the transcript (client signalled end of recording) and wait for it"""
+        with self.lock:
+            if not self.is_final:
+                self.request_final_locked()
+                self.final_ready.wait_for(lambda: self.is_final, timeout)
+            return self.snapshot()
+
+    def request_final_locked(self):
+        """Mark end of speech; the session turns final once the tail is recognized"""
+        self.finalizing = True
+        if self.recognizing:
+            return  # the running job finalizes when it completes
+        if self.unrecognized_seconds > 0:
+            self.schedule_locked()
+        else:
+            self.mark_final_locked()
+
+    def mark_final_locked(self):
+        self.is_final = True
+        self.finalized_at = time.time()
+        self.final_ready.notify_all()
+        logger.info(f"Streaming transcript finalized after {self.total_seconds:.2f}s: '{self.committed_text}'")
+
+    def schedule_locked(self):
+        """Start recognizing the audio received since the last chunk"""
+        if self.recognizing or not self.buffer:
+            return
+        chunk = bytes(self.buffer)
+        overlapping = self.overlap_pending
+        self.unrecognized_seconds = 0.0
+        self.recognizing = True
+        if self.executor is None:
+            self.lock.release()
+            try:
+                self.recognize_chunk(chunk, overlapping)
+            finally:
+                self.lock.acquire()
+        else:
+            self.executor.submit(self.recognize_chunk, chunk, overlapping)
+
+    def recognize_chunk(self, chunk, overlapping):
+        """Recognize one chunk outside the session lock and merge it into the transcript"""
+        transcript, method = None, None
+        try:
+            audio_data = sr.AudioData(chunk, self.sample_rate, self.sample_width)
+            transcript, method = self.audio_model.transcribe_audio_data(audio_data)
+        except Exception as e:
+            logger.error(f"Streaming chunk recognition failed: {e}")
+
+        recipe_info = None
+        if transcript:
+            text = merge_overlap(self.committed_text, transcript) if overlapping else \
+                f"{self.committed_text} {transcript}".strip()
+            recipe_info = self.audio_model.extract_recipe_information(text)
+
+        with self.lock:
+            if transcript:
+                # Only this job writes committed_text, so text is still current
+                self.committed_text = text
+                self.method_used = method
+                self.recipe_info = recipe_info
+            self.trim_locked(len(chunk))
+            self.recognizing = False
+            if self.unrecognized_seconds > 0 and (self.finalizing or self.unrecognized_seconds >= self.partial_interval):
+                self.schedule_locked()
+            elif self.finalizing:
+                self.mark_final_locked()
+
+    def trim_locked(self, consumed):
+        """Drop recognized audio from the buffer, keeping the overlap for the next chunk"""
+        keep_from = max(0, consumed - self.overlap_bytes)
+        del self.buffer[:keep_from]
+        self.overlap_pending = bool(self.overlap_bytes) and consumed > 0
+
+    def current_text(self):
+        """Text recognized so far"""
+        return self.committed_text
+
+    def snapshot(self):
+        """Current state of the stream for the client"""
+        transcript = self.current_text()
+        return {
+            'success': True,
+            'transcript': transcript,
+            'is_final': self.is_final,
+            'recipe_info': self.recipe_info,
+            'method_used': self.method_used,
+            'audio_seconds': round(self.total_seconds, 2),
+            'speech_detected': self.heard_speech,
+            'ignored_seconds': round(self.ignored_seconds, 2)
+        }
+
+class StreamingSessionRegistry:
+    def __init__(self, max_sessions=32, idle_timeout=60, final_grace=5, recognition_workers=4):
+        """
+        Thread-safe registry of live streaming sessions with idle expiry.
+        Final sessions stay reachable for final_grace seconds so late frames are counted
+        rather than refused; recognition for every session shares one worker pool.
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.final_grace = final_grace
+        self.executor = ThreadPoolExecutor(max_workers=recognition_workers,
+                                           thread_name_prefix='stream-recognition')
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create(self, audio_model, **session_options):
+        """Open a new session and return its id"""
+        with self.lock:
+            self.expire_idle_locked()
+            if len(self.sessions) >= self.max_sessions:
+                return None, None
+            session_id = uuid.uuid4().hex
+            session_options.setdefault('executor', self.executor)
+            session = StreamingTranscriptionSession(audio_model, **session_options)
+            self.sessions[session_id] = session
+            return session_id, session
+
+    def get(self, session_id):
+        """Look up a live session"""
+        with self.lock:
+            self.expire_idle_locked()
+            return self.sessions.get(session_id)
+
+    def close(self, session_id):
+        """Forget a session"""
+        with self.lock:
+            return self.sessions.pop(session_id, None)
+
+    def expire_idle_locked(self):
+        """Drop sessions that stopped sending audio or whose grace period after final ran out"""
+        now = time.time()
+        expired = [sid for sid, session in self.sessions.items()
+                   if now - session.last_activity > self.idle_timeout
+                   or (session.finalized_at is not None and now - session.finalized_at > self.final_grace)]
+        for sid in expired:
+            del self.sessions[sid]
+        if expired:
+            logger.info(f"Expired {len(expired)} idle streaming session(s)")
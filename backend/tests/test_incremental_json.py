@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from incremental_json import IncrementalRecipeParser
+
+RECIPE = {
+    'name': 'Paneer Tikka {spicy}',
+    'description': 'Charred "tikka" with a \\ backslash, commas, and [brackets]',
+    'prep_time': 20,
+    'vegetarian': True,
+    'rating': None,
+    'ingredients': ['250 g paneer, cubed', '1/2 cup yogurt', '1 tsp garam masala'],
+    'instructions': [
+        {'step': 1, 'text': 'Marinate the paneer'},
+        {'step': 2, 'text': 'Grill until charred'}
+    ],
+    'nutrition': {'calories': 320, 'tags': ['high protein']},
+    'tips': []
+}
+
+EXPECTED = [
+    ('field', 'name', RECIPE['name']),
+    ('field', 'description', RECIPE['description']),
+    ('field', 'prep_time', 20),
+    ('field', 'vegetarian', True),
+    ('field', 'rating', None),
+    ('item', 'ingredients', '250 g paneer, cubed'),
+    ('item', 'ingredients', '1/2 cup yogurt'),
+    ('item', 'ingredients', '1 tsp garam masala'),
+    ('field', 'ingredients', RECIPE['ingredients']),
+    ('item', 'instructions', RECIPE['instructions'][0]),
+    ('item', 'instructions', RECIPE['instructions'][1]),
+    ('field', 'instructions', RECIPE['instructions']),
+    ('field', 'nutrition', RECIPE['nutrition']),
+    ('field', 'tips', []),
+]
+
+def feed_in_chunks(text, size):
+    parser = IncrementalRecipeParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 16, 10_000])
+def test_same_events_for_any_chunk_split(size):
+    assert feed_in_chunks(json.dumps(RECIPE), size) == EXPECTED
+
+def test_pretty_printed_and_fenced_response():
+    text = 'Here is your recipe:\n```json\n' + json.dumps(RECIPE, indent=2) + '\n```\n'
+    assert feed_in_chunks(text, 5) == EXPECTED
+
+def test_field_reported_as_soon_as_it_completes():
+    parser = IncrementalRecipeParser()
+    assert parser.feed('{"name": "Dal", "prep_time": 1') == [('field', 'name', 'Dal')]
+    # A scalar is only complete at the next delimiter - more digits could follow
+    assert parser.feed('5') == []
+    assert parser.feed(', "ingredients": ["lentils"') == [('field', 'prep_time', 15)]
+    assert parser.feed(', "water"]') == [('item', 'ingredients', 'lentils'), ('item', 'ingredients', 'water'),
+                                        ('field', 'ingredients', ['lentils', 'water'])]
+
+def test_text_after_the_root_object_is_ignored():
+    parser = IncrementalRecipeParser()
+    assert parser.feed('{"name": "Dal"} {"name": "Other"}') == [('field', 'name', 'Dal')]
+    assert parser.done
+    assert parser.feed('"more"') == []
+
+def test_truncated_stream_reports_only_complete_fields():
+    text = json.dumps(RECIPE)
+    cut = text.index('"Grill')
+    assert feed_in_chunks(text[:cut], 4) == EXPECTED[:10]
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+
+from local_recipes import CUISINE_PROFILES, LocalRecipeEngine
+
+MEAT = r'\b(?:chicken|beef|pork|lamb|mutton|veal|turkey|duck|steak|ribs|wings|sausages?|chorizo)\b'
+SEAFOOD = r'\b(?:fish|salmon|tuna|cod|shrimp|prawns|crab|lobster|clams?|mussels|scallops|squid)\b'
+PORK = r'\b(?:pork|ham|prosciutto|lard)\b|(?<!beef )\b(?:bacon|pancetta)\b'
+DAIRY = (r'\bghee\b|(?<!vegan )(?<!peanut )\bbutter\b|(?<!coconut )\bcream\b(?! cheese)'
+         r'|(?<!vegan )(?<!cream )\bcheese\b|(?<!vegan )\bcream cheese\b|\bparmesan\b|\bmozzarella\b'
+         r'|(?<!plant )\byog(?:h)?urt\b|(?<!coconut )(?<!oat )(?<!plant )\bmilk\b|\bbuttermilk\b|\bpaneer\b')
+ANIMAL_STOCK = r'\b(?:fish|oyster) sauce\b|(?<!kombu )\bdashi\b|\bgelatin\b|\blard\b'
+GLUTEN = (r'\bsoy sauce\b|(?<!gluten-free )\b(?:oyster|mushroom stir-fry) sauce\b'
+          r'|(?<!gluten-free )\b(?:all-purpose |plain |wheat )?flour\b(?! blend)'
+          r'|(?<!rice )(?<!corn )(?<!gluten-free )\b(?:pasta|spaghetti|noodles|bread|baguette|naan|tortillas?'
+          r'|wraps?|buns?|rolls?|couscous|pastry)\b')
+ALCOHOL = r'\b(?:dry )?(?:white |red )?wine\b(?! vinegar)|\b(?:mirin|sake|beer)\b'
+LAND_MEAT = r'\b(?:chicken|beef|lamb|mutton|goat|veal|turkey|duck)\b'
+
+FORBIDDEN = {
+    'vegetarian': [MEAT, SEAFOOD, PORK, ANIMAL_STOCK],
+    'vegan': [MEAT, SEAFOOD, PORK, ANIMAL_STOCK, DAIRY, r'(?<!flax )\beggs?\b', r'\bhoney\b'],
+    'dairy_free': [DAIRY],
+    'gluten_free': [GLUTEN],
+    'halal': [PORK, ALCOHOL, rf'(?<!halal )(?<!halal beef ){LAND_MEAT}'],
+    'kosher': [PORK, r'\b(?:shrimp|prawns|crab|lobster|clams?|mussels|scallops|squid)\b', r'\boyster sauce\b',
+               rf'(?<!kosher )(?<!kosher beef ){LAND_MEAT}', r'(?<!kosher )(?<!kosher dry )(?<!kosher dry white )'
+               r'(?<!kosher dry red )\b(?:dry )?(?:white |red )?wine\b(?! vinegar)']
+}
+
+DISHES = ['chicken_curry', 'pad_thai', 'spaghetti_bolognese', 'miso_soup', 'caesar_salad', 'fried_rice',
+          'tacos', 'bbq_ribs', 'lasagne', 'chocolate_cake', 'Custom Dish']
+
+USER_INGREDIENTS = 'chicken, shrimp, bread, cheese, butter, honey, eggs, spinach'
+
+@pytest.fixture(scope='module')
+def engine():
+    return LocalRecipeEngine()
+
+def violations(recipe, diet):
+    lines = recipe['ingredients'] + recipe['instructions']
+    return [(pattern, line) for pattern in FORBIDDEN[diet] for line in lines
+            if re.search(pattern, line, re.IGNORECASE)]
+
+@pytest.mark.parametrize('diet', sorted(FORBIDDEN))
+@pytest.mark.parametrize('cuisine', sorted(CUISINE_PROFILES))
+@pytest.mark.parametrize('dish', DISHES)
+def test_labelled_diet_is_met(engine, diet, cuisine, dish):
+    recipe = engine.generate(dish, cuisine, USER_INGREDIENTS, None, {'dietary_restrictions': [diet]})
+    assert diet.replace('_', ' ') in recipe['description']
+    assert diet.replace('_', '-') in recipe['tags']
+    assert violations(recipe, diet) == []
+
+@pytest.mark.parametrize('cuisine', sorted(CUISINE_PROFILES))
+def test_combined_diets(engine, cuisine):
+    recipe = engine.generate('spaghetti_bolognese', cuisine, '', None,
+                             {'dietary_restrictions': ['gluten_free', 'dairy_free', 'vegetarian']})
+    for diet in ('gluten_free', 'dairy_free', 'vegetarian'):
+        assert violations(recipe, diet) == []
+
+def test_bolognese_gluten_and_dairy_free(engine):
+    recipe = engine.generate('spaghetti_bolognese', 'Italian', '', None,
+                             {'dietary_restrictions': ['gluten_free', 'dairy_free']})
+    assert '400 g dried gluten-free pasta' in recipe['ingredients']
+    assert 'Fresh basil and nutritional yeast' in recipe['ingredients']
+    assert '(dairy free, gluten free)' in recipe['description']
+
+@pytest.mark.parametrize('cuisine, swapped', [
+    ('Thai', '2 tablespoons soy sauce'),
+    ('Chinese', '1 tablespoon mushroom stir-fry sauce'),
+    ('Japanese', '1 cup vegetable stock'),
+])
+def test_vegetarian_seasoning_swaps(engine, cuisine, swapped):
+    recipe = engine.generate('Custom Dish', cuisine, '', None, {'dietary_restrictions': ['vegetarian']})
+    assert swapped in recipe['ingredients']
+
+def test_user_tofu_counts_as_protein(engine):
+    recipe = engine.generate('Custom Dish', 'Chinese', 'tofu, broccoli', None,
+                             {'dietary_restrictions': ['vegetarian']})
+    assert 'tofu' in recipe['ingredients']
+    assert not any('paneer' in line or 'chickpeas' in line for line in recipe['ingredients'])
+
+def test_kosher_meat_is_not_served_with_dairy(engine):
+    recipe = engine.generate('Custom Dish', 'Italian', 'beef, cream', None, {'dietary_restrictions': ['kosher']})
+    assert violations(recipe, 'dairy_free') == []
+    assert 'kosher beef' in recipe['ingredients']
+
+def test_unsupported_diets_are_not_labelled(engine):
+    recipe = engine.generate('spaghetti_bolognese', 'Italian', '', None,
+                             {'dietary_restrictions': ['low_carb', 'low_fat']})
+    assert 'low' not in recipe['description']
+    assert not any(tag.startswith('low') for tag in recipe['tags'])
+    assert not any('Low' in highlight for highlight in recipe['nutritional_highlights'])
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import app
+
+INGREDIENTS = 'paneer, spinach, garlic, cream'
+
+CACHED_RESULT = {
+    'success': True,
+    'method': 'gemini_ai',
+    'model_tier': 'strong',
+    'recipe': {
+        'recipe_name': 'Palak Paneer',
+        'description': 'Paneer in a garlicky spinach sauce',
+        'cuisine_type': 'Indian',
+        'servings': 4,
+        'ingredients': ['250 g paneer', '400 g spinach', '3 cloves garlic', '1/4 cup cream'],
+        'instructions': ['Blanch and puree the spinach', 'Simmer with garlic and cream', 'Fold in the paneer'],
+        'tags': ['vegetarian']
+    }
+}
+
+@pytest.fixture
+def client():
+    key = app.recipe_request_key(INGREDIENTS, 'Custom Dish')
+    app.recipe_cache.put(key, CACHED_RESULT)
+    return app.app.test_client()
+
+def sse_events(body):
+    events = []
+    for frame in body.decode().split('\n\n'):
+        if frame.strip():
+            lines = dict(line.split(': ', 1) for line in frame.splitlines())
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+def test_cached_recipe_is_the_same_over_stream_and_predict(client):
+    unary = client.post('/predict', data={'text': INGREDIENTS}).get_json()
+    events = sse_events(client.post('/predict/stream', data={'text': INGREDIENTS}).data)
+    kinds = [kind for kind, _ in events]
+
+    assert unary['recipe'] == CACHED_RESULT['recipe']
+    assert dict(events)['recipe'] == unary['recipe']
+    # A cache hit makes no Gemini call, so there is no draft or partial field to show
+    assert kinds == ['recipe', 'done']
+    streamed_info = dict(events)['done']['generation_info']
+    for field in ('method', 'model_tier', 'cache_status', 'llm'):
+        assert streamed_info[field] == unary['generation_info'][field]
+    assert streamed_info['cache_status'] == 'hit'
@@ -0,0 +1,99 @@
+import re
+
+import pytest
+
+from preference_extractor import (CATEGORY_TABLES, DEFAULT_SERVING_SIZE, PreferenceExtractor,
+                                  default_recipe_info)
+
+LEGACY_SERVING_PATTERNS = [r'for (\d+) people', r'(\d+) servings?', r'serves? (\d+)',
+                           r'make it for (\d+)', r'(\d+) portions?', r'(\d+) person']
+
+def legacy_extract(transcript):
+    """The per-table substring scan AudioModel used before the single-pass extractor"""
+    recipe_info = default_recipe_info()
+    text = transcript.lower()
+    for pattern in LEGACY_SERVING_PATTERNS:
+        match = re.search(pattern, text)
+        if match and 1 <= int(match.group(1)) <= 20:
+            recipe_info['serving_size'] = int(match.group(1))
+            break
+    for field, table, multi_valued in CATEGORY_TABLES:
+        for value, keywords in table.items():
+            if any(keyword in text for keyword in keywords):
+                if multi_valued:
+                    recipe_info[field].append(value)
+                else:
+                    recipe_info[field] = value
+                    break
+    return recipe_info
+
+@pytest.fixture(scope='module')
+def extractor():
+    return PreferenceExtractor()
+
+UNCHANGED = [
+    '',
+    'Make a vegetarian curry for 2 people, not spicy, something quick and easy.',
+    'I want a vegan, gluten-free salad; plant-based please!',
+    'No dairy. Hot! Grilled or baked, traditional style.',
+    'Halal chicken, serves 6, slow cook it for hours.',
+    'Kosher and low-fat: steamed fish, 3 portions, healthy and simple.',
+    'Something medium, regular spice, boiled then sauteed... comfort food.',
+    'Very spicy keto dinner (BBQ), modern, 10 minutes.',
+    'MILD, dairy-free, oven roasted, authentic, make it for 5.',
+    'extra-hot wings, deep fry them',
+]
+
+@pytest.mark.parametrize('transcript', UNCHANGED)
+def test_matches_legacy_extraction(extractor, transcript):
+    assert extractor.extract(transcript) == legacy_extract(transcript)
+
+# Transcripts the word-bounded, longest-phrase-first pattern reads differently on purpose:
+# (transcript, field, legacy value, new value)
+CHANGED = [
+    # Overlapping phrases: the longer phrase wins instead of the table order
+    ('Make it extra hot please', 'spice_level', 'Hot', 'Extra Hot'),
+    ('very hot, for 4 people', 'spice_level', 'Hot', 'Extra Hot'),
+    ('I like it really spicy.', 'spice_level', 'Hot', 'Extra Hot'),
+    ('A stir fry with tofu', 'cooking_method', ['fried', 'stir_fried'], ['stir_fried']),
+    ('Vegan stir-fry; no wok.', 'cooking_method', ['fried', 'stir_fried'], ['stir_fried']),
+    # Word boundaries: phrases inside other words no longer count
+    ('Take a shot of espresso', 'spice_level', 'Hot', 'Medium'),
+    ('Lightly dressed greens', 'dietary_restrictions', ['low_fat'], []),
+    ('Veggies and rice', 'dietary_restrictions', ['vegetarian'], []),
+    ('Breakfast burrito', 'cooking_time', 'Quick', 'Normal'),
+    ('Serve with a roasted-pepper sauce', 'cooking_method', ['baked'], []),
+]
+
+@pytest.mark.parametrize('transcript, field, legacy, new', CHANGED)
+def test_intended_differences_from_legacy(extractor, transcript, field, legacy, new):
+    assert legacy_extract(transcript)[field] == legacy
+    assert extractor.extract(transcript)[field] == new
+
+@pytest.mark.parametrize('transcript, spice_level', [
+    ('hot', 'Hot'),
+    ('extra hot', 'Extra Hot'),
+    ('Extra hot!', 'Extra Hot'),
+    ('hot, extra', 'Hot'),
+    ('not spicy.', 'Mild'),
+    ('mild or extra hot', 'Mild'),
+    ('"hot"', 'Hot'),
+    ('hot-headed', 'Hot'),
+    ('hotdog', 'Medium'),
+])
+def test_spice_phrase_boundaries(extractor, transcript, spice_level):
+    assert extractor.extract(transcript)['spice_level'] == spice_level
+
+@pytest.mark.parametrize('transcript, serving_size', [
+    ('for 2 people', 2),
+    ('serves 8.', 8),
+    ('3 servings, please', 3),
+    ('make it for 6', 6),
+    ('for 50 people', DEFAULT_SERVING_SIZE),
+    ('for 2people', DEFAULT_SERVING_SIZE),
+])
+def test_serving_size(extractor, transcript, serving_size):
+    assert extractor.extract(transcript)['serving_size'] == serving_size
+
+def test_batch_matches_single(extractor):
+    assert extractor.extract_batch(UNCHANGED) == [extractor.extract(t) for t in UNCHANGED]
@@ -0,0 +1,132 @@
+from fractions import Fraction
+
+import pytest
+
+from recipe_variants import RecipeVariantTransformer, parse_ingredient, scale_ingredient
+
+@pytest.fixture
+def transformer():
+    return RecipeVariantTransformer()
+
+@pytest.mark.parametrize('line, amount, high, unit, item', [
+    ('2 cups rice', Fraction(2), None, 'cup', 'rice'),
+    ('1 1/2 tbsp olive oil', Fraction(3, 2), None, 'tbsp', 'olive oil'),
+    ('1/2 teaspoon salt', Fraction(1, 2), None, 'tsp', 'salt'),
+    ('½ cup milk', Fraction(1, 2), None, 'cup', 'milk'),
+    ('1½ cups flour', Fraction(3, 2), None, 'cup', 'flour'),
+    ('2-3 cloves garlic, minced', Fraction(2), Fraction(3), 'clove', 'garlic, minced'),
+    ('500 g chicken thighs', Fraction(500), None, 'g', 'chicken thighs'),
+    ('1.5 kg potatoes', Fraction(3, 2), None, 'kg', 'potatoes'),
+    ('3 large eggs', Fraction(3), None, None, 'large eggs'),
+])
+def test_parse_ingredient(line, amount, high, unit, item):
+    parsed = parse_ingredient(line)
+    assert (parsed['amount'], parsed['high'], parsed['unit'], parsed['item']) == (amount, high, unit, item)
+
+def test_parse_ingredient_without_quantity():
+    parsed = parse_ingredient('Salt to taste')
+    assert parsed['amount'] is None
+    assert parsed['item'] == 'Salt to taste'
+
+@pytest.mark.parametrize('line, factor, expected', [
+    ('2 cups rice', Fraction(2), '4 cups rice'),
+    ('1 cup rice', Fraction(1, 2), '1/2 cup rice'),
+    ('1 tbsp soy sauce', Fraction(1, 2), '1 1/2 teaspoons soy sauce'),
+    ('1 tsp cumin', Fraction(3), '1 tablespoon cumin'),
+    ('3 tbsp butter', Fraction(2), '3/8 cup butter'),
+    ('4 tbsp butter', Fraction(2), '1/2 cup butter'),
+    ('600 g beef', Fraction(2), '1 1/4 kg beef'),
+    ('250 ml stock', Fraction(1, 3), '85 ml stock'),
+    ('1 large onion, chopped', Fraction(2), '2 large onions, chopped'),
+    ('3 tomatoes', Fraction(1, 3), '1 tomato'),
+    ('1 egg', Fraction(3, 2), '1 1/2 eggs'),
+    ('2 tsp salt', Fraction(2), '1 1/3 tablespoons salt'),
+    ('2-3 cloves garlic', Fraction(2), '4-6 cloves garlic'),
+    ('Salt to taste', Fraction(2), 'Salt to taste'),
+    ('2 cups rice', Fraction(1), '2 cups rice'),
+])
+def test_scale_ingredient(line, factor, expected):
+    assert scale_ingredient(line, factor) == expected
+
+def test_scaled_amount_never_rounds_to_zero():
+    assert scale_ingredient('1 pinch saffron', Fraction(1, 8)) == '1/2 pinch saffron'
+
+@pytest.mark.parametrize('instruction, expected', [
+    ('make it for 8 people', {'servings': 8}),
+    ('double it', {'scale': Fraction(2)}),
+    ('halve the recipe', {'scale': Fraction(1, 2)}),
+    ('make it spicy', {'spice_level': 'Hot'}),
+    ('make it medium spicy', {'spice_level': 'Medium'}),
+    ('not spicy please', {'spice_level': 'Mild'}),
+    ('make it spicier', {'spice_level': 'Hot'}),
+    ('make it vegan', {'dietary': ['vegan']}),
+    ('make it vegan and gluten free for 2', {'servings': 2, 'dietary': ['vegan', 'gluten_free']}),
+])
+def test_plan(transformer, instruction, expected):
+    changes = transformer.plan(instruction)
+    assert changes == dict({'servings': None, 'scale': None, 'spice_level': None, 'dietary': []}, **expected)
+
+def test_plan_steps_relative_to_current_spice(transformer):
+    assert transformer.plan('make it milder', current_spice='Hot')['spice_level'] == 'Medium'
+    assert transformer.plan('hotter', current_spice='Extra Hot')['spice_level'] == 'Extra Hot'
+
+@pytest.mark.parametrize('instruction', [
+    'add mushrooms',
+    'make it grilled',
+    'make it keto',
+    'for 80 people',
+    'please',
+    '',
+])
+def test_plan_declines_what_it_cannot_do_locally(transformer, instruction):
+    assert transformer.plan(instruction) is None
+
+def test_substitute_dairy_free(transformer):
+    recipe = {
+        'name': 'Buttermilk Pancakes',
+        'ingredients': ['1 cup buttermilk', '100 g cream cheese', '2 tbsp butter', '1/2 cup heavy cream',
+                        '1 cup milk', '50 g cheddar cheese', '2 tbsp grated parmesan', '1 tbsp peanut butter'],
+        'instructions': ['Whisk the buttermilk and milk'],
+        'tags': []
+    }
+    transformer.substitute(recipe, 'dairy_free')
+    assert recipe['name'] == 'Soured Oat Milk Pancakes'
+    assert recipe['ingredients'] == [
+        '1 cup soured oat milk', '100 g vegan cream cheese', '2 tbsp vegan butter', '1/2 cup coconut cream',
+        '1 cup oat milk', '50 g vegan cheese', '2 tbsp nutritional yeast', '1 tbsp peanut butter'
+    ]
+    assert recipe['instructions'] == ['Whisk the soured oat milk and oat milk']
+    assert recipe['tags'] == ['dairy-free']
+
+def test_substitute_is_idempotent(transformer):
+    recipe = {'ingredients': ['100 g cream cheese', '1 cup cream', '2 eggs', '1 cup chicken broth', '200 g pasta']}
+    for diet in ('vegan', 'gluten_free'):
+        transformer.substitute(recipe, diet)
+    once = list(recipe['ingredients'])
+    for diet in ('vegan', 'dairy_free', 'gluten_free'):
+        transformer.substitute(recipe, diet)
+    assert recipe['ingredients'] == once == [
+        '100 g vegan cream cheese', '1 cup coconut cream', '2 flax eggs', '1 cup vegetable stock',
+        '200 g gluten-free pasta'
+    ]
+
+def test_substitute_vegetarian_keeps_case(transformer):
+    recipe = {'name': 'Chicken Curry', 'ingredients': ['500 g chicken thighs', 'Fish sauce'],
+              'description': 'A chicken curry.'}
+    transformer.substitute(recipe, 'vegetarian')
+    assert recipe['name'] == 'Firm Tofu Curry'
+    assert recipe['ingredients'] == ['500 g firm tofu', 'Soy sauce']
+    assert recipe['description'] == 'A firm tofu curry.'
+
+def test_apply_leaves_the_original_untouched(transformer):
+    recipe = {'servings': 4, 'ingredients': ['2 cups rice', '1 tsp chili flakes'], 'tags': []}
+    variant = transformer.apply(recipe, {'servings': 8, 'spice_level': 'Hot', 'dietary': ['vegan']})
+    assert variant['servings'] == 8
+    assert variant['ingredients'] == ['4 cups rice', '1 1/3 tablespoons chili flakes']
+    assert recipe == {'servings': 4, 'ingredients': ['2 cups rice', '1 tsp chili flakes'], 'tags': []}
+
+def test_base_transcript_drops_only_servings_and_spice(transformer):
+    assert transformer.base_transcript('Pasta for 8 people, spicy') == transformer.base_transcript('pasta')
+    assert transformer.base_transcript("no peanuts, I'm allergic") != transformer.base_transcript('')
+    # Sizes the extractor ignores stay in the transcript
+    assert 'for 30 people' in transformer.base_transcript('pasta for 30 people')
@@ -0,0 +1,75 @@
+import math
+import threading
+import time
+from array import array
+
+import pytest
+
+from streaming_audio import StreamingSessionRegistry, StreamingTranscriptionSession
+
+RATE = 16000
+
+def tone(seconds, amplitude=8000):
+    samples = array('h', (int(amplitude * math.sin(2 * math.pi * 220 * i / RATE)) for i in range(int(seconds * RATE))))
+    return samples.tobytes()
+
+def silence(seconds):
+    return bytes(int(seconds * RATE) * 2)
+
+class FakeAudioModel:
+    """Returns one word per recognized chunk and records how much audio each call covered"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.chunk_seconds = []
+        self.threads = set()
+
+    def transcribe_audio_data(self, audio_data):
+        self.threads.add(threading.current_thread().name)
+        self.chunk_seconds.append(len(audio_data.frame_data) / (RATE * 2))
+        time.sleep(self.delay)
+        return f'word{len(self.chunk_seconds)}', 'fake'
+
+    def extract_recipe_information(self, transcript):
+        return {'transcript': transcript}
+
+def test_each_recognition_covers_only_the_new_audio():
+    model = FakeAudioModel()
+    session = StreamingTranscriptionSession(model, sample_rate=RATE)
+    for _ in range(12):
+        session.add_frames(tone(0.5))
+    # 0.5s of new speech plus the 0.75s overlap, never the whole 6s segment
+    assert max(model.chunk_seconds) <= 1.25 + 1e-6
+    assert session.snapshot()['transcript'].split() == [f'word{i}' for i in range(1, 13)]
+
+def test_final_after_short_pause_recognizes_only_the_tail():
+    model = FakeAudioModel()
+    session = StreamingTranscriptionSession(model, sample_rate=RATE)
+    session.add_frames(tone(4.0))
+    calls = len(model.chunk_seconds)
+    session.add_frames(tone(0.3))
+    result = session.add_frames(silence(0.4))
+    assert result['is_final']
+    assert len(model.chunk_seconds) == calls + 1
+    assert model.chunk_seconds[-1] <= 0.75 + 0.3 + 0.4 + 1e-6
+
+def test_recognition_runs_off_the_request_thread():
+    registry = StreamingSessionRegistry(recognition_workers=1)
+    model = FakeAudioModel(delay=0.2)
+    _, session = registry.create(model, sample_rate=RATE)
+    started = time.time()
+    session.add_frames(tone(1.0))
+    session.add_frames(silence(0.5))
+    assert time.time() - started < 0.1
+    assert threading.current_thread().name not in model.threads
+    assert session.finish(timeout=5)['is_final']
+
+def test_late_frames_are_counted_during_the_grace_period():
+    registry = StreamingSessionRegistry(final_grace=0.2)
+    session_id, session = registry.create(FakeAudioModel(), sample_rate=RATE)
+    session.add_frames(tone(1.0) + silence(0.5))
+    assert session.finish(timeout=5)['is_final']
+    assert registry.get(session_id) is session
+    assert session.add_frames(tone(0.5))['ignored_seconds'] == pytest.approx(0.5)
+    time.sleep(0.3)
+    assert registry.get(session_id) is None
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Bulk Voice-Note Transcriber
+Walks a directory of recorded voice notes and transcribes them on a process pool
+(one warm AudioModel per worker), writing resumable JSONL with recipe_info
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.webm', '.m4a', '.aac'}
+
+# AudioModel's placeholder transcript when every engine failed - reported as success, stored as a failure
+GENERIC_FALLBACK_METHOD = 'fallback_generic'
+
+# One warm model per worker process
+worker_model = None
+
+def init_worker(max_duration, over_limit):
+    """Load the AudioModel once when the worker process starts"""
+    global worker_model
+    # Each worker handles one file at a time - a single pooled recognizer is enough
+    os.environ.setdefault('AUDIO_POOL_SIZE', '1')
+    from audio_model import AudioModel
+    from audio_probe import AudioLimits
+    worker_model = AudioModel()
+    # Archived notes are not bound by the server's upload limits (AUDIO_MAX_DURATION)
+    worker_model.audio_limits = AudioLimits(max_duration=max_duration or float('inf'), over_limit=over_limit)
+
+def transcribe_file(path):
+    """Transcribe one voice note inside a worker"""
+    start = time.time()
+    result = worker_model.process_audio_for_recipe(path)
+    probe = (result.get('processing_info') or {}).get('probe') or {}
+    placeholder = result.get('method_used') == GENERIC_FALLBACK_METHOD
+    actions = probe.get('actions') or []
+    audio_seconds = probe.get('duration_seconds')
+    transcribed_seconds = audio_seconds
+    if audio_seconds is not None and 'truncated' in actions:
+        transcribed_seconds = min(audio_seconds, worker_model.audio_limits.max_duration)
+    return {
+        'path': path,
+        'success': result.get('success', False) and not placeholder,
+        'transcript': '' if placeholder else result.get('transcript', ''),
+        'method_used': result.get('method_used'),
+        'recipe_info': None if placeholder else result.get('recipe_info'),
+        'error': 'All transcription engines failed' if placeholder else result.get('error'),
+        'audio_seconds': audio_seconds,
+        'limit_actions': actions,
+        'transcribed_seconds': None if 'rejected' in actions else transcribed_seconds,
+        'processing_seconds': round(time.time() - start, 3)
+    }
+
+def find_audio_files(input_dir):
+    """All voice notes under input_dir, in a stable order"""
+    return sorted(
+        str(path) for path in Path(input_dir).rglob('*')
+        if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+def load_completed(output_path):
+    """Paths already transcribed successfully (failures are retried on resume)"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            # Older runs stored the generic placeholder as a success
+            if record.get('success') and record.get('path') and record.get('method_used') != GENERIC_FALLBACK_METHOD:
+                completed.add(record['path'])
+    return completed
+
+def transcribe_directory(input_dir, output_path, workers, max_duration=0, over_limit='reject'):
+    """Transcribe every pending file and report throughput"""
+    files = find_audio_files(input_dir)
+    completed = load_completed(output_path)
+    pending = [path for path in files if path not in completed]
+
+    print(f"🎙️ Found {len(files)} voice notes, {len(completed)} already done, {len(pending)} to transcribe")
+    if not pending:
+        return
+
+    start = time.time()
+    done = 0
+    failed = 0
+    audio_seconds = 0.0
+    truncated = 0
+    processing_seconds = 0.0
+
+    with open(output_path, 'a', encoding='utf-8') as output, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                initargs=(max_duration, over_limit)) as executor:
+        futures = {executor.submit(transcribe_file, path): path for path in pending}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {'path': futures[future], 'success': False, 'error': str(e)}
+
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+
+            done += 1
+            if not record.get('success'):
+                failed += 1
+            if 'truncated' in (record.get('limit_actions') or []):
+                truncated += 1
+            # Throughput is measured against the audio the engines actually processed
+            audio_seconds += record.get('transcribed_seconds') or 0.0
+            processing_seconds += record.get('processing_seconds') or 0.0
+
+            if done % 25 == 0 or done == len(pending):
+                elapsed = time.time() - start
+                print(f"   {done}/{len(pending)} files, {done / elapsed:.2f} files/sec")
+
+    elapsed = time.time() - start
+    print("=" * 50)
+    print(f"✅ Transcribed {done} files ({failed} failed) in {elapsed:.1f}s")
+    if truncated:
+        print(f"✂️ {truncated} notes were cut to the first {max_duration:.0f}s (--max-duration)")
+    print(f"⚡ Throughput: {done / elapsed:.2f} files/sec")
+    if audio_seconds:
+        # Per-worker compute time vs. audio length, and wall-clock vs. audio length
+        print(f"⏱️ Real-time factor: {processing_seconds / audio_seconds:.3f} per worker, "
+              f"{elapsed / audio_seconds:.3f} overall ({audio_seconds:.1f}s of audio transcribed)")
+    print(f"📄 Output: {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-transcribe voice notes into JSONL')
+    parser.add_argument('input_dir', help='Directory of recorded voice notes (searched recursively)')
+    parser.add_argument('-o', '--output', default='voice_notes.jsonl', help='JSONL output file (appended, resumable)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2, help='Worker processes')
+    parser.add_argument('--max-duration', type=float, default=0,
+                        help='Longest note in seconds (0 = no limit, the default)')
+    parser.add_argument('--over-limit', choices=['reject', 'truncate'], default='reject',
+                        help='Longer notes are recorded as failures (reject) or cut short (truncate)')
+    args = parser.parse_args()
+
+    transcribe_directory(args.input_dir, args.output, args.workers, args.max_duration, args.over_limit)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Transcript Cache
+LRU cache of transcription results keyed by a fingerprint of the decoded audio,
+with an optional SQLite tier that survives restarts
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def trim_silence(pcm_bytes, sample_width=2):
+    """Strip leading/trailing digital silence so padding differences don't change the key"""
+    end = len(pcm_bytes) - len(pcm_bytes) % sample_width
+    start = end - len(pcm_bytes[:end].lstrip(b'\x00'))
+    start -= start % sample_width
+    stop = len(pcm_bytes[:end].rstrip(b'\x00'))
+    stop += -stop % sample_width
+    return pcm_bytes[start:max(start, stop)]
+
+def decode_to_pcm(audio_file_path, ffmpeg_available=True):
+    """Decode any container to (format tag, PCM16 bytes), None if decoding is impossible"""
+    if ffmpeg_available:
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-v', 'error', '-i', audio_file_path,
+                 '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', '16000', '-'],
+                capture_output=True, timeout=30
+            )
+            if result.returncode == 0 and result.stdout:
+                return b'1:2:16000', result.stdout
+        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError) as e:
+            logger.warning(f"FFmpeg decode for fingerprint failed: {e}")
+
+    # WAV files can be read without ffmpeg
+    try:
+        with wave.open(audio_file_path, 'rb') as wav_file:
+            params = f"{wav_file.getnchannels()}:{wav_file.getsampwidth()}:{wav_file.getframerate()}"
+            return params.encode(), wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError, OSError):
+        return None
+
+def fingerprint_audio(audio_file_path, ffmpeg_available=True):
+    """SHA-256 of the decoded audio samples (falls back to the raw file bytes)"""
+    decoded = decode_to_pcm(audio_file_path, ffmpeg_available)
+    digest = hashlib.sha256()
+    if decoded is not None:
+        format_tag, pcm = decoded
+        digest.update(b'pcm:' + format_tag + b':')
+        digest.update(trim_silence(pcm))
+    else:
+        digest.update(b'raw:')
+        with open(audio_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+class TranscriptCache:
+    def __init__(self, max_entries=256, persistent_path=None):
+        """In-memory LRU with an optional SQLite persistent tier"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+        self.persistent_path = persistent_path
+        self.db = None
+        if persistent_path:
+            try:
+                self.db = sqlite3.connect(persistent_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS transcripts ("
+                    "fingerprint TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self.db.commit()
+                logger.info(f"Transcript cache persistent tier: {persistent_path}")
+            except sqlite3.Error as e:
+                logger.warning(f"Transcript cache persistent tier disabled: {e}")
+                self.db = None
+
+    def get(self, fingerprint):
+        """Cached {'transcript', 'method_used', 'recipe_info'} or None"""
+        with self.lock:
+            if fingerprint in self.entries:
+                self.entries.move_to_end(fingerprint)
+                self.hits += 1
+                return dict(self.entries[fingerprint])
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT result FROM transcripts WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                if row:
+                    entry = json.loads(row[0])
+                    self.store_locked(fingerprint, entry)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    return dict(entry)
+
+            self.misses += 1
+            return None
+
+    def put(self, fingerprint, transcript, method_used, recipe_info):
+        """Store a successful transcription"""
+        entry = {
+            'transcript': transcript,
+            'method_used': method_used,
+            'recipe_info': recipe_info
+        }
+        with self.lock:
+            self.store_locked(fingerprint, entry)
+            if self.db is not None:
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO transcripts (fingerprint, result, created_at) VALUES (?, ?, ?)",
+                        (fingerprint, json.dumps(entry), time.time())
+                    )
+                    self.db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist transcript: {e}")
+
+    def store_locked(self, fingerprint, entry):
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        self.entries[fingerprint] = entry
+        self.entries.move_to_end(fingerprint)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'persistent_tier': self.persistent_path if self.db is not None else None
+            }
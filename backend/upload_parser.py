@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+FlavorCraft Upload Parser
+Streams multipart uploads part by part into bounded spooled buffers, sniffs each
+file's magic bytes on its first chunk and rejects unsupported or oversized images
+and audio before the rest of the request body is read
+"""
+
+import logging
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE = 'image'
+AUDIO = 'audio'
+
+SNIFF_BYTES = 16
+
+# format -> (kind, test on the first SNIFF_BYTES of the part); names match the allowed extensions
+SIGNATURES = {
+    'jpg': (IMAGE, lambda head: head[:3] == b'\xff\xd8\xff'),
+    'png': (IMAGE, lambda head: head[:8] == b'\x89PNG\r\n\x1a\n'),
+    'gif': (IMAGE, lambda head: head[:6] in (b'GIF87a', b'GIF89a')),
+    'bmp': (IMAGE, lambda head: head[:2] == b'BM'),
+    'webp': (IMAGE, lambda head: head[:4] == b'RIFF' and head[8:12] == b'WEBP'),
+    'wav': (AUDIO, lambda head: head[:4] == b'RIFF' and head[8:12] == b'WAVE'),
+    'ogg': (AUDIO, lambda head: head[:4] == b'OggS'),
+    'webm': (AUDIO, lambda head: head[:4] == b'\x1a\x45\xdf\xa3'),
+    'm4a': (AUDIO, lambda head: head[4:8] == b'ftyp'),
+    # ADTS sync word with layer 00; MP3 frames use the same sync with a non-zero layer
+    'aac': (AUDIO, lambda head: len(head) > 1 and head[0] == 0xff and head[1] & 0xf6 == 0xf0),
+    'mp3': (AUDIO, lambda head: head[:3] == b'ID3' or
+            (len(head) > 1 and head[0] == 0xff and head[1] & 0xe0 == 0xe0 and head[1] & 0x06 != 0)),
+}
+
+def sniff(head):
+    """(format, kind) for the leading bytes of a file, or (None, None) when unrecognized"""
+    for name, (kind, matches) in SIGNATURES.items():
+        if matches(head):
+            return name, kind
+    return None, None
+
+class UploadRejected(Exception):
+    def __init__(self, message, status=400, field=None, reason='type'):
+        """status: 400 for an unsupported or malformed part, 413 for one over its size limit"""
+        super().__init__(message)
+        self.status = status
+        self.field = field
+        self.reason = reason
+
+class UploadedFile:
+    def __init__(self, field, filename, kind, spool_bytes):
+        """A file part, spooled in memory up to spool_bytes and on disk beyond"""
+        self.field = field
+        self.filename = filename
+        self.kind = kind
+        self.format = None        # sniffed from the content, not taken from the filename
+        self.size = 0
+        self.stream = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self.readers = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def reading(self):
+        """
+        Yields the file, kept open until the block ends even if the request closes it meanwhile
+        (a stage abandoned at its deadline); yields None when it is already closed
+        """
+        with self.lock:
+            usable = not self.closed
+            if usable:
+                self.readers += 1
+        if not usable:
+            yield None
+            return
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.readers -= 1
+                last = self.closed and self.readers == 0
+            if last:
+                self.stream.close()
+
+    def seek(self, offset, whence=0):
+        return self.stream.seek(offset, whence)
+
+    def read(self, size=-1):
+        return self.stream.read(size)
+
+    def save(self, path):
+        self.stream.seek(0)
+        with open(path, 'wb') as target:
+            shutil.copyfileobj(self.stream, target)
+
+    def close(self):
+        """Closes now, or when the last reader finishes"""
+        with self.lock:
+            self.closed = True
+            if self.readers:
+                return
+        self.stream.close()
+
+class ParsedUpload:
+    def __init__(self):
+        self.form = {}
+        self.files = {}
+
+    def close(self):
+        for uploaded in self.files.values():
+            uploaded.close()
+
+class StreamingUploadParser:
+    def __init__(self, limits, max_field_bytes=64 * 1024, spool_bytes=1024 * 1024, chunk_size=64 * 1024):
+        """
+        limits: file field name -> (kind, max bytes); file parts under other names are discarded
+        max_field_bytes: cap on each text field
+        spool_bytes: file bytes kept in memory before spilling to a temp file
+        """
+        self.limits = limits
+        self.max_field_bytes = max_field_bytes
+        # Room for the text fields and multipart framing around the files (percent-encoding can triple a field)
+        self.form_bytes = 3 * max_field_bytes + 4096
+        self.spool_bytes = spool_bytes
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+
+        self.parsed = 0
+        self.accepted_bytes = 0
+        self.rejected = {}              # reason -> count
+        self.rejected_bytes_read = 0    # body bytes read before deciding to reject
+
+    def parse(self, request, file_fields=None):
+        """
+        Read the request body, returning a ParsedUpload; raises UploadRejected as soon as a part
+        fails its type or size check. file_fields: the file fields this endpoint accepts (default
+        all of limits). Non-multipart bodies fall back to request.form.
+        """
+        file_fields = set(self.limits if file_fields is None else file_fields)
+        parsed = ParsedUpload()
+        bytes_read = 0
+        try:
+            if request.mimetype != 'multipart/form-data':
+                self.parse_form(request, parsed)
+                return parsed
+
+            boundary = request.mimetype_params.get('boundary')
+            if not boundary:
+                raise UploadRejected('Multipart body has no boundary')
+
+            # A declared length no combination of accepted files could reach is refused unread
+            content_length = request.content_length
+            max_body = sum(self.limits[name][1] for name in file_fields) + self.form_bytes
+            if request.max_content_length:
+                max_body = min(max_body, request.max_content_length)
+            if content_length and content_length > max_body:
+                raise UploadRejected(f'Upload is over the {max_body / (1024 * 1024):.1f}MB limit', 413, reason='size')
+
+            stream = request.stream
+            decoder = MultipartDecoder(boundary.encode('latin-1'))
+            part = None          # UploadedFile, a bytearray for text fields, or None to discard
+            head = b''
+            limit = 0
+            unseen = set(file_fields)
+            while True:
+                event = decoder.next_event()
+                if isinstance(event, NeedData):
+                    chunk = stream.read(self.chunk_size)
+                    bytes_read += len(chunk)
+                    decoder.receive_data(chunk or None)
+                elif isinstance(event, Field):
+                    part, field = bytearray(), event.name
+                    parsed.form[field] = part
+                elif isinstance(event, File):
+                    part, head = None, b''
+                    if event.name in file_fields and event.filename:
+                        kind, limit = self.limits[event.name]
+                        unseen.discard(event.name)
+                        part = UploadedFile(event.name, event.filename, kind, self.spool_bytes)
+                        parsed.files[event.name] = part
+                        # Whatever is left of the body belongs to this file unless a later file can take it -
+                        # with no other file field still to come, an oversized file is refused before its data
+                        room = limit + sum(self.limits[name][1] for name in unseen) + self.form_bytes
+                        if content_length and content_length - bytes_read > room:
+                            raise UploadRejected(f'{kind.capitalize()} is over the {limit // (1024 * 1024)}MB limit',
+                                                 413, event.name, 'size')
+                elif isinstance(event, Data):
+                    if isinstance(part, bytearray):
+                        part.extend(event.data)
+                        if len(part) > self.max_field_bytes:
+                            raise UploadRejected(f'{field} is over {self.max_field_bytes} bytes', 413, field, 'size')
+                    elif part is not None:
+                        if part.format is None:
+                            head += event.data[:SNIFF_BYTES - len(head)]
+                            if head and (len(head) >= SNIFF_BYTES or not event.more_data):
+                                self.check_format(part, head)
+                        part.size += len(event.data)
+                        if part.size > limit:
+                            raise UploadRejected(f'{part.kind.capitalize()} is over the {limit // (1024 * 1024)}MB limit',
+                                                 413, part.field, 'size')
+                        part.stream.write(event.data)
+                        if not event.more_data:
+                            part.stream.seek(0)
+                elif isinstance(event, Epilogue):
+                    break
+            for uploaded in parsed.files.values():
+                if uploaded.size == 0:
+                    raise UploadRejected(f'{uploaded.filename} is empty', 400, uploaded.field, 'empty')
+        except RequestEntityTooLarge as e:
+            # Bodies without a Content-Length are cut off by Werkzeug at MAX_CONTENT_LENGTH
+            parsed.close()
+            rejection = UploadRejected('Upload is over the size limit', 413, reason='size')
+            self.record_rejection(rejection, bytes_read)
+            raise rejection from e
+        except UploadRejected as e:
+            parsed.close()
+            self.record_rejection(e, bytes_read)
+            raise
+        except ValueError as e:
+            # Malformed or truncated multipart body
+            parsed.close()
+            rejection = UploadRejected(f'Malformed upload: {e}', reason='malformed')
+            self.record_rejection(rejection, bytes_read)
+            raise rejection from e
+
+        parsed.form = {name: bytes(value).decode('utf-8', 'replace') for name, value in parsed.form.items()}
+        with self.lock:
+            self.parsed += 1
+            self.accepted_bytes += bytes_read
+        return parsed
+
+    def parse_form(self, request, parsed):
+        """URL-encoded (or empty) bodies: the same text field cap as multipart"""
+        if request.content_length and request.content_length > self.form_bytes:
+            raise UploadRejected(f'Form is over {self.form_bytes} bytes', 413, reason='size')
+        parsed.form = request.form.to_dict()
+        for field, value in parsed.form.items():
+            if len(value.encode('utf-8')) > self.max_field_bytes:
+                raise UploadRejected(f'{field} is over {self.max_field_bytes} bytes', 413, field, 'size')
+        with self.lock:
+            self.parsed += 1
+            self.accepted_bytes += request.content_length or 0
+
+    def check_format(self, part, head):
+        fmt, kind = sniff(head)
+        if kind != part.kind:
+            raise UploadRejected(f'{part.filename} is not a supported {part.kind} file', 400, part.field, 'type')
+        part.format = fmt
+
+    def record_rejection(self, rejection, bytes_read):
+        with self.lock:
+            self.rejected[rejection.reason] = self.rejected.get(rejection.reason, 0) + 1
+            self.rejected_bytes_read += bytes_read
+        logger.warning(f"🚫 Upload rejected after {bytes_read} bytes ({rejection.reason}): {rejection}")
+
+    def stats(self):
+        with self.lock:
+            rejections = sum(self.rejected.values())
+            return {
+                'limits_mb': {field: round(limit / (1024 * 1024), 1) for field, (kind, limit) in self.limits.items()},
+                'parsed': self.parsed,
+                'accepted_bytes': self.accepted_bytes,
+                'rejected': dict(self.rejected),
+                'avg_bytes_read_on_rejection': round(self.rejected_bytes_read / rejections) if rejections else None
+            }
@@ -194,8 +194,9 @@ const FlavorCraft = () => {
 
     const formData = new FormData();
     if (recipeText) formData.append("text", recipeText);
-    if (dishImage) formData.append("image", dataURLtoFile(dishImage, "dish.png"));
+    // Image last: the server can then refuse an oversized photo from its Content-Length alone
     if (audioBlob) formData.append("audio", audioBlob, "voice.wav");
+    if (dishImage) formData.append("image", dataURLtoFile(dishImage, "dish.png"));
 
     try {
       const res = await fetch("http://localhost:5007/predict", { 